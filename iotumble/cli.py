@@ -0,0 +1,293 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the Cli class, containing the functionality to list, show, summarise, and
+export incidents without the GUI (such as for scripted reports on a server).
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from configparser import ConfigParser
+from csv import DictWriter
+from datetime import datetime
+from json import dumps
+from os import environ, makedirs, path
+from sys import exit as sys_exit, stderr, stdout
+from threading import local
+from typing import Dict, List
+
+from botocore.exceptions import ClientError
+
+from iotumble.models.bulk_export import BulkExport
+from iotumble.models.incident import Incident
+from iotumble.models.incident_cache import IncidentCache
+from iotumble.models.session import Session
+
+
+class Cli:
+    """
+    This class represents the command line interface of the program. It contains a constructor,
+    the methods to create the Session of each thread and request incidents, the methods of each
+    command, and the methods to parse times and print results.
+
+    Only the model classes are imported, so no GUI libraries (tkinter, Pillow, or Matplotlib) are
+    needed. The credentials and cache are read from the same credentials.ini as the GUI, and the
+    AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, and AWS_DEFAULT_REGION environment variables
+    override its access keys. Incidents are requested with BatchGetItem, in batches of 100, by a
+    pool of threads that each have their own Session, sharing the IncidentCache.
+    """
+    table_name = "iotumble_incidents"
+
+    def __init__(self, credentials_path: str = ".aws/credentials.ini", workers: int = 8,
+                 cached: bool = True):
+        """
+        This constructor instantiates a Cli object, reading its credentials.ini, and creating its
+        IncidentCache (from the values of its cache section, or a memory-only IncidentCache).
+
+        :param credentials_path: Name of the credentials path.
+        :param workers: Amount of threads that request incidents.
+        :param cached: Boolean on if incidents are cached in the database of the cache section.
+        """
+        self.credentials = ConfigParser()
+        self.credentials.read(credentials_path)
+        self.workers = workers
+        self.incident_cache = (IncidentCache.from_config(self.credentials) if cached
+                               else IncidentCache())
+        self.sessions = local()
+
+    def create_session(self) -> Session:
+        """
+        This method creates a Session object, connects it to AWS, and creates its Amazon DynamoDB
+        table resource.
+
+        :returns: Instance of a connected Session object.
+        :raises ValueError: If the access keys are not set.
+        """
+        access = (environ.get("AWS_ACCESS_KEY_ID")
+                  or self.credentials.get("access", "access_key_id", fallback=""),
+                  environ.get("AWS_SECRET_ACCESS_KEY")
+                  or self.credentials.get("access", "secret_access_key", fallback=""),
+                  environ.get("AWS_DEFAULT_REGION")
+                  or self.credentials.get("access", "region_name", fallback=""))
+        if "" in access:
+            raise ValueError("Please set the session access keys!")
+        session = Session(self.incident_cache)
+        session.connect(*access)
+        session.create_table(self.table_name)
+        return session
+
+    def get_session(self) -> Session:
+        """
+        This method gets the Session object of the calling thread, creating it on its first call.
+
+        :returns: Instance of a connected Session object.
+        """
+        if getattr(self.sessions, "session", None) is None:
+            self.sessions.session = self.create_session()
+        return self.sessions.session
+
+    def request_incidents(self, incident_ids: List[str]) -> Dict[str, Incident]:
+        """
+        This method requests many incidents in parallel, splitting them into batches that are
+        each requested by a thread of the pool.
+
+        :param incident_ids: List of the IDs of the Incidents.
+        :returns: Dictionary of the Incident objects by incident ID (in the order of the passed
+        incident IDs, without the incidents that do not exist or could not be requested).
+        """
+        batch_size = Session.batch_size
+        batches = [incident_ids[start:start + batch_size]
+                   for start in range(0, len(incident_ids), batch_size)]
+        incidents = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for batch in executor.map(lambda ids: self.get_session().request_incidents(ids),
+                                      batches):
+                incidents.update(batch)
+        return {incident_id: incidents[incident_id] for incident_id in incident_ids
+                if incident_id in incidents}
+
+    def list_incidents(self, limit: int = 50) -> List[dict]:
+        """
+        This method lists the newest incidents, a page at a time, as a dictionary of the metadata
+        of each incident (its incident ID, device, epoch time, and peak SVM).
+
+        :param limit: Maximum amount of incidents listed (0 for every incident).
+        :returns: List of incident metadata dictionaries.
+        :raises ConnectionError: If a page of incidents cannot be requested.
+        """
+        session = self.get_session()
+        session.reset_incident_pages(min(limit, 100) if limit else 100)
+        incidents = []
+        while not limit or len(incidents) < limit:
+            page = session.request_incident_page()
+            if page is False:
+                raise ConnectionError("The incidents could not be requested!")
+            if not page:
+                break
+            incidents.extend({key: incident.get(key) for key in
+                              ("incident_id", "device", "time", "peak")} for incident in page)
+        return incidents[:limit] if limit else incidents
+
+    def show_incident(self, incident_id: str) -> List[dict]:
+        """
+        This method shows the timestamps of an incident.
+
+        :param incident_id: ID of the Incident.
+        :returns: List of the dictionaries of each timestamp (its ID, epoch time, and x, y, z,
+        and svm values).
+        :raises LookupError: If the incident does not exist.
+        """
+        incident = self.request_incidents([incident_id]).get(incident_id)
+        if incident is None:
+            raise LookupError(f"The incident {incident_id} does not exist!")
+        columns = incident.get_columns()
+        return [{"timestamp_id": timestamp_id, "epoch": epoch, "x": x, "y": y, "z": z, "svm": svm}
+                for timestamp_id, x, y, z, svm, epoch
+                in zip(incident.get_timestamp_ids().tolist(), *columns.tolist())]
+
+    def summarise_incidents(self, incident_ids: List[str]) -> List[dict]:
+        """
+        This method summarises incidents, as the summary statistics of each incident, flattened
+        (such as "max_svm"), with its incident ID, amount of timestamps, and start and end times.
+
+        :param incident_ids: List of the IDs of the Incidents.
+        :returns: List of the summary dictionaries of each incident that exists.
+        """
+        summaries = []
+        for incident_id, incident in self.request_incidents(incident_ids).items():
+            epochs = incident.get_columns()[4]
+            summary = {"incident_id": incident_id, "timestamps": len(incident),
+                       "start": float(epochs[0]), "end": float(epochs[-1])}
+            for key, value in incident.get_summary().items():
+                if isinstance(value, dict):
+                    summary.update({f"{key}_{axis}": data for axis, data in value.items()})
+                else:
+                    summary[key] = value
+            summaries.append(summary)
+        return summaries
+
+    def export_incidents(self, incident_ids: List[str], export_path: str) -> List[dict]:
+        """
+        This method exports the timestamps of each incident as a CSV file to an export path (as
+        the GUI exports an incident).
+
+        :param incident_ids: List of the IDs of the Incidents.
+        :param export_path: Name of the export path.
+        :returns: List of the dictionaries of the incident ID and path of each export.
+        """
+        if not path.exists(export_path):
+            makedirs(export_path)
+        exports = []
+        for incident_id, incident in self.request_incidents(incident_ids).items():
+            file_path = path.join(export_path, f"Incident {incident_id} - Timestamps")
+            incident.export_timestamps(file_path)
+            exports.append({"incident_id": incident_id, "path": f"{file_path}.csv"})
+        return exports
+
+    def batch_export(self, export_format: str, export_path: str, start: float = None,
+                     end: float = None) -> List[dict]:
+        """
+        This method exports every incident that ends between two epoch times with a BulkExport
+        object, printing its progress to stderr.
+
+        :param export_format: Format of the export ("csv" or "parquet").
+        :param export_path: Name of the export path (without an extension).
+        :param start: Epoch time the incidents start from (None for the first incident).
+        :param end: Epoch time the incidents end at (None for the last incident).
+        :returns: List of the dictionary of the amount of incidents and rows exported, the amount
+        of incidents skipped, and the path of the export.
+        :raises ModuleNotFoundError: If the format (or its library) is not available.
+        """
+        exporter = BulkExport.load_exporter(export_format, export_path)
+        bulk_export = BulkExport(self.get_session(), exporter)
+        return [bulk_export.run(start, end, lambda incidents, rows: print(
+            f"Exported {incidents} incidents ({rows} timestamps)", file=stderr))]
+
+    @staticmethod
+    def parse_time(time: str) -> float:
+        """
+        This method parses a time argument, as an epoch time or an ISO 8601 date and time (in
+        local time, unless it has a UTC offset).
+
+        :param time: Time argument.
+        :returns: Epoch time of the argument.
+        :raises ValueError: If the time is not valid.
+        """
+        try:
+            return float(time)
+        except ValueError:
+            return datetime.fromisoformat(time).timestamp()
+
+    @staticmethod
+    def print_rows(rows: List[dict], output_format: str):
+        """
+        This method prints a list of rows to stdout, as a JSON array or CSV (with a header of the
+        keys of the first row).
+
+        :param rows: List of the dictionaries of each row.
+        :param output_format: Format of the output ("json" or "csv").
+        """
+        if output_format == "json":
+            print(dumps(rows, indent=2))
+        elif rows:
+            csv = DictWriter(stdout, fieldnames=list(rows[0]), lineterminator="\n")
+            csv.writeheader()
+            csv.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(prog="python -m iotumble.cli",
+                            description="Retrieve, summarise, and export IoTumble incidents.")
+    parser.add_argument("--credentials", default=".aws/credentials.ini",
+                        help="path of the credentials.ini (access keys and cache)")
+    parser.add_argument("--workers", type=int, default=8, help="threads that request incidents")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="only cache incidents in memory")
+    parser.add_argument("--format", choices=("json", "csv"), default="json",
+                        help="format of the output")
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_parser = commands.add_parser("list", help="list the newest incidents")
+    list_parser.add_argument("--limit", type=int, default=50,
+                             help="maximum incidents listed (0 for every incident)")
+    show_parser = commands.add_parser("show", help="show the timestamps of an incident")
+    show_parser.add_argument("incident_id", help="ID of the incident")
+    stats_parser = commands.add_parser("stats", help="show the summary statistics of incidents")
+    stats_parser.add_argument("incident_ids", nargs="+", help="IDs of the incidents")
+    export_parser = commands.add_parser("export", help="export incidents as CSV files")
+    export_parser.add_argument("incident_ids", nargs="+", help="IDs of the incidents")
+    export_parser.add_argument("--output", default=path.join("exports", "csv"),
+                               help="directory of the CSV files")
+    batch_parser = commands.add_parser("batch-export", help="export every incident (or those "
+                                                            "of a time range) in one file")
+    batch_parser.add_argument("--to", choices=("csv", "parquet"), default="csv",
+                              help="format of the export (parquet needs PyArrow)")
+    batch_parser.add_argument("--output", default=path.join("exports", "bulk", "Incidents"),
+                              help="path of the export (without an extension)")
+    batch_parser.add_argument("--start", type=Cli.parse_time,
+                              help="epoch time or ISO 8601 date the incidents start from")
+    batch_parser.add_argument("--end", type=Cli.parse_time,
+                              help="epoch time or ISO 8601 date the incidents end at")
+    arguments = parser.parse_args()
+    cli = Cli(arguments.credentials, arguments.workers, not arguments.no_cache)
+    try:
+        if arguments.command == "list":
+            result = cli.list_incidents(arguments.limit)
+        elif arguments.command == "show":
+            result = cli.show_incident(arguments.incident_id)
+        elif arguments.command == "stats":
+            result = cli.summarise_incidents(arguments.incident_ids)
+        elif arguments.command == "export":
+            result = cli.export_incidents(arguments.incident_ids, arguments.output)
+        else:
+            directory = path.dirname(arguments.output)
+            if directory and not path.exists(directory):
+                makedirs(directory)
+            result = cli.batch_export(arguments.to, arguments.output, arguments.start,
+                                      arguments.end)
+        cli.print_rows(result, arguments.format)
+    except (ClientError, ConnectionError, LookupError, ModuleNotFoundError, ValueError) as error:
+        sys_exit(f"Error: {error}")
+    finally:
+        cli.incident_cache.close()
@@ -95,6 +95,12 @@ class AbstractController(ABC):
             credentials.set("access", "access_key_id", "")
             credentials.set("access", "secret_access_key", "")
             credentials.set("access", "region_name", "")
+            credentials.add_section("cache")
+            credentials.set("cache", "cache_path", "incident_cache.db")
+            credentials.set("cache", "memory_size", "16")
+            credentials.set("cache", "disk_size", "256")
+            credentials.add_section("export")
+            credentials.set("export", "export_format", "csv")
             with open(path_name, "w", encoding="utf-8") as file:
                 credentials.write(file)
         else:
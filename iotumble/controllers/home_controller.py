@@ -7,8 +7,14 @@
 This module contains the HomeController class, containing the functionality to allow HomeView
 to interface with the model classes.
 """
+from time import strftime
+from typing import Callable
+
 from iotumble.controllers.abstract_controller import AbstractController
+from iotumble.models.bulk_export import BulkExport
+from iotumble.models.incident_cache import IncidentCache
 from iotumble.models.session import Session
+from iotumble.models.worker import Worker
 
 
 class HomeController(AbstractController):
@@ -18,34 +24,87 @@ class HomeController(AbstractController):
     implemented abstract methods.
     """
 
+    poll_interval = 50
+    prefetch_neighbours = 2
+
     def __init__(self):
         """
         This constructor instantiates a HomeController object, loads an instance of HomeView, calls
-        fill_inputs() to fill the inputs of HomeView, and then creates a Session object.
+        fill_inputs() to fill the inputs of HomeView, creates a Session object (with the
+        IncidentCache of create_cache()), and then starts a Worker object to run its requests, and
+        another to run bulk exports (so a long export does not hold up opening incidents).
         """
         self.home_view = self.load_view("Home")(self)
         self.fill_inputs()
-        self.session = Session()
+        self.session = Session(self.create_cache())
+        self.credentials = None
+        self.worker = Worker()
+        self.worker.start()
+        self.export_worker = Worker()
+        self.export_worker.start()
+        self.export_progress = (0, 0)
+        self.polling = False
+
+    def run_request(self, name: str, callback: Callable, request: Callable, *args,
+                    worker: Worker = None):
+        """
+        This method submits a request to a Worker, shows that it is loading in HomeView, and
+        starts polling the Workers from the Tk main loop, if they are not already being polled.
+
+        :param name: Name of the request.
+        :param callback: Method that is passed the outcome of the request.
+        :param request: Method of the request.
+        :param args: Arguments of the request.
+        :param worker: Instance of the Worker object to run the request (None for the Worker of
+        the Session).
+        """
+        (worker or self.worker).submit(name, callback, request, *args)
+        self.home_view.show_loading(True)
+        if not self.polling:
+            self.polling = True
+            self.home_view.after(self.poll_interval, self.poll_requests)
+
+    def poll_requests(self):
+        """
+        This method passes the outcome of each finished request of the Workers to its callback,
+        and polls them again (with after()) while any requests are pending. The progress of a
+        running export is shown in HomeView.
+        """
+        self.worker.poll()
+        self.export_worker.poll()
+        busy = self.worker.is_busy() or self.export_worker.is_busy()
+        if busy:
+            self.home_view.after(self.poll_interval, self.poll_requests)
+        self.polling = busy
+        self.home_view.show_loading(busy)
+        if self.export_worker.is_pending("export"):
+            self.home_view.show_export_progress(*self.export_progress)
 
-    def connect(self, access_key_id: str, secret_access_key: str, region_name: str) -> bool:
+    def connect(self, access_key_id: str, secret_access_key: str, region_name: str):
         """
         This method connects the Session object to AWS, and creates an Amazon DynamoDB table
-        resource in Session. Lastly, fill_incidents() is called and it returns its outcome.
+        resource in Session. Lastly, fill_incidents() is called to check the connection.
 
         :param access_key_id: Access Key ID of the Session.
         :param secret_access_key: Secret Access Key of the Session.
         :param region_name: Region Name of the Session.
-        :returns: Boolean outcome of fill_incidents().
         """
         if access_key_id == "" or secret_access_key == "" or region_name == "":
             self.home_view.show_message("Please fill all the session entries!")
-            return False
+            return
+        self.credentials = (access_key_id, secret_access_key, region_name)
         self.session.connect(access_key_id, secret_access_key, region_name)
         self.session.create_table("iotumble_incidents")
-        return self.fill_incidents()
+        self.fill_incidents()
 
     def disconnect(self):
-        """This method disconnects the Session object from AWS."""
+        """
+        This method cancels the pending requests of the Workers, and disconnects the Session object
+        from AWS. An export that is already running is left to finish, but its outcome is
+        discarded.
+        """
+        self.worker.cancel()
+        self.export_worker.cancel()
         self.session.disconnect()
 
     def create_credentials(self):
@@ -76,37 +135,123 @@ class HomeController(AbstractController):
                                    credentials.get("access", "secret_access_key"),
                                    credentials.get("access", "region_name"))
 
-    def fill_incidents(self) -> bool:
+    def create_cache(self) -> IncidentCache:
+        """
+        This method calls create_credentials() to return a read credentials.ini, and creates an
+        IncidentCache object from its cache section.
+
+        :returns: Instance of an IncidentCache object.
+        """
+        return IncidentCache.from_config(self.create_credentials())
+
+    def fill_incidents(self):
+        """
+        This method clears the incidents of HomeView, resets the incident paging of Session, and
+        requests the first page of incidents on the Worker. If it returns False, an error message
+        is passed to HomeView, and Session is disconnected. Otherwise, the session section of
+        HomeView is covered, and the outcome is used to fill the incidents of HomeView.
         """
-        This method requests an incident count from Session and if it returns False, it passes an
-        error message to HomeView, and returns False. If it returns True, it continues and uses its
-        outcome to fill the incidents of HomeView, and return True.
+        def fill(incidents):
+            if incidents is False:
+                self.session.disconnect()
+                self.home_view.show_message("The entered session access keys are not valid!")
+                return
+            self.home_view.show_connected()
+            self.home_view.fill_incidents(incidents)
 
-        :returns: Boolean outcome of request_incident_count().
+        self.home_view.clear_tree_view()
+        self.session.reset_incident_pages()
+        self.run_request("incidents", fill, self.session.request_incident_page)
+
+    def load_incidents(self):
+        """
+        This method requests the next page of incidents from Session on the Worker, and adds them
+        to the incidents of HomeView. It is called by HomeView as its incidents are scrolled, so it
+        is ignored while a page is already being requested. If it returns False, only an error
+        message is passed to HomeView, so the page is requested again on the next scroll.
         """
-        incident_count = self.session.request_incident_count()
-        if not incident_count:
-            self.home_view.show_message("The entered session access keys are not valid!")
-            return False
-        self.home_view.fill_incidents(incident_count)
-        return True
+        def load(incidents):
+            if incidents is False:
+                self.home_view.show_message("The incidents could not be loaded!")
+                return
+            self.home_view.fill_incidents(incidents)
 
-    def switch(self, incident_id: int):
+        if not self.worker.is_pending("incidents"):
+            self.run_request("incidents", load, self.session.request_incident_page)
+
+    def switch(self, incident_id: str):
         """
-        This method requests an Incident object from Session and if it returns False, it passes an
-        error message to HomeView. If it returns True, it hides HomeView, and passes its outcome to
-        load_controller() to load an instance of IncidentController. Finally it runs the main method
-        of IncidentController.
+        This method requests an Incident object from Session on the Worker, replacing any incident
+        that is still being requested, and then prefetches the incidents next to it in HomeView (so
+        stepping through the incidents does not wait on AWS). If it returns False, it passes an
+        error message to HomeView. Otherwise, its outcome is passed to open_incident() once the
+        Tk main loop is idle, so the Workers are still polled while the incident is open.
 
         :param incident_id: ID of the Incident.
         """
-        incident = self.session.request_incident(incident_id)
-        if not incident:
-            self.home_view.show_message("The selected incident does not exist!")
-        else:
-            self.home_view.hide()
-            incident_controller = self.load_controller("Incident")(self.home_view, incident)
-            incident_controller.main()
+        def show(incident):
+            if not incident:
+                self.home_view.show_message("The selected incident does not exist!")
+            else:
+                self.home_view.after_idle(self.open_incident, incident)
+
+        self.run_request("incident", show, self.session.request_incident, incident_id)
+        neighbours = self.home_view.get_neighbours(incident_id, self.prefetch_neighbours)
+        if neighbours:
+            self.run_request("prefetch", lambda incidents: None, self.session.request_incidents,
+                             neighbours)
+
+    def open_incident(self, incident):
+        """
+        This method hides HomeView, and passes an Incident object to load_controller() to load an
+        instance of IncidentController. Finally it runs the main method of IncidentController
+        (which runs until the incident is closed).
+
+        :param incident: Instance of an Incident object.
+        """
+        self.home_view.hide()
+        incident_controller = self.load_controller("Incident")(self.home_view, incident)
+        incident_controller.main()
+
+    def export_incidents(self):
+        """
+        This method exports every incident to an exports directory, in the format of the export
+        section of credentials.ini ("csv" for a single CSV file, or "parquet" for a Parquet
+        dataset partitioned by device and date, which needs PyArrow). The export is run by a
+        BulkExport object on the export Worker, with its own Session, and its progress is shown in
+        HomeView. Lastly, the outcome of the export is passed to HomeView.
+        """
+        def show(stats):
+            if stats is False:
+                self.home_view.show_message("The incidents could not be exported!")
+            else:
+                self.home_view.show_message(f"Successfully exported {stats['incidents']} "
+                                            f"incidents:\n'{stats['path']}'.")
+
+        def progress(incidents, rows):
+            self.export_progress = (incidents, rows)
+
+        def export(exporter):
+            session = Session()
+            session.connect(*self.credentials)
+            session.create_table("iotumble_incidents")
+            return BulkExport(session, exporter).run(progress=progress)
+
+        if self.credentials is None or self.export_worker.is_pending("export"):
+            return
+        credentials = self.create_credentials()
+        export_format = credentials.get("export", "export_format", fallback="csv")
+        export_path = self.join_path("exports", "bulk")
+        if not self.check_path(export_path):
+            self.create_path(export_path)
+        file_path = self.join_path(export_path, f"Incidents {strftime('%Y-%m-%d %H-%M-%S')}")
+        try:
+            exporter = BulkExport.load_exporter(export_format, file_path)
+        except ModuleNotFoundError:
+            self.home_view.show_message(f"The '{export_format}' export format is not available!")
+            return
+        self.export_progress = (0, 0)
+        self.run_request("export", show, export, exporter, worker=self.export_worker)
 
     def main(self):
         self.home_view.start()
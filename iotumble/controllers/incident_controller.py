@@ -7,6 +7,8 @@
 This module contains the IncidentController class, containing the functionality to allow
 IncidentView to interface with the model classes.
 """
+from typing import Tuple
+
 from iotumble.controllers.abstract_controller import AbstractController
 
 
@@ -16,6 +18,8 @@ class IncidentController(AbstractController):
     constructor, the methods that allow IncidentView to interface with the model classes, and the
     implemented abstract methods.
     """
+    graph_axes = {"X-Acceleration": "x", "Y-Acceleration": "y", "Z-Acceleration": "z",
+                  "Signal Vector Magnitude": "svm"}
 
     def __init__(self, home_view, incident):
         """
@@ -31,39 +35,79 @@ class IncidentController(AbstractController):
 
     def fill_details(self):
         """
-        This method gets the incidents timestamps and maximum SVM timestamp and uses them to fill
-        the details section of IncidentView.
+        This method gets the incidents maximum SVM timestamp, summary statistics, and amount of
+        timestamps and uses them to fill the details section of IncidentView.
         """
         max_timestamp = self.incident.get_max_timestamp()
-        timestamps = self.incident.get_timestamps()
-        self.incident_view.fill_details_labels(max_timestamp)
-        self.incident_view.fill_details_tree_view(timestamps)
+        self.incident_view.fill_details_labels(max_timestamp, self.incident.get_summary())
+        self.incident_view.fill_details_tree_view(len(self.incident))
+
+    def format_details_row(self, row: int) -> Tuple[str, tuple]:
+        """
+        This method formats a row of the details treeview of IncidentView (newest timestamp
+        first), as its tag and its timestamps time, and x, y, z, and svm data.
+
+        :param row: Index of the row.
+        :returns: Tuple of the rows tag and values.
+        """
+        timestamp = self.incident.get_timestamp(len(self.incident) - 1 - row)
+        return (str(timestamp.get_timestamp_id() % 2),
+                (timestamp.get_time(), round(timestamp.get_x_acc(), 8),
+                 round(timestamp.get_y_acc(), 8), round(timestamp.get_z_acc(), 8),
+                 round(timestamp.get_svm(), 10)))
+
+    def fill_graph_lines(self):
+        """
+        This method gets the time-data and decimated acceleration data of the incidents timestamps,
+        and plots a line of each acceleration data in the graph section of IncidentView once.
+        """
+        time_data = self.incident.get_timestamps_time()
+        time_range = (float(time_data[0]), float(time_data[-1]))
+        self.incident_view.plot_graph(time_range, self.decimate_graph_lines(*time_range))
+
+    def fill_graph_range(self, start: float, end: float):
+        """
+        This method decimates the acceleration data of the incidents timestamps again for a zoomed
+        or panned time range, and updates the lines in the graph section of IncidentView.
+
+        :param start: Seconds since the first timestamp the graph starts at.
+        :param end: Seconds since the first timestamp the graph ends at.
+        """
+        self.incident_view.update_graph(self.decimate_graph_lines(start, end))
+
+    def decimate_graph_lines(self, start: float, end: float) -> dict:
+        """
+        This method decimates the time-data and acceleration data of each line between two times,
+        to about two points per pixel of the graph of IncidentView (keeping the minimum and maximum
+        of each pixel, so no peaks are lost).
+
+        :param start: Seconds since the first timestamp the graph starts at.
+        :param end: Seconds since the first timestamp the graph ends at.
+        :returns: Dictionary of the decimated time-data and acceleration data by graph name.
+        """
+        time_data = self.incident.get_timestamps_time()
+        columns = self.incident.get_columns()
+        width = self.incident_view.get_graph_width()
+        lines = {}
+        for name, axis in self.graph_axes.items():
+            indices = self.incident.get_decimated(axis, start, end, width)
+            lines[name] = (time_data[indices], columns[self.incident.axes.index(axis)][indices])
+        return lines
 
     def fill_graph(self, selected_graph: str):
         """
-        This method gets the acceleration data of the incidents timestamps, depending on the passed
-        selected graph. It then fills the graph section of IncidentView.
+        This method gets the lines of the passed selected graph, and their colors. It then shows
+        them in the graph section of IncidentView.
 
         :param selected_graph: Name of the selected graph.
         """
-        time_data = self.incident.get_timestamps_time()
         graph_colors = self.incident_view.get_graph_colors()
         if selected_graph == "All Acceleration":
-            timestamps_data = [self.incident.get_timestamps_x(), self.incident.get_timestamps_y(),
-                               self.incident.get_timestamps_z()]
-            for i, acc_data in enumerate(timestamps_data):
-                self.incident_view.plot_graph(time_data, acc_data, graph_colors[i])
+            colors = {"X-Acceleration": graph_colors[0], "Y-Acceleration": graph_colors[1],
+                      "Z-Acceleration": graph_colors[2]}
         else:
-            if selected_graph == "X-Acceleration":
-                acc_data = self.incident.get_timestamps_x()
-            elif selected_graph == "Y-Acceleration":
-                acc_data = self.incident.get_timestamps_y()
-            elif selected_graph == "Z-Acceleration":
-                acc_data = self.incident.get_timestamps_z()
-            else:
-                acc_data = self.incident.get_timestamps_svm()
-            self.incident_view.plot_graph(time_data, acc_data, graph_colors[2])
-        self.incident_view.set_graph(time_data, selected_graph)
+            colors = {selected_graph: graph_colors[2]}
+        self.incident_view.set_graph(selected_graph, colors)
 
     def export_csv(self):
         """This method exports the incident timestamps as a CSV file to an exports directory."""
@@ -0,0 +1,55 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the abstract class AbstractExporter, containing the methods that are shared
+between the exporters that incidents are exported in bulk with.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict
+
+import numpy as np
+
+
+class AbstractExporter(ABC):
+    """
+    This abstract class represents an abstract exporter and implements ABC (Abstract Base Class). It
+    contains a constructor, and the abstract methods to be implemented by each exporter.
+
+    Exporters are written to a batch of timestamps at a time, as a column of each of the keys
+    (the incident ID, device, timestamp ID, epoch time, and x, y, z, and svm data).
+    """
+    keys = ("incident_id", "device", "timestamp_id", "epoch", "x", "y", "z", "svm")
+
+    def __init__(self, export_path: str):
+        """
+        This constructor instantiates an exporter object.
+
+        :param export_path: Name of the export path (without an extension).
+        """
+        self.export_path = export_path
+
+    @abstractmethod
+    def write(self, batch: Dict[str, np.ndarray]):
+        """
+        This method writes a batch of timestamps to the export.
+
+        :param batch: Dictionary of the column of each key of the timestamps.
+        """
+
+    @abstractmethod
+    def close(self) -> str:
+        """
+        This method closes the export.
+
+        :returns: Name of the path the export was written to.
+        """
+
+    @abstractmethod
+    def discard(self):
+        """
+        This method removes the files written by a closed export (such as one that failed part of
+        the way through), so no partial export is left behind.
+        """
@@ -0,0 +1,60 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the CsvExporter class, containing the functionality to export incidents in
+bulk to a single CSV file.
+"""
+from csv import writer
+from os import path, remove
+from typing import Dict
+
+import numpy as np
+
+from iotumble.exporters.abstract_exporter import AbstractExporter
+
+
+class CsvExporter(AbstractExporter):
+    """
+    This class represents a CSV exporter and implements AbstractExporter. It contains a
+    constructor, and the implemented abstract methods.
+
+    Each batch is converted to Python values a column at a time (with tolist()), and its rows are
+    written with a single writerows() call, so no value is converted on its own.
+    """
+    header = ("Incident ID", "Device", "Timestamp ID", "Epoch", "X-Acceleration",
+              "Y-Acceleration", "Z-Acceleration", "Signal Vector Magnitude")
+
+    def __init__(self, export_path: str):
+        """
+        This constructor instantiates a CsvExporter object. Its CSV file is only opened once the
+        export is written to (or closed), so an export that never runs leaves no open file.
+
+        :param export_path: Name of the export path (without an extension).
+        """
+        super().__init__(export_path)
+        self.file = None
+        self.csv = None
+
+    def open(self):
+        """This method opens the CSV file of the export (if it is not open), writing its header."""
+        if self.file is not None:
+            return
+        self.file = open(f"{self.export_path}.csv", "w", newline="", encoding="utf-8")
+        self.csv = writer(self.file, delimiter=",")
+        self.csv.writerow(self.header)
+
+    def write(self, batch: Dict[str, np.ndarray]):
+        self.open()
+        self.csv.writerows(zip(*(batch[key].tolist() for key in self.keys)))
+
+    def close(self) -> str:
+        self.open()
+        self.file.close()
+        return f"{self.export_path}.csv"
+
+    def discard(self):
+        if path.exists(f"{self.export_path}.csv"):
+            remove(f"{self.export_path}.csv")
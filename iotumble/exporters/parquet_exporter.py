@@ -0,0 +1,66 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the ParquetExporter class, containing the functionality to export incidents
+in bulk to a Parquet dataset partitioned by device and date.
+"""
+from os import path, remove, rmdir
+from typing import Dict
+
+import numpy as np
+import pyarrow as pa
+from pyarrow import parquet as pq
+
+from iotumble.exporters.abstract_exporter import AbstractExporter
+
+
+class ParquetExporter(AbstractExporter):
+    """
+    This class represents a Parquet exporter and implements AbstractExporter. It contains a
+    constructor, and the implemented abstract methods.
+
+    Each batch is converted to an Arrow table (without copying its numeric columns), and written
+    to the directory of the export path as a Parquet file of each device and date (UTC) it holds,
+    in the partitioned directories "device=.../date=...". The path of each written file is kept,
+    so a discarded export only removes its own files (and the directories they leave empty). The
+    module is only imported when Parquet is selected, so PyArrow is only needed to export Parquet.
+    """
+
+    def __init__(self, export_path: str):
+        """
+        This constructor instantiates a ParquetExporter object.
+
+        :param export_path: Name of the export path (the directory of the dataset).
+        """
+        super().__init__(export_path)
+        self.parts = 0
+        self.files = []
+
+    def write(self, batch: Dict[str, np.ndarray]):
+        dates = batch["epoch"].astype("datetime64[s]").astype("datetime64[D]").astype(str)
+        table = pa.table({**{key: batch[key] for key in self.keys}, "date": dates})
+        pq.write_to_dataset(table, self.export_path, partition_cols=["device", "date"],
+                            basename_template=f"part-{self.parts}-{{i}}.parquet",
+                            file_visitor=lambda written: self.files.append(written.path))
+        self.parts += 1
+
+    def close(self) -> str:
+        return self.export_path
+
+    def discard(self):
+        directories = set()
+        for file_path in self.files:
+            remove(file_path)
+            directory = path.dirname(file_path)
+            while path.normpath(directory) != path.normpath(path.dirname(self.export_path)):
+                directories.add(directory)
+                directory = path.dirname(directory)
+        for directory in sorted(directories, key=len, reverse=True):
+            try:
+                rmdir(directory)
+            except OSError:
+                continue
+        self.files = []
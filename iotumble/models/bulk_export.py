@@ -0,0 +1,140 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the BulkExport class, containing the functionality to export every incident
+of a Session (or those of a date range) in one streamed pass.
+"""
+from importlib import import_module
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from iotumble.exporters.abstract_exporter import AbstractExporter
+from iotumble.models.session import Session
+
+
+class BulkExport:
+    """
+    This class represents a bulk export of incidents. It contains a constructor, the method to run
+    the export, the methods to add incidents to and flush its batch, and the method to load an
+    exporter.
+
+    Incident items are streamed from Session a page at a time, and decoded into their columns
+    (without being cached). The columns are buffered until they hold a batch of rows, which is
+    then written by the exporter in one call, so the memory used is bounded by the batch size,
+    however many incidents are exported.
+    """
+    legacy_device = "unknown"
+
+    def __init__(self, session: Session, exporter: AbstractExporter, batch_rows: int = 65536):
+        """
+        This constructor instantiates a BulkExport object.
+
+        :param session: Instance of a connected Session object.
+        :param exporter: Instance of an exporter object.
+        :param batch_rows: Amount of timestamps buffered before each batch is written.
+        """
+        self.session = session
+        self.exporter = exporter
+        self.batch_rows = batch_rows
+        self.batch = []
+        self.batch_size = 0
+        self.stats = {"incidents": 0, "rows": 0, "skipped": 0, "path": None}
+
+    def run(self, start: float = None, end: float = None, progress: Callable = None) -> dict:
+        """
+        This method runs the export, writing every incident that ends between the passed epoch
+        times, and then closes the exporter. If the export fails, the exporter is still closed, and
+        its partial export is discarded.
+
+        :param start: Epoch time the incidents start from (None for the first incident).
+        :param end: Epoch time the incidents end at (None for the last incident).
+        :param progress: Method that is passed the amount of incidents and rows exported so far,
+        after each page (None to not report progress).
+        :returns: Dictionary of the amount of incidents and rows exported, the amount of incidents
+        skipped (as their items could not be decoded, or have no timestamps), and the path of the
+        export.
+        :raises ClientError: If a request fails.
+        """
+        completed = False
+        try:
+            for items in self.session.request_incident_items(start, end):
+                for item in items:
+                    self.add_incident(item, start, end)
+                if progress is not None:
+                    progress(self.stats["incidents"], self.stats["rows"])
+            self.flush()
+            completed = True
+        finally:
+            self.stats["path"] = self.exporter.close()
+            if not completed:
+                self.exporter.discard()
+        return self.stats
+
+    def add_incident(self, item: dict, start: float = None, end: float = None):
+        """
+        This method decodes an incident item and adds its columns to the batch, if it ends between
+        the passed epoch times (as the epoch times of legacy incidents are not in their keys).
+        The batch is flushed once it holds enough rows.
+
+        :param item: Dictionary of the incident item.
+        :param start: Epoch time the incidents start from (None for the first incident).
+        :param end: Epoch time the incidents end at (None for the last incident).
+        """
+        incident_id = self.session.create_incident_id(item)
+        try:
+            incident = self.session.create_incident(incident_id, item)
+        except (KeyError, TypeError, ValueError):
+            self.stats["skipped"] += 1
+            return
+        columns = incident.get_columns()
+        length = len(incident)
+        if (start is not None and columns[4, -1] < start) or \
+                (end is not None and columns[4, -1] > end):
+            return
+        device = incident_id.split("-", 3)[3] if "-" in incident_id else self.legacy_device
+        self.batch.append({"incident_id": np.full(length, incident_id, dtype=object),
+                           "device": np.full(length, device, dtype=object),
+                           "timestamp_id": incident.get_timestamp_ids(),
+                           "epoch": columns[4], "x": columns[0], "y": columns[1],
+                           "z": columns[2], "svm": columns[3]})
+        self.batch_size += length
+        self.stats["incidents"] += 1
+        self.stats["rows"] += length
+        if self.batch_size >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        """This method writes the buffered columns to the exporter as one batch."""
+        if not self.batch:
+            return
+        self.exporter.write(self.concatenate(self.batch))
+        self.batch = []
+        self.batch_size = 0
+
+    @staticmethod
+    def concatenate(batch: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """
+        This method concatenates the columns of each incident of a batch.
+
+        :param batch: List of the dictionaries of the columns of each incident.
+        :returns: Dictionary of the concatenated columns.
+        """
+        return {key: np.concatenate([columns[key] for columns in batch]) for key in batch[0]}
+
+    @staticmethod
+    def load_exporter(export_format: str, export_path: str) -> AbstractExporter:
+        """
+        This method loads an exporter by its format (such as "csv" or "parquet"), only importing
+        the module (and its libraries) of the selected format.
+
+        :param export_format: Format of the export.
+        :param export_path: Name of the export path (without an extension).
+        :returns: Instance of an exporter object.
+        :raises ModuleNotFoundError: If the format (or its library) is not available.
+        """
+        module = import_module(f"iotumble.exporters.{export_format}_exporter")
+        return getattr(module, f"{export_format.capitalize()}Exporter")(export_path)
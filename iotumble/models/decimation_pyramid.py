@@ -0,0 +1,96 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the DecimationPyramid class, containing the functionality to select the
+timestamps of a series to plot at any zoom level, without losing its peaks.
+"""
+import numpy as np
+
+
+class DecimationPyramid:
+    """
+    This class represents a multi-resolution pyramid of a series of values. It contains a
+    constructor, the methods to select the indices to plot, and the method to reduce a level.
+
+    Each level halves the previous one, keeping the indices of the minimum and maximum value of
+    each bucket (of 2, 4, 8, ... values), so the pyramid takes about as much memory as the series
+    and is built in linear time. Selecting a range picks the level with at most one bucket per
+    requested point, and returns the minimum and maximum of each bucket in time order (and of the
+    partial buckets at either end of the range), so every peak (such as the maximum SVM of an
+    impact) is plotted at any zoom level.
+    """
+
+    def __init__(self, data: np.ndarray):
+        """
+        This constructor instantiates a DecimationPyramid object, building each level.
+
+        :param data: Array of the values of the series.
+        """
+        self.data = data
+        self.levels = []
+        minimum = maximum = np.arange(len(data), dtype=np.int32 if len(data) < 2 ** 31
+                                      else np.int64)
+        while len(minimum) > 1:
+            minimum = self.reduce(data, minimum, np.less_equal)
+            maximum = self.reduce(data, maximum, np.greater_equal)
+            self.levels.append((minimum, maximum))
+
+    def select(self, start: int, end: int, points: int) -> np.ndarray:
+        """
+        This method selects the indices of a range of the series to plot at a passed amount of
+        points (such as the pixel width of the graph). Ranges of at most twice as many values are
+        returned whole.
+
+        :param start: Index of the first value of the range.
+        :param end: Index after the last value of the range.
+        :param points: Amount of points the range is plotted at.
+        :returns: Array of the selected indices (in time order).
+        """
+        count = end - start
+        if count <= 2 * points or not self.levels:
+            return np.arange(start, end)
+        level = min(int(np.ceil(np.log2(count / points))), len(self.levels))
+        minimum, maximum = self.levels[level - 1]
+        first = -(-start >> level)
+        last = end >> level
+        if first >= last:
+            return self.select_extremes(start, end)
+        indices = np.empty(2 * (last - first), dtype=minimum.dtype)
+        indices[0::2] = np.minimum(minimum[first:last], maximum[first:last])
+        indices[1::2] = np.maximum(minimum[first:last], maximum[first:last])
+        return np.concatenate((self.select_extremes(start, first << level), indices,
+                               self.select_extremes(last << level, end)))
+
+    def select_extremes(self, start: int, end: int) -> np.ndarray:
+        """
+        This method selects the indices of the minimum and maximum value of a range of the series
+        (in time order), for the partial buckets at either end of a selected range.
+
+        :param start: Index of the first value of the range.
+        :param end: Index after the last value of the range.
+        :returns: Array of the selected indices (empty if the range is).
+        """
+        if start >= end:
+            return np.empty(0, dtype=np.int64)
+        values = self.data[start:end]
+        return np.unique([start + int(np.argmin(values)), start + int(np.argmax(values))])
+
+    @staticmethod
+    def reduce(data: np.ndarray, indices: np.ndarray, compare: np.ufunc) -> np.ndarray:
+        """
+        This method reduces a level of the pyramid to the next, keeping the index of the value of
+        each pair of indices that wins the comparison.
+
+        :param data: Array of the values of the series.
+        :param indices: Array of the indices of the level.
+        :param compare: Comparison the kept value wins (np.less_equal or np.greater_equal).
+        :returns: Array of the indices of the next level.
+        """
+        if len(indices) % 2:
+            indices = np.append(indices, indices[-1])
+        first = indices[0::2]
+        second = indices[1::2]
+        return np.where(compare(data[first], data[second]), first, second)
@@ -4,27 +4,113 @@
 # University: University of Limerick (Ireland)
 
 """This module contains the Incident class, to represent a model of an incident."""
+from base64 import b64decode
 from csv import writer
-from typing import List
+from datetime import datetime
+from typing import List, Tuple
+
+import numpy as np
+
+from iotumble.models.decimation_pyramid import DecimationPyramid
+from iotumble.models.timestamp import Timestamp
 
 
 class Incident:
     """
-    This class represents a model of an incident. It contains a constructor, the getter methods for
-    its parameters, and a CSV exporting method.
+    This class represents a model of an incident. It contains a constructor, the methods to create
+    it from a JSON or compact payload, the getter methods for its parameters, and a CSV exporting
+    method.
+
+    The timestamps are stored as one contiguous array of float64 columns (x, y, z, svm, and epoch),
+    with a column of timestamp IDs, so the getter methods of each column return read-only views
+    rather than building a list on every call. Timestamp objects are only created when they are
+    requested, as views of a row of the columns. Its summary statistics are computed once, with
+    vectorized operations over the columns, and kept, as is the DecimationPyramid of each axis
+    that is plotted.
     """
+    axes = ("x", "y", "z", "svm")
+    impact_threshold = 20
+    free_fall_threshold = 6
+    stillness_tolerance = 1
 
-    def __init__(self, incident_id: int, timestamps: List):
+    def __init__(self, incident_id: str, columns: np.ndarray, timestamp_ids: np.ndarray = None):
         """
         This constructor instantiates an Incident object.
 
         :param incident_id: ID of the Incident.
-        :param timestamps: List of Timestamp objects.
+        :param columns: Array of the x, y, z, svm, and epoch columns (5 rows of float64 values).
+        :param timestamp_ids: Array of the timestamp IDs (counted from 0 if None).
         """
         self.incident_id = incident_id
-        self.timestamps = timestamps
+        self.columns = np.array(columns, dtype=np.float64, order="C", ndmin=2)
+        self.columns.flags.writeable = False
+        if timestamp_ids is None:
+            timestamp_ids = np.arange(self.columns.shape[1])
+        self.timestamp_ids = np.array(timestamp_ids, dtype=np.int64)
+        self.timestamp_ids.flags.writeable = False
+        self.time = None
+        self.summary = None
+        self.pyramids = {}
 
-    def get_incident_id(self) -> int:
+    @classmethod
+    def from_payload(cls, incident_id: str, payload: dict):
+        """
+        This method creates an Incident object from the payload of an incident item (a JSON or
+        compact payload).
+
+        :param incident_id: ID of the Incident.
+        :param payload: Dictionary of the payload.
+        :returns: Instance of an Incident object.
+        :raises ValueError: If the compact payload version is not supported, or the payload has no
+        timestamps.
+        """
+        if "v" in payload:
+            columns, timestamp_ids = cls.decode_columns(payload), None
+        else:
+            columns, timestamp_ids = cls.create_columns(payload)
+        if not columns.shape[1]:
+            raise ValueError(f"The incident {incident_id} has no timestamps!")
+        return cls(incident_id, columns, timestamp_ids)
+
+    @staticmethod
+    def create_columns(timestamps: dict) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This method creates the columns and timestamp IDs of an Incident from the timestamps of a
+        JSON payload (skipping its other keys, such as its peak SVM).
+
+        :param timestamps: Dictionary of the timestamps of a JSON payload.
+        :returns: Tuple of the array of x, y, z, svm, and epoch columns, and the array of
+        timestamp IDs.
+        """
+        timestamps = sorted(((int(timestamp_id), sensor_data) for timestamp_id, sensor_data
+                             in timestamps.items() if timestamp_id.isdigit()),
+                            key=lambda d: d[0])
+        rows = [[float(data) for data in sensor_data.values()] for _, sensor_data in timestamps]
+        columns = np.array(rows, dtype=np.float64).reshape(len(rows), 5).T
+        return columns, np.array([timestamp_id for timestamp_id, _ in timestamps], dtype=np.int64)
+
+    @staticmethod
+    def decode_columns(payload: dict) -> np.ndarray:
+        """
+        This method decodes the columns of an Incident from a compact payload, by unpacking its
+        float32 columns (x, y, z, svm, and the epoch offsets from its base epoch) in one pass.
+
+        :param payload: Dictionary of a compact payload.
+        :returns: Array of the x, y, z, svm, and epoch columns.
+        :raises ValueError: If the compact payload version is not supported, or its data is short.
+        """
+        if int(payload["v"]) != 1:
+            raise ValueError(f"Unsupported compact payload version {payload['v']}!")
+        length = int(payload["n"])
+        data = np.frombuffer(b64decode(payload["data"]), dtype="<f4", count=length * 5)
+        columns = data.reshape(5, length).astype(np.float64)
+        columns[4] += float(payload["ep"])
+        return columns
+
+    def __len__(self) -> int:
+        return self.columns.shape[1]
+
+    def get_incident_id(self) -> str:
         """
         This method gets the Incident ID.
 
@@ -32,94 +118,180 @@ class Incident:
         """
         return self.incident_id
 
-    def get_timestamps(self) -> List:
+    def get_columns(self) -> np.ndarray:
+        """
+        This method gets the columns of the Incident.
+
+        :returns: Read-only array of the x, y, z, svm, and epoch columns.
+        """
+        return self.columns
+
+    def get_timestamp_ids(self) -> np.ndarray:
+        """
+        This method gets the timestamp IDs of the Incident.
+
+        :returns: Read-only array of the timestamp IDs.
+        """
+        return self.timestamp_ids
+
+    def get_timestamp(self, index: int) -> Timestamp:
+        """
+        This method gets a Timestamp object of a row of the columns.
+
+        :param index: Index of the row.
+        :returns: Timestamp object of the row.
+        """
+        return Timestamp(self.timestamp_ids[index], self.columns, index)
+
+    def get_timestamps(self) -> List[Timestamp]:
         """
         This method gets the list of Timestamp objects.
 
         :returns: List of Timestamp objects.
         """
-        return self.timestamps
+        return [Timestamp(timestamp_id, self.columns, i)
+                for i, timestamp_id in enumerate(self.timestamp_ids.tolist())]
 
-    def get_timestamps_time(self) -> List[float]:
+    def get_timestamps_time(self) -> np.ndarray:
         """
-        This method gets a list of the timestamps time-data.
+        This method gets the timestamps time-data, as the seconds elapsed since the first
+        timestamp (so it matches the devices sample rate and any missed samples). It is computed
+        once, on its first call.
 
-        :returns: List of timestamps time-data.
+        :returns: Read-only array of timestamps time-data.
         """
-        time = []
-        for i in range(len(self.timestamps)):
-            time.append(i / 10)
-        return time
+        if self.time is None:
+            self.time = self.columns[4] - self.columns[4, 0]
+            self.time.flags.writeable = False
+        return self.time
 
-    def get_timestamps_x(self) -> List[float]:
+    def get_timestamps_x(self) -> np.ndarray:
         """
-        This method gets a list of the timestamps x-data.
+        This method gets the timestamps x-data.
 
-        :returns: List of timestamps x-data.
+        :returns: Read-only array of timestamps x-data.
         """
-        x_data = []
-        for timestamp in self.timestamps:
-            x_data.append(timestamp.get_x_acc())
-        return x_data
+        return self.columns[0]
 
-    def get_timestamps_y(self) -> List[float]:
+    def get_timestamps_y(self) -> np.ndarray:
         """
-        This method gets a list of the timestamps y-data.
+        This method gets the timestamps y-data.
 
-        :returns: List of timestamps y-data.
+        :returns: Read-only array of timestamps y-data.
         """
-        y_data = []
-        for timestamp in self.timestamps:
-            y_data.append(timestamp.get_y_acc())
-        return y_data
+        return self.columns[1]
 
-    def get_timestamps_z(self) -> List[float]:
+    def get_timestamps_z(self) -> np.ndarray:
         """
-        This method gets a list of the timestamps z-data.
+        This method gets the timestamps z-data.
 
-        :returns: List of timestamps z-data.
+        :returns: Read-only array of timestamps z-data.
         """
-        z_data = []
-        for timestamp in self.timestamps:
-            z_data.append(timestamp.get_z_acc())
-        return z_data
+        return self.columns[2]
 
-    def get_timestamps_svm(self) -> List[float]:
+    def get_timestamps_svm(self) -> np.ndarray:
         """
-        This method gets a list of the timestamps svm-data.
+        This method gets the timestamps svm-data.
 
-        :returns: List of timestamps svm-data.
+        :returns: Read-only array of timestamps svm-data.
         """
-        svm_data = []
-        for timestamp in self.timestamps:
-            svm_data.append(timestamp.get_svm())
-        return svm_data
+        return self.columns[3]
 
-    def get_max_timestamp(self):
+    def get_max_timestamp(self) -> Timestamp:
         """
-        This method gets the Timestamp object with the maximum SVM value.
+        This method gets the Timestamp object with the maximum SVM value (the last, if several
+        timestamps share it), from the summary of the Incident.
 
         :returns: Timestamp object with the maximum SVM value.
         """
-        max_timestamp = None
-        max_svm = max(timestamp.get_svm() for timestamp in self.timestamps)
-        for timestamp in self.timestamps:
-            if timestamp.get_svm() == max_svm:
-                max_timestamp = timestamp
-        return max_timestamp
+        return self.get_timestamp(self.get_summary()["peak_index"])
+
+    def get_decimated(self, axis: str, start: float, end: float, points: int) -> np.ndarray:
+        """
+        This method gets the indices of the timestamps of an axis to plot between two times, at a
+        passed amount of points, from the DecimationPyramid of the axis (built on its first call).
+        The timestamps either side of the times are included, so the plotted line is not cut off.
+
+        :param axis: Name of the axis ("x", "y", "z", or "svm").
+        :param start: Seconds since the first timestamp the plot starts at.
+        :param end: Seconds since the first timestamp the plot ends at.
+        :param points: Amount of points the timestamps are plotted at.
+        :returns: Array of the indices of the timestamps to plot.
+        """
+        if axis not in self.pyramids:
+            self.pyramids[axis] = DecimationPyramid(self.columns[self.axes.index(axis)])
+        time = self.get_timestamps_time()
+        first = max(int(np.searchsorted(time, start)) - 1, 0)
+        last = min(int(np.searchsorted(time, end, "right")) + 1, len(self))
+        return self.pyramids[axis].select(first, last, points)
+
+    def get_summary(self) -> dict:
+        """
+        This method gets the summary statistics of the Incident, computing them on its first call:
+        the peak SVM (its value, index, and seconds since the first timestamp), the minimum,
+        maximum, mean, and standard deviation of each axis, the seconds the SVM stays above the
+        impact threshold around the peak, the seconds of the last free-fall (SVM below the
+        free-fall threshold) before the peak, and the stillness after the peak (the fraction of
+        timestamps whose absolute values are all within 1 of their average, as the device checks
+        inactivity).
+
+        :returns: Dictionary of the summary statistics.
+        """
+        if self.summary is not None:
+            return self.summary
+        time = self.get_timestamps_time()
+        values = self.columns[:4]
+        svm = self.columns[3]
+        peak = len(self) - 1 - int(np.argmax(svm[::-1]))
+        above = svm >= self.impact_threshold
+        below = svm[:peak] < self.free_fall_threshold
+        still = None
+        if peak + 1 < len(self):
+            after = np.abs(values[:, peak + 1:])
+            deviation = np.abs(after - after.mean(axis=1, keepdims=True))
+            still = float(np.all(deviation <= self.stillness_tolerance, axis=0).mean())
+        self.summary = {"peak_svm": float(svm[peak]), "peak_index": peak,
+                        "peak_time": float(time[peak]),
+                        "min": dict(zip(self.axes, values.min(axis=1).tolist())),
+                        "max": dict(zip(self.axes, values.max(axis=1).tolist())),
+                        "mean": dict(zip(self.axes, values.mean(axis=1).tolist())),
+                        "std": dict(zip(self.axes, values.std(axis=1).tolist())),
+                        "impact_duration": self.get_run_duration(above, peak),
+                        "free_fall_duration": (self.get_run_duration(below, int(
+                            np.flatnonzero(below)[-1])) if below.any() else 0.0),
+                        "stillness": still}
+        return self.summary
+
+    def get_run_duration(self, mask: np.ndarray, index: int) -> float:
+        """
+        This method gets the seconds of the run of consecutive timestamps of a mask that contains
+        an index, until the timestamp after the run (or the last timestamp).
+
+        :param mask: Boolean array of the timestamps in runs (from the first timestamp).
+        :param index: Index of a timestamp within the run.
+        :returns: Seconds of the run (0 if the timestamp of the index is not in a run).
+        """
+        if not mask[index]:
+            return 0.0
+        time = self.get_timestamps_time()
+        gaps_before = np.flatnonzero(~mask[:index])
+        gaps_after = np.flatnonzero(~mask[index:])
+        start = int(gaps_before[-1]) + 1 if gaps_before.size else 0
+        end = index + int(gaps_after[0]) if gaps_after.size else min(len(mask), len(self) - 1)
+        return float(time[end] - time[start])
 
     def export_timestamps(self, csv_path: str):
         """
         This method exports all data from the list of Timestamp objects to a CSV file of a passed
-        path.
+        path. The columns are converted to Python values a column at a time, and written with a
+        single writerows() call.
 
         :param csv_path: Name of CSV path.
         """
+        times = [datetime.fromtimestamp(epoch).strftime("%H:%M:%S.%f")[:-3]
+                 for epoch in self.columns[4].tolist()]
         with open(f"{csv_path}.csv", "w", newline="", encoding="utf-8") as file:
             csv = writer(file, delimiter=",")
             csv.writerow(["Timestamp ID", "Timestamp", "X-Acceleration", "Y-Acceleration",
                           "Z-Acceleration", "Signal Vector Magnitude"])
-            for timestamp in self.timestamps:
-                csv.writerow([str(timestamp.get_timestamp_id()), timestamp.get_time(),
-                              str(timestamp.get_x_acc()), str(timestamp.get_y_acc()),
-                              str(timestamp.get_z_acc()), str(timestamp.get_svm())])
+            csv.writerows(zip(self.timestamp_ids.tolist(), times, *self.columns[:4].tolist()))
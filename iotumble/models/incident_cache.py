@@ -0,0 +1,263 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the IncidentCache class, containing the functionality to keep requested
+incidents in memory and on disk, so they are only downloaded once.
+"""
+from collections import OrderedDict
+from configparser import ConfigParser
+from json import dumps, loads
+from sqlite3 import connect
+from struct import Struct
+from threading import Lock
+from time import time
+from typing import Dict, List
+
+import numpy as np
+
+from iotumble.models.incident import Incident
+
+
+class IncidentCache:
+    """
+    This class represents a cache of incidents. It contains a constructor, the method to create it
+    from a credentials.ini, the methods to open and close its database, the methods to check, get,
+    and put incidents, the method to get incident summaries, the methods to encode and decode
+    incidents, and the getter method for its statistics.
+
+    Published incidents never change, so they are never invalidated. Decoded Incident objects are
+    kept in a least recently used (LRU) cache, bounded by the size of their encoded columns.
+    Every incident is also written to an SQLite database (when a cache path is set), bounded by
+    the same size and evicting the least recently opened incidents, so reopening an incident is
+    instant, even after a restart or without a connection. The summary statistics of each incident
+    are also kept (in memory and in their own table), and are never evicted, as they are small and
+    let the incident list show them without loading the incidents.
+    """
+    version = 1
+    header = Struct("<II")
+
+    def __init__(self, cache_path: str = "", memory_size: int = 16 << 20,
+                 disk_size: int = 256 << 20):
+        """
+        This constructor instantiates an IncidentCache object.
+
+        :param cache_path: Name of the path of the SQLite database ("" to only cache in memory).
+        :param memory_size: Maximum size of the incidents kept in memory (in bytes).
+        :param disk_size: Maximum size of the incidents kept in the database (in bytes).
+        """
+        self.cache_path = cache_path
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.incidents = OrderedDict()
+        self.summaries = {}
+        self.memory_used = 0
+        self.disk_used = 0
+        self.connection = None
+        self.lock = Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    @classmethod
+    def from_config(cls, credentials: ConfigParser) -> "IncidentCache":
+        """
+        This method creates an IncidentCache object from the values of the cache section of a read
+        credentials.ini (its path, and its memory and disk sizes in megabytes).
+
+        :param credentials: ConfigParser object of a read credentials.ini.
+        :returns: Instance of an IncidentCache object.
+        """
+        return cls(credentials.get("cache", "cache_path", fallback="incident_cache.db"),
+                   credentials.getint("cache", "memory_size", fallback=16) << 20,
+                   credentials.getint("cache", "disk_size", fallback=256) << 20)
+
+    def open(self):
+        """
+        This method opens (and creates if needed) the SQLite database of the IncidentCache. It is
+        used from the thread of the Worker, so the connection is not bound to the opening thread,
+        and is guarded by a lock instead.
+        """
+        with self.lock:
+            if not self.cache_path or self.connection is not None:
+                return
+            self.connection = connect(self.cache_path, check_same_thread=False)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS incidents (incident_id TEXT "
+                                    "PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, "
+                                    "accessed REAL NOT NULL)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS summaries (incident_id TEXT "
+                                    "PRIMARY KEY, summary TEXT NOT NULL)")
+            self.connection.commit()
+            self.disk_used = self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM incidents").fetchone()[0]
+
+    def close(self):
+        """This method closes the SQLite database of the IncidentCache."""
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def get(self, incident_id: str):
+        """
+        This method gets a cached incident, from memory, or else from the database (keeping it in
+        memory again).
+
+        :param incident_id: ID of the Incident.
+        :returns: Instance of an Incident object, or None if it is not cached.
+        """
+        with self.lock:
+            if incident_id in self.incidents:
+                self.incidents.move_to_end(incident_id)
+                self.stats["hits"] += 1
+                return self.incidents[incident_id][0]
+            row = None
+            if self.connection is not None:
+                row = self.connection.execute("SELECT data FROM incidents WHERE incident_id = ?",
+                                              (incident_id,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.connection.execute("UPDATE incidents SET accessed = ? WHERE incident_id = ?",
+                                    (time(), incident_id))
+            self.connection.commit()
+            self.stats["disk_hits"] += 1
+            incident = self.decode(incident_id, row[0])
+            self.keep(incident, len(row[0]))
+            return incident
+
+    def contains(self, incident_id: str) -> bool:
+        """
+        This method checks if an incident is cached, in memory or in the database, without
+        counting it as a hit or miss.
+
+        :param incident_id: ID of the Incident.
+        :returns: Boolean outcome on if the incident is cached.
+        """
+        with self.lock:
+            if incident_id in self.incidents:
+                return True
+            if self.connection is None:
+                return False
+            return self.connection.execute("SELECT 1 FROM incidents WHERE incident_id = ?",
+                                           (incident_id,)).fetchone() is not None
+
+    def put(self, incident: Incident):
+        """
+        This method caches an incident (and its summary) in memory and in the database, evicting
+        the least recently used incidents of each once their size is exceeded.
+
+        :param incident: Instance of an Incident object.
+        """
+        data = self.encode(incident)
+        summary = incident.get_summary()
+        with self.lock:
+            self.keep(incident, len(data))
+            self.summaries[incident.get_incident_id()] = summary
+            if self.connection is not None:
+                self.connection.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?)",
+                                        (incident.get_incident_id(), dumps(summary)))
+                self.connection.commit()
+            if self.connection is None or len(data) > self.disk_size:
+                return
+            row = self.connection.execute("SELECT size FROM incidents WHERE incident_id = ?",
+                                          (incident.get_incident_id(),)).fetchone()
+            self.connection.execute("INSERT OR REPLACE INTO incidents VALUES (?, ?, ?, ?)",
+                                    (incident.get_incident_id(), data, len(data), time()))
+            self.disk_used += len(data) - (row[0] if row else 0)
+            if self.disk_used > self.disk_size:
+                rows = self.connection.execute("SELECT incident_id, size FROM incidents ORDER BY "
+                                               "accessed").fetchall()
+                for incident_id, size in rows:
+                    if self.disk_used <= self.disk_size:
+                        break
+                    self.connection.execute("DELETE FROM incidents WHERE incident_id = ?",
+                                            (incident_id,))
+                    self.disk_used -= size
+            self.connection.commit()
+
+    def get_summaries(self, incident_ids: List[str]) -> Dict[str, dict]:
+        """
+        This method gets the summary statistics of any cached incidents of a list, from memory,
+        or else from the database.
+
+        :param incident_ids: List of the IDs of the Incidents.
+        :returns: Dictionary of the summary statistics by incident ID.
+        """
+        with self.lock:
+            summaries = {incident_id: self.summaries[incident_id] for incident_id in incident_ids
+                         if incident_id in self.summaries}
+            missing = [incident_id for incident_id in incident_ids if incident_id not in summaries]
+            if self.connection is not None and missing:
+                rows = self.connection.execute(
+                    f"SELECT incident_id, summary FROM summaries WHERE incident_id IN "
+                    f"({', '.join('?' * len(missing))})", missing).fetchall()
+                for incident_id, summary in rows:
+                    summaries[incident_id] = self.summaries[incident_id] = loads(summary)
+        return summaries
+
+    def keep(self, incident: Incident, size: int):
+        """
+        This method keeps an incident in memory as the most recently used, evicting the least
+        recently used incidents until the memory size is no longer exceeded.
+
+        :param incident: Instance of an Incident object.
+        :param size: Encoded size of the Incident (in bytes).
+        """
+        if size > self.memory_size:
+            return
+        incident_id = incident.get_incident_id()
+        if incident_id in self.incidents:
+            self.memory_used -= self.incidents.pop(incident_id)[1]
+        self.incidents[incident_id] = (incident, size)
+        self.memory_used += size
+        while self.memory_used > self.memory_size:
+            self.memory_used -= self.incidents.popitem(last=False)[1][1]
+            self.stats["evictions"] += 1
+
+    @classmethod
+    def encode(cls, incident: Incident) -> bytes:
+        """
+        This method encodes the columns of an incident as a header (version and length), an int32
+        column of timestamp IDs, and float64 columns of its x, y, z, svm, and epoch values.
+
+        :param incident: Instance of an Incident object.
+        :returns: Bytes of the encoded columns.
+        """
+        return (cls.header.pack(cls.version, len(incident))
+                + incident.get_timestamp_ids().astype("<i4").tobytes()
+                + incident.get_columns().astype("<f8").tobytes())
+
+    @classmethod
+    def decode(cls, incident_id: str, data: bytes) -> Incident:
+        """
+        This method decodes an Incident object from its encoded columns.
+
+        :param incident_id: ID of the Incident.
+        :param data: Bytes of the encoded columns.
+        :returns: Instance of an Incident object.
+        :raises ValueError: If the encoded version is not supported.
+        """
+        version, length = cls.header.unpack_from(data)
+        if version != cls.version:
+            raise ValueError(f"Unsupported incident cache version {version}!")
+        timestamp_ids = np.frombuffer(data, "<i4", length, cls.header.size)
+        columns = np.frombuffer(data, "<f8", 5 * length, cls.header.size + 4 * length)
+        return Incident(incident_id, columns.reshape(5, length), timestamp_ids)
+
+    def get_stats(self) -> dict:
+        """
+        This method gets the statistics of the IncidentCache (memory hits, disk hits, misses,
+        memory evictions, and the amount and size of the incidents in memory and on disk).
+
+        :returns: Dictionary of the cache statistics.
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            stats["hit_rate"] = ((stats["hits"] + stats["disk_hits"]) /
+                                 (stats["hits"] + stats["disk_hits"] + stats["misses"])
+                                 if stats["hits"] + stats["disk_hits"] + stats["misses"] else None)
+            stats["memory_incidents"] = len(self.incidents)
+            stats["memory_bytes"] = self.memory_used
+            stats["disk_bytes"] = self.disk_used
+        return stats
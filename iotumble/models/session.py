@@ -7,23 +7,51 @@
 This module contains the Session class, representing a model of a session, and containing the
 functionality to interact with AWS.
 """
+from collections import deque
+from time import sleep
+from typing import Dict, Iterator, List
+
 from boto3 import Session as BotoSession
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
 
 from iotumble.models.incident import Incident
-from iotumble.models.timestamp import Timestamp
+from iotumble.models.incident_cache import IncidentCache
 
 
 class Session:
     """
     This class represents a model of a session. It contains a constructor, the methods that allow it
     to interact with AWS, and the DynamoDB request methods.
+
+    Incidents are either keyed by a global incident ID (pk = ID, sk = "incident"), or sharded by
+    the device that published them (pk = shard, sk = "incident#" + time-ordered key). Sharded
+    incidents are listed a page at a time, with a Query of each shard, so no global count item is
+    read for them. The amount of shards is registered by the devices in the shards item (pk = 0,
+    sk = "shards"), so the shards of any device configuration are queried.
+    Their incident IDs are the shard and key joined by a "-" (such as "3-1650000000000-7-pi").
+    Devices allocate global incident IDs from leased ranges, so not every ID up to the highest
+    leased ID is published. The count item (incremented for each published item) is the amount
+    of global incidents, and the lease item only bounds the IDs they are searched for within.
+    Requested incidents are kept in an IncidentCache, as published incidents never change.
     """
+    default_shards = 16
+    shard_prefix = "incident#"
+    batch_size = 100
+    batch_retries = 5
 
-    def __init__(self):
-        """This constructor instantiates a Session object."""
+    def __init__(self, incident_cache: IncidentCache = None):
+        """
+        This constructor instantiates a Session object.
+
+        :param incident_cache: Instance of an IncidentCache object (a memory-only IncidentCache if
+        None).
+        """
         self.boto_session = None
+        self.dynamo_db = None
         self.incidents_table = None
+        self.incident_cache = incident_cache if incident_cache is not None else IncidentCache()
+        self.reset_incident_pages()
 
     def connect(self, access_key_id: str, secret_access_key: str, region_name: str):
         """
@@ -39,45 +67,190 @@ class Session:
 
     def disconnect(self):
         """
-        This method disconnects from AWS by destroying the boto3 session and DynamoDB table
-        resource.
+        This method disconnects from AWS by destroying the boto3 session, DynamoDB resource, and
+        DynamoDB table resource.
         """
         self.boto_session = None
+        self.dynamo_db = None
         self.incidents_table = None
+        self.reset_incident_pages()
 
     def create_table(self, table_name: str):
         """
-        This method creates a DynamoDB table resource.
+        This method creates a DynamoDB resource, and a DynamoDB table resource.
 
         :param table_name: Name of the DynamoDB table.
         """
-        dynamo_db = self.boto_session.resource("dynamodb")
-        self.incidents_table = dynamo_db.Table(table_name)
+        self.dynamo_db = self.boto_session.resource("dynamodb")
+        self.incidents_table = self.dynamo_db.Table(table_name)
 
-    def request_incident(self, incident_id: int):
+    def request_incident(self, incident_id: str):
         """
-        This method requests an incident item from the created DynamoDB resource, creates an
-        Incident object from its response, and returns it.
+        This method gets an incident from the IncidentCache, or else requests its item from the
+        created DynamoDB resource, creates an Incident object from its response (a JSON or compact
+        payload), and caches it, before returning it.
 
         :param incident_id: ID of the Incident.
         :returns: Instance of an Incident object.
         """
+        self.incident_cache.open()
+        incident = self.incident_cache.get(incident_id)
+        if incident is not None:
+            return incident
         try:
-            response = self.incidents_table.get_item(Key={"pk": incident_id, "sk": "incident"})
-            timestamps = response["Item"]["msg"]
-        except KeyError:
+            response = self.incidents_table.get_item(Key=self.create_key(incident_id))
+            incident = self.create_incident(incident_id, response["Item"])
+        except (AttributeError, KeyError, ValueError):
             return False
-        else:
-            timestamps = dict(sorted(timestamps.items(), key=lambda d: int(d[0])))
-            incident_timestamps = []
-            for timestamp_id in timestamps:
-                timestamp_data = []
-                sensor_data = timestamps[timestamp_id]
-                for data in sensor_data:
-                    timestamp_data.append(float(sensor_data[data]))
-                timestamp = Timestamp(int(timestamp_id), timestamp_data)
-                incident_timestamps.append(timestamp)
-            return Incident(incident_id, incident_timestamps)
+        self.incident_cache.put(incident)
+        return incident
+
+    def request_incidents(self, incident_ids: List[str]) -> Dict[str, Incident]:
+        """
+        This method requests many incidents at once, with request_batch(), getting any cached
+        incidents from the IncidentCache instead. Each requested incident is cached, so it is used
+        to prefetch incidents before they are opened.
+
+        :param incident_ids: List of the IDs of the Incidents.
+        :returns: Dictionary of the Incident objects by incident ID (without the incidents that
+        do not exist or could not be requested).
+        """
+        self.incident_cache.open()
+        incidents = {}
+        keys = []
+        for incident_id in dict.fromkeys(incident_ids):
+            if self.incident_cache.contains(incident_id):
+                incident = self.incident_cache.get(incident_id)
+                if incident is not None:
+                    incidents[incident_id] = incident
+                    continue
+            try:
+                keys.append(self.create_key(incident_id))
+            except ValueError:
+                continue
+        if self.dynamo_db is None:
+            return incidents
+        for start in range(0, len(keys), self.batch_size):
+            for item in self.request_batch(keys[start:start + self.batch_size]):
+                incident_id = self.create_incident_id(item)
+                try:
+                    incident = self.create_incident(incident_id, item)
+                except (KeyError, ValueError):
+                    continue
+                self.incident_cache.put(incident)
+                incidents[incident_id] = incident
+        return incidents
+
+    def request_batch(self, keys: List[dict], projection: str = None) -> List[dict]:
+        """
+        This method requests the items of up to 100 keys with a BatchGetItem request. The
+        unprocessed keys of a request (when DynamoDB throttles it) are requested again, with an
+        exponential backoff.
+
+        :param keys: List of the DynamoDB keys of the items.
+        :param projection: Names of the attributes requested (None for every attribute).
+        :returns: List of the requested items (without any that do not exist or could not be
+        requested).
+        """
+        table_name = self.incidents_table.name
+        request = {table_name: {"Keys": keys}}
+        if projection is not None:
+            request[table_name]["ProjectionExpression"] = projection
+        items = []
+        for attempt in range(self.batch_retries + 1):
+            if attempt:
+                sleep(0.05 * 2 ** (attempt - 1))
+            try:
+                response = self.dynamo_db.batch_get_item(RequestItems=request)
+            except ClientError:
+                break
+            items.extend(response.get("Responses", {}).get(table_name, []))
+            request = response.get("UnprocessedKeys")
+            if not request:
+                break
+        return items
+
+    def request_incident_items(self, start: float = None, end: float = None,
+                               page_size: int = 50) -> Iterator[List[dict]]:
+        """
+        This method streams every incident item of the created DynamoDB resource, a page at a
+        time, so any amount of incidents can be read with bounded memory. The sharded incident
+        items of each shard are queried between the passed epoch times (using their time-ordered
+        keys), and then the items of the global incident IDs up to the highest leased ID are
+        requested in batches, until as many as the incident count have been found (their epoch
+        times are only known once they are decoded, and they are skipped if the incident count
+        cannot be requested).
+
+        :param start: Epoch time the incidents start from (None for the first incident).
+        :param end: Epoch time the incidents end at (None for the last incident).
+        :param page_size: Amount of incident items in each page.
+        :returns: Iterator of the lists of incident items of each page.
+        :raises ClientError: If a request fails.
+        """
+        lower = self.shard_prefix + (f"{round(start * 1000):013d}" if start is not None else "")
+        upper = self.shard_prefix + (f"{round(end * 1000) + 1:013d}" if end is not None else "~")
+        for shard in range(1, self.request_shards() + 1):
+            query = {"KeyConditionExpression": (Key("pk").eq(shard)
+                                                & Key("sk").between(lower, upper)),
+                     "Limit": page_size}
+            while True:
+                response = self.incidents_table.query(**query)
+                if response["Items"]:
+                    yield response["Items"]
+                if response.get("LastEvaluatedKey") is None:
+                    break
+                query["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        count = self.request_incident_count() or 0
+        last_id = max(count, self.request_incident_lease() or 0)
+        step = min(page_size, self.batch_size)
+        for first in range(1, last_id + 1, step):
+            if count <= 0:
+                break
+            keys = [{"pk": incident_id, "sk": "incident"}
+                    for incident_id in range(first, min(first + step, last_id + 1))]
+            items = self.request_batch(keys)
+            count -= len(items)
+            if items:
+                yield items
+
+    def create_incident(self, incident_id: str, item: dict) -> Incident:
+        """
+        This method creates an Incident object from an incident item (a JSON or compact payload).
+
+        :param incident_id: ID of the Incident.
+        :param item: Dictionary of the incident item.
+        :returns: Instance of an Incident object.
+        :raises KeyError: If the incident item has no payload.
+        :raises ValueError: If the compact payload version is not supported, or the payload has no
+        timestamps.
+        """
+        return Incident.from_payload(incident_id, item["msg"])
+
+    @classmethod
+    def create_key(cls, incident_id: str) -> dict:
+        """
+        This method creates the DynamoDB key of an incident item from its incident ID.
+
+        :param incident_id: ID of the Incident.
+        :returns: Dictionary of the partition key and sort key.
+        :raises ValueError: If the incident ID is not valid.
+        """
+        if "-" in incident_id:
+            shard, key = incident_id.split("-", 1)
+            return {"pk": int(shard), "sk": cls.shard_prefix + key}
+        return {"pk": int(incident_id), "sk": "incident"}
+
+    @classmethod
+    def create_incident_id(cls, item: dict) -> str:
+        """
+        This method creates the incident ID of an incident item from its DynamoDB key.
+
+        :param item: Dictionary of the incident item.
+        :returns: ID of the Incident.
+        """
+        if item["sk"] == "incident":
+            return str(item["pk"])
+        return f"{item['pk']}-{item['sk'][len(cls.shard_prefix):]}"
 
     def request_incident_count(self):
         """
@@ -88,8 +261,170 @@ class Session:
         """
         try:
             response = self.incidents_table.get_item(Key={"pk": 0, "sk": "count"})
-            count = response["Item"]["msg"]
         except ClientError:
             return False
         else:
-            return int(count)
+            return int(response.get("Item", {}).get("msg", 0))
+
+    def request_incident_lease(self):
+        """
+        This method requests the highest incident ID leased to any device from the created
+        DynamoDB resource. Leased IDs are not all published, so it is only the highest incident ID
+        that may have been published.
+
+        :returns: Highest leased incident ID (0 if no IDs have been leased).
+        """
+        try:
+            response = self.incidents_table.get_item(Key={"pk": 0, "sk": "lease"})
+        except ClientError:
+            return False
+        else:
+            return int(response.get("Item", {}).get("msg", 0))
+
+    def request_shards(self) -> int:
+        """
+        This method requests the amount of shards registered by the devices from the created
+        DynamoDB resource.
+
+        :returns: Amount of shards (the default amount if no device has registered one).
+        :raises ClientError: If the request fails.
+        """
+        response = self.incidents_table.get_item(Key={"pk": 0, "sk": "shards"})
+        return int(response.get("Item", {}).get("msg", self.default_shards))
+
+    def reset_incident_pages(self, page_size: int = 50):
+        """
+        This method resets the paging of the incident list, so the next requested page is its
+        first page. The paging state is replaced rather than cleared, so a page that is still
+        being requested on a background thread cannot change it.
+
+        :param page_size: Amount of incidents in each page.
+        """
+        self.incident_pages = {"size": page_size, "legacy_id": None, "legacy_count": 0,
+                               "shards": None}
+
+    def request_incident_page(self):
+        """
+        This method requests the next page of the incident list (newest first), as a dictionary of
+        metadata for each incident (its incident ID, device, epoch time, peak SVM, and summary
+        statistics if it has been opened before). Sharded incidents come first, merged by their
+        time-ordered keys from a page of each shard, and then the global incident IDs (which have
+        no metadata), counted down from the highest leased ID until as many as the incident count
+        have been listed. While there are more IDs left than incidents, only the IDs whose items
+        exist are listed, checked a batch at a time. If a request fails, the sharded items taken
+        for the page are put back, so the same page is requested again by the next call.
+
+        :returns: List of incident metadata dictionaries (empty once every incident has been
+        listed), or False if a request fails.
+        """
+        pages = self.incident_pages
+        page = []
+        taken = []
+        if self.incidents_table is None:
+            return page
+        try:
+            if pages["shards"] is None:
+                pages["shards"] = {shard: {"items": deque(), "start": None, "done": False}
+                                   for shard in range(1, self.request_shards() + 1)}
+            shard_pages = pages["shards"]
+            while len(page) < pages["size"]:
+                newest = None
+                for shard, state in shard_pages.items():
+                    if not state["items"] and not state["done"]:
+                        self.request_shard_page(shard, state, pages["size"])
+                    if state["items"] and (newest is None or state["items"][0]["sk"]
+                                           > shard_pages[newest]["items"][0]["sk"]):
+                        newest = shard
+                if newest is None:
+                    break
+                taken.append((newest, shard_pages[newest]["items"].popleft()))
+                page.append(self.create_metadata(*taken[-1]))
+        except ClientError:
+            self.restore_shard_items(taken)
+            return False
+        if len(page) < pages["size"] and pages["legacy_id"] is None:
+            count = self.request_incident_count()
+            lease = self.request_incident_lease()
+            if count is False or lease is False:
+                self.restore_shard_items(taken)
+                return False
+            pages["legacy_id"], pages["legacy_count"] = max(count, lease), count
+        while len(page) < pages["size"] and pages["legacy_id"] > 0 and pages["legacy_count"] > 0:
+            last_id = pages["legacy_id"]
+            if last_id > pages["legacy_count"]:
+                first_id = max(last_id - self.batch_size, 0) + 1
+                incident_ids = self.request_legacy_ids(first_id, last_id)
+            else:
+                first_id, incident_ids = last_id, [last_id]
+            space = pages["size"] - len(page)
+            pages["legacy_id"] = incident_ids[space] if len(incident_ids) > space else first_id - 1
+            for incident_id in incident_ids[:space]:
+                page.append({"incident_id": str(incident_id), "device": None, "time": None,
+                             "peak": None})
+                pages["legacy_count"] -= 1
+        self.incident_cache.open()
+        summaries = self.incident_cache.get_summaries([incident["incident_id"]
+                                                       for incident in page])
+        for incident in page:
+            incident["summary"] = summaries.get(incident["incident_id"])
+        return page
+
+    def restore_shard_items(self, taken: List[tuple]):
+        """
+        This method puts the sharded items taken for a failed page back at the front of the paging
+        state of their shards, in the order they were taken.
+
+        :param taken: List of the shard and projected item of each taken incident.
+        """
+        for shard, item in reversed(taken):
+            self.incident_pages["shards"][shard]["items"].appendleft(item)
+
+    def request_legacy_ids(self, first_id: int, last_id: int) -> List[int]:
+        """
+        This method checks which of a range of up to 100 global incident IDs have been published,
+        with a BatchGetItem request that only projects their partition keys.
+
+        :param first_id: Lowest incident ID of the range.
+        :param last_id: Highest incident ID of the range.
+        :returns: List of the published incident IDs of the range (highest first).
+        """
+        keys = [{"pk": incident_id, "sk": "incident"}
+                for incident_id in range(first_id, last_id + 1)]
+        return sorted((int(item["pk"]) for item in self.request_batch(keys, "pk")), reverse=True)
+
+    def request_shard_page(self, shard: int, state: dict, page_size: int):
+        """
+        This method queries the next page of the sharded incident items of a shard (newest first)
+        from the created DynamoDB resource, continuing from the LastEvaluatedKey of the previous
+        page. Only the sort key and peak SVM are projected, so no timestamps are read.
+
+        :param shard: Shard of the incident items.
+        :param state: Dictionary of the paging state of the shard.
+        :param page_size: Amount of incident items in each page.
+        """
+        query = {"KeyConditionExpression": (Key("pk").eq(shard)
+                                            & Key("sk").begins_with(self.shard_prefix)),
+                 "ProjectionExpression": "sk, msg.peak", "ScanIndexForward": False,
+                 "Limit": page_size}
+        if state["start"] is not None:
+            query["ExclusiveStartKey"] = state["start"]
+        response = self.incidents_table.query(**query)
+        state["items"].extend(response["Items"])
+        state["start"] = response.get("LastEvaluatedKey")
+        state["done"] = state["start"] is None
+
+    @classmethod
+    def create_metadata(cls, shard: int, item: dict) -> dict:
+        """
+        This method creates the metadata of a sharded incident from its projected item, reading
+        the epoch time and device from its time-ordered key.
+
+        :param shard: Shard of the incident item.
+        :param item: Dictionary of the projected incident item.
+        :returns: Dictionary of the incident ID, device, epoch time, and peak SVM.
+        """
+        key = item["sk"][len(cls.shard_prefix):]
+        epoch_ms, _, device = key.split("-", 2)
+        peak = item.get("msg", {}).get("peak")
+        return {"incident_id": f"{shard}-{key}", "device": device, "time": int(epoch_ms) / 1000,
+                "peak": None if peak is None else float(peak)}
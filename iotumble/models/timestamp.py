@@ -5,24 +5,31 @@
 
 """This module contains the Timestamp class, to represent a model of a timestamp."""
 from datetime import datetime
-from typing import List
+
+import numpy as np
 
 
 class Timestamp:
     """
     This class represents a model of a timestamp. It contains a constructor and the getter methods
     for its parameters.
+
+    A Timestamp holds no data of its own, and is a view of one row of the columns of an Incident,
+    so creating one copies nothing.
     """
+    __slots__ = ("timestamp_id", "columns", "index")
 
-    def __init__(self, timestamp_id: int, timestamp_data: List):
+    def __init__(self, timestamp_id: int, columns: np.ndarray, index: int):
         """
         This constructor instantiates a Timestamp object.
 
         :param timestamp_id: ID of the Timestamp.
-        :param timestamp_data: List of Timestamp data.
+        :param columns: Array of the x, y, z, svm, and epoch columns of its Incident.
+        :param index: Index of the Timestamp within the columns.
         """
         self.timestamp_id = timestamp_id
-        self.timestamp_data = timestamp_data
+        self.columns = columns
+        self.index = index
 
     def get_timestamp_id(self) -> int:
         """
@@ -30,7 +37,7 @@ class Timestamp:
 
         :returns: ID of the Timestamp.
         """
-        return self.timestamp_id
+        return int(self.timestamp_id)
 
     def get_x_acc(self) -> float:
         """
@@ -38,7 +45,7 @@ class Timestamp:
 
         :returns: X-Acceleration of the Timestamp.
         """
-        return self.timestamp_data[0]
+        return float(self.columns[0, self.index])
 
     def get_y_acc(self) -> float:
         """
@@ -46,7 +53,7 @@ class Timestamp:
 
         :returns: Y-Acceleration of the Timestamp.
         """
-        return self.timestamp_data[1]
+        return float(self.columns[1, self.index])
 
     def get_z_acc(self) -> float:
         """
@@ -54,7 +61,7 @@ class Timestamp:
 
         :returns: Z-Acceleration of the Timestamp.
         """
-        return self.timestamp_data[2]
+        return float(self.columns[2, self.index])
 
     def get_svm(self) -> float:
         """
@@ -62,7 +69,15 @@ class Timestamp:
 
         :returns: Signal Vector Magnitude of the Timestamp.
         """
-        return self.timestamp_data[3]
+        return float(self.columns[3, self.index])
+
+    def get_epoch(self) -> float:
+        """
+        This method gets epoch time of the Timestamp.
+
+        :returns: Epoch time of the Timestamp.
+        """
+        return float(self.columns[4, self.index])
 
     def get_date(self) -> str:
         """
@@ -70,7 +85,7 @@ class Timestamp:
 
         :returns: Date of the Timestamp.
         """
-        date_time = datetime.fromtimestamp(self.timestamp_data[4])
+        date_time = datetime.fromtimestamp(self.get_epoch())
         return date_time.strftime("%d %B %Y")
 
     def get_time(self) -> str:
@@ -79,5 +94,5 @@ class Timestamp:
 
         :returns: Time of the Timestamp.
         """
-        time = datetime.fromtimestamp(self.timestamp_data[4])
+        time = datetime.fromtimestamp(self.get_epoch())
         return time.strftime("%H:%M:%S.%f")[:-3]
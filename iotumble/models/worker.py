@@ -0,0 +1,102 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the Worker class, containing the functionality to run the requests of a
+Session on a background thread, so the programs Tk main loop never waits on AWS.
+"""
+from concurrent.futures import Future
+from queue import Queue
+from threading import Thread
+from typing import Callable
+
+
+class Worker(Thread):
+    """
+    This class represents a background worker, implementing Thread. It contains a constructor, the
+    methods to submit, cancel, and poll requests, the thread run method, and the methods to check
+    its pending requests.
+
+    Requests are run one at a time (as boto3 resources are not thread-safe), and each is named, so
+    submitting a request cancels any pending request of the same name. The outcome of a request is
+    only passed to its callback by poll(), which is called from the Tk main loop (with after()),
+    so callbacks can safely update the views. A cancelled request that is already running is left
+    to finish, but its outcome is discarded.
+    """
+
+    def __init__(self):
+        """This constructor instantiates a Worker object."""
+        super().__init__(name="worker", daemon=True)
+        self.requests = Queue()
+        self.tasks = {}
+
+    def submit(self, name: str, callback: Callable, request: Callable, *args):
+        """
+        This method submits a request to the Worker, cancelling any pending request of its name.
+
+        :param name: Name of the request.
+        :param callback: Method that is passed the outcome of the request (False if it raised).
+        :param request: Method of the request.
+        :param args: Arguments of the request.
+        """
+        self.cancel(name)
+        future = Future()
+        self.tasks[name] = (future, callback)
+        self.requests.put((future, request, args))
+
+    def cancel(self, name: str = None):
+        """
+        This method cancels a pending request, or every pending request if no name is passed.
+
+        :param name: Name of the request (None for every request).
+        """
+        names = list(self.tasks) if name is None else [name]
+        for task_name in names:
+            task = self.tasks.pop(task_name, None)
+            if task is not None:
+                task[0].cancel()
+
+    def poll(self):
+        """
+        This method passes the outcome of each finished request to its callback, on the calling
+        thread.
+        """
+        for name, (future, callback) in list(self.tasks.items()):
+            if not future.done() or self.tasks.get(name, (None,))[0] is not future:
+                continue
+            del self.tasks[name]
+            try:
+                outcome = future.result()
+            except Exception:  # pylint: disable=broad-except
+                outcome = False
+            callback(outcome)
+
+    def run(self):
+        """This method runs each submitted request that has not been cancelled, in turn."""
+        while True:
+            future, request, args = self.requests.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(request(*args))
+            except Exception as error:  # pylint: disable=broad-except
+                future.set_exception(error)
+
+    def is_busy(self) -> bool:
+        """
+        This method checks if the Worker has any pending requests.
+
+        :returns: Boolean outcome on if any requests are pending.
+        """
+        return bool(self.tasks)
+
+    def is_pending(self, name: str) -> bool:
+        """
+        This method checks if a request of a passed name is pending.
+
+        :param name: Name of the request.
+        :returns: Boolean outcome on if the request is pending.
+        """
+        return name in self.tasks
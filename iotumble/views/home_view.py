@@ -5,7 +5,9 @@
 
 """This module contains the HomeView class, to represent a home view of the program."""
 import tkinter as tk
+from time import localtime, strftime
 from tkinter import ttk
+from typing import List
 
 from PIL import Image, ImageTk
 
@@ -28,6 +30,10 @@ class HomeView(AbstractView, tk.Tk):
         self.icon = tk.Toplevel()
         self.header_logo = ImageTk.PhotoImage(Image.open("logo.png"))
         self.incidents_tree_view = ttk.Treeview()
+        self.incidents_title_label = None
+        self.incidents_scrollbar = None
+        self.session_frame = None
+        self.incidents_loaded = False
         self.inputs = {"access": tk.StringVar(), "secret": tk.StringVar(), "region": tk.StringVar()}
 
     def load_root(self):
@@ -148,15 +154,15 @@ class HomeView(AbstractView, tk.Tk):
         """
         incidents_frame = tk.Frame(self.frame, background=self.secondary_bg)
         incidents_frame.pack(expand=True, fill="both", side="left")
-        incidents_title_label = ttk.Label(incidents_frame, style="tertiary.TLabel",
-                                          text="Incidents")
-        incidents_title_label.pack(fill="both")
+        self.incidents_title_label = ttk.Label(incidents_frame, style="tertiary.TLabel",
+                                               text="Incidents")
+        self.incidents_title_label.pack(fill="both")
         self.incidents_tree_view = ttk.Treeview(incidents_frame, show="tree", selectmode="browse")
         self.incidents_tree_view.pack(expand=True, fill="both", side="left")
-        incidents_scrollbar = ttk.Scrollbar(incidents_frame, orient="vertical",
-                                            command=self.incidents_tree_view.yview)
-        incidents_scrollbar.pack(fill="both", side="right")
-        self.incidents_tree_view.configure(yscrollcommand=incidents_scrollbar.set)
+        self.incidents_scrollbar = ttk.Scrollbar(incidents_frame, orient="vertical",
+                                                 command=self.incidents_tree_view.yview)
+        self.incidents_scrollbar.pack(fill="both", side="right")
+        self.incidents_tree_view.configure(yscrollcommand=self.scroll_tree_view)
         self.incidents_tree_view.tag_configure("highlight", background=self.highlight_bg,
                                                foreground=self.primary_fg)
         self.incidents_tree_view.tag_configure("0", background=self.secondary_bg)
@@ -172,6 +178,7 @@ class HomeView(AbstractView, tk.Tk):
         """
         session_frame = tk.Frame(self.frame, background=self.secondary_bg)
         session_frame.pack(expand=True, fill="both", side="top", ipadx=47)
+        self.session_frame = session_frame
         session_title_label = ttk.Label(session_frame, style="tertiary.TLabel", text="Session")
         session_title_label.pack(fill="both")
         session_access_label = ttk.Label(session_frame, style="secondary.TLabel",
@@ -196,7 +203,7 @@ class HomeView(AbstractView, tk.Tk):
                                                        "us-west-1", "us-west-2"])
         session_region_combobox.pack()
         session_connect_button = ttk.Button(session_frame, takefocus=False, text="Connect",
-                                            command=lambda: self.connect(session_frame))
+                                            command=self.connect)
         session_connect_button.pack(expand=True, fill="both", side="left", padx=(0, 5),
                                     pady=(46, 0), ipady=30)
         session_quit_button = ttk.Button(session_frame, takefocus=False, text="Quit",
@@ -228,29 +235,58 @@ class HomeView(AbstractView, tk.Tk):
         message_button.pack(expand=True, fill="both")
         self.set_geometry(message, 300, 300)
 
-    def connect(self, session_frame: tk.Frame):
+    def connect(self):
         """
-        This method passes the session inputs to connect() from HomeController, and if it returns
-        True, it covers the session section with a disconnect button.
+        This method passes the session inputs to connect() from HomeController. The session
+        section is covered once the connection has been checked, with show_connected().
+        """
+        self.controller.connect(self.inputs["access"].get(), self.inputs["secret"].get(),
+                                self.inputs["region"].get())
+
+    def show_connected(self):
+        """
+        This method covers the session section with a disconnect button, and a button to export
+        every incident with export_incidents() from HomeController.
+        """
+        disconnect_button = ttk.Button(self.session_frame, takefocus=False, text="Disconnect",
+                                       command=lambda: self.disconnect([disconnect_button,
+                                                                        export_button]))
+        disconnect_button.place(height=375, width=293, y=22)
+        export_button = ttk.Button(self.session_frame, takefocus=False, text="Export All",
+                                   command=self.controller.export_incidents)
+        export_button.place(height=80, width=293, y=402)
+
+    def show_loading(self, loading: bool):
+        """
+        This method shows (or hides) that requests are loading, in the title of the incidents
+        section and with a busy cursor.
 
-        :param session_frame: Frame of the session section.
+        :param loading: Boolean on if requests are loading.
         """
-        if self.controller.connect(self.inputs["access"].get(), self.inputs["secret"].get(),
-                                   self.inputs["region"].get()):
-            disconnect_button = ttk.Button(session_frame, takefocus=False, text="Disconnect",
-                                           command=lambda: self.disconnect(disconnect_button))
-            disconnect_button.place(height=460, width=293, y=22)
+        self.incidents_title_label.configure(text="Loading..." if loading else "Incidents")
+        self.configure(cursor="watch" if loading else "")
 
-    def disconnect(self, disconnect_button: ttk.Button):
+    def show_export_progress(self, incidents: int, rows: int):
+        """
+        This method shows the progress of an export in the title of the incidents section.
+
+        :param incidents: Amount of incidents exported so far.
+        :param rows: Amount of timestamps exported so far.
+        """
+        self.incidents_title_label.configure(text=f"Exporting... {incidents} incidents "
+                                                  f"({rows} timestamps)")
+
+    def disconnect(self, session_buttons: List[ttk.Button]):
         """
         This method calls disconnect() from HomeController, clears the incidents treeview, and
-        destroys the disconnect button.
+        destroys the buttons covering the session section.
 
-        :param disconnect_button: Disconnect button to be destroyed.
+        :param session_buttons: List of the buttons to be destroyed.
         """
         self.controller.disconnect()
         self.clear_tree_view()
-        disconnect_button.destroy()
+        for session_button in session_buttons:
+            session_button.destroy()
 
     def fill_inputs(self, access_key_id: str, secret_access_key: str, region_name: str):
         """
@@ -264,15 +300,58 @@ class HomeView(AbstractView, tk.Tk):
         self.inputs["secret"].set(secret_access_key)
         self.inputs["region"].set(region_name)
 
-    def fill_incidents(self, incident_count: int):
+    def fill_incidents(self, incidents: List[dict]):
+        """
+        This method adds an item to the end of the incidents treeview for each incident of a page,
+        using its incident ID as the item ID. An empty page marks every incident as loaded.
+
+        :param incidents: List of incident metadata dictionaries (newest first).
+        """
+        if not incidents:
+            self.incidents_loaded = True
+        count = len(self.incidents_tree_view.get_children())
+        for i, incident in enumerate(incidents, count + 1):
+            self.incidents_tree_view.insert("", "end", iid=incident["incident_id"],
+                                            tags=str(i % 2), text=self.format_incident(incident))
+
+    @staticmethod
+    def format_incident(incident: dict) -> str:
         """
-        This method fills the incidents treeview with a certain amount of items.
+        This method formats the text of an incidents treeview item from the metadata of an
+        incident (its local time, device, and peak SVM, or its incident ID if it has no metadata),
+        and its impact duration and stillness, if its summary statistics are known.
 
-        :param incident_count: Count of incident items.
+        :param incident: Dictionary of incident metadata.
+        :returns: Text of the treeview item.
         """
-        for i in range(incident_count):
-            i += 1
-            self.incidents_tree_view.insert("", 0, tags=str(i % 2), text="Incident " + str(i))
+        summary = incident.get("summary")
+        peak = summary["peak_svm"] if summary else incident["peak"]
+        if incident["time"] is None:
+            text = "Incident " + incident["incident_id"]
+        else:
+            text = strftime("%Y-%m-%d %H:%M:%S", localtime(incident["time"]))
+            text += "  " + incident["device"]
+        details = [] if peak is None else [f"SVM {peak:.1f}"]
+        if summary:
+            details.append(f"impact {summary['impact_duration']:.2f} s")
+            if summary["stillness"] is not None:
+                details.append(f"still {summary['stillness']:.0%}")
+        if details:
+            text += f"  ({', '.join(details)})"
+        return text
+
+    def scroll_tree_view(self, first: str, last: str):
+        """
+        This method moves the incidents scrollbar as the incidents treeview is scrolled. Once the
+        end of the treeview is nearly visible, it calls load_incidents() from HomeController to
+        request the next page of incidents, until every incident has been loaded.
+
+        :param first: Fraction of the treeview above the visible rows.
+        :param last: Fraction of the treeview up to the end of the visible rows.
+        """
+        self.incidents_scrollbar.set(first, last)
+        if not self.incidents_loaded and float(last) > 0.9:
+            self.controller.load_incidents()
 
     def highlight_tree_view(self, highlighted: bool, event):
         """
@@ -288,19 +367,36 @@ class HomeView(AbstractView, tk.Tk):
 
     def clear_tree_view(self):
         """This method clears all items from the incidents treeview."""
-        for item in self.incidents_tree_view.get_children():
-            self.incidents_tree_view.delete(item)
+        items = self.incidents_tree_view.get_children()
+        if items:
+            self.incidents_tree_view.delete(*items)
+        self.incidents_loaded = False
+
+    def get_neighbours(self, incident_id: str, count: int) -> List[str]:
+        """
+        This method gets the incident IDs of the items next to an item of the incidents treeview
+        (nearest first, alternating between the items after and before it).
+
+        :param incident_id: Incident ID of the item.
+        :param count: Amount of items on each side.
+        :returns: List of neighbouring incident IDs.
+        """
+        neighbours = []
+        following = preceding = incident_id
+        for _ in range(count):
+            following = self.incidents_tree_view.next(following) if following else ""
+            preceding = self.incidents_tree_view.prev(preceding) if preceding else ""
+            neighbours.extend(item for item in (following, preceding) if item)
+        return neighbours
 
     def switch(self):
         """
-        This method gets the selected item and its incident ID from the incidents treeview, and
-        passes it to switch() in HomeController.
+        This method gets the selected item from the incidents treeview, and passes its item ID
+        (the incident ID) to switch() in HomeController.
         """
         selected = self.incidents_tree_view.selection()[0]
         if selected != "":
-            selected_text = self.incidents_tree_view.item(selected, "text")
-            incident_id = int(selected_text.replace("Incident ", ""))
-            self.controller.switch(incident_id)
+            self.controller.switch(selected)
 
     def hide(self):
         """This method hides the view and unbinds its icon."""
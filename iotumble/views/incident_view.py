@@ -6,8 +6,9 @@
 """This module contains the IncidentView class, to represent an incident view of the program."""
 import tkinter as tk
 from tkinter import ttk
-from typing import List, Tuple
+from typing import Dict, Tuple
 
+import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
@@ -20,6 +21,7 @@ class IncidentView(AbstractView, tk.Toplevel):
     tk.Toplevel. It contains a constructor, the methods for loading its icon and widgets, the
     methods for interacting with its widgets and controller, and the implemented abstract methods.
     """
+    details_overscan = 20
 
     def __init__(self, controller):
         """This constructor instantiates an IncidentView object."""
@@ -28,8 +30,16 @@ class IncidentView(AbstractView, tk.Toplevel):
         self.controller = controller
         self.icon = controller.home_view.icon
         self.details_widgets = [ttk.Label(), ttk.Label(), ttk.Label(), ttk.Label(),
-                                ttk.Label(), ttk.Label(), ttk.Treeview()]
+                                ttk.Label(), ttk.Label(), ttk.Treeview(), ttk.Label()]
         self.graph_widgets = [plt.figure(), plt.axes()]
+        self.details_scrollbar = ttk.Scrollbar()
+        self.details_rows = []
+        self.details_offset = 0
+        self.graph_lines = {}
+        self.graph_backgrounds = {}
+        self.graph_range = (0.0, 0.0)
+        self.graph_pan = None
+        self.selected_graph = ""
         self.texts = ["All Acceleration", "Signal Vector Magnitude"]
         self.columns = ["Timestamp", "X-Acceleration", "Y-Acceleration", "Z-Acceleration", "SVM"]
 
@@ -84,17 +94,22 @@ class IncidentView(AbstractView, tk.Toplevel):
         self.details_widgets[5] = ttk.Label(details_frame, style="secondary.TLabel",
                                             text=self.texts[1])
         self.details_widgets[5].pack(expand=True, fill="both")
+        self.details_widgets[7] = ttk.Label(details_frame, style="secondary.TLabel",
+                                            text="Summary")
+        self.details_widgets[7].pack(expand=True, fill="both")
         self.details_widgets[6] = ttk.Treeview(details_frame, columns=self.columns,
                                                show="headings", selectmode="none",
                                                style="details.Treeview")
         self.details_widgets[6].pack(expand=True, fill="both", side="left")
-        details_scrollbar = ttk.Scrollbar(details_border_frame, orient="vertical",
-                                          command=self.details_widgets[6].yview)
-        details_scrollbar.place(height=280, width=15, y=420)
-        self.details_widgets[6].configure(yscrollcommand=details_scrollbar.set)
+        self.details_scrollbar = ttk.Scrollbar(details_border_frame, orient="vertical",
+                                               command=self.scroll_details_tree_view)
+        self.details_scrollbar.place(height=280, width=15, y=420)
         self.details_widgets[6].tag_configure("0", background=self.secondary_bg)
         self.details_widgets[6].tag_configure("1", background=self.primary_bg)
         self.details_widgets[6].bind("<Button-1>", self.stop_tree_view_resize)
+        self.details_widgets[6].bind("<Configure>", lambda e: self.show_details_rows())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.details_widgets[6].bind(sequence, self.wheel_details_tree_view)
         for column in self.columns:
             self.details_widgets[6].column(column, anchor="center", width=1)
             self.details_widgets[6].heading(column, text=column)
@@ -103,7 +118,8 @@ class IncidentView(AbstractView, tk.Toplevel):
     def load_graph(self):
         """
         This method loads the graph section and its widgets, such as its label, graph figure,
-        and graph canvas.
+        and graph canvas, and binds its zoom (scrolling) and pan (dragging) events. It then calls
+        fill_graph_lines() from IncidentController.
         """
         graph_title_label = ttk.Label(self.frame, style="tertiary.TLabel", text="Incident Graph")
         graph_title_label.pack(fill="both", side="top")
@@ -112,6 +128,14 @@ class IncidentView(AbstractView, tk.Toplevel):
         graph_canvas = FigureCanvasTkAgg(self.graph_widgets[0], master=self.frame).get_tk_widget()
         graph_canvas.configure(background=self.secondary_bg)
         graph_canvas.pack()
+        self.graph_widgets[0].canvas.mpl_connect("draw_event", self.draw_graph_lines)
+        self.graph_widgets[0].canvas.mpl_connect("resize_event",
+                                                 lambda e: self.graph_backgrounds.clear())
+        self.graph_widgets[0].canvas.mpl_connect("scroll_event", self.zoom_graph)
+        self.graph_widgets[0].canvas.mpl_connect("button_press_event", self.press_graph)
+        self.graph_widgets[0].canvas.mpl_connect("motion_notify_event", self.pan_graph)
+        self.graph_widgets[0].canvas.mpl_connect("button_release_event", self.pan_graph)
+        self.controller.fill_graph_lines()
 
     def load_actions(self):
         """
@@ -156,74 +180,283 @@ class IncidentView(AbstractView, tk.Toplevel):
         self.graph_widgets[1].spines["right"].set_color(self.primary_fg)
         self.graph_widgets[1].tick_params(color=self.primary_fg, labelcolor=self.primary_fg)
 
-    def fill_details_labels(self, max_timestamp):
+    def fill_details_labels(self, max_timestamp, summary: dict):
         """
-        This method fills the details labels with the data of the maximum SVM timestamp.
+        This method fills the details labels with the data of the maximum SVM timestamp, the
+        minimum, maximum, mean, and standard deviation of each axis, and the impact duration,
+        free-fall duration, and stillness of the incidents summary statistics.
 
         :param max_timestamp: Timestamp object with the maximum SVM value.
+        :param summary: Dictionary of the incidents summary statistics.
         """
         timestamp_data = [max_timestamp.get_date(), max_timestamp.get_time(),
                           round(max_timestamp.get_x_acc(), 8), round(max_timestamp.get_y_acc(), 8),
                           round(max_timestamp.get_z_acc(), 8), round(max_timestamp.get_svm(), 10)]
-        for i, label in enumerate(self.details_widgets):
-            if isinstance(label, ttk.Label):
-                label_text = label.cget("text")
-                self.details_widgets[i].configure(text=f"{label_text}  =  {str(timestamp_data[i])}")
+        for i, axis in enumerate(("x", "y", "z", "svm"), 2):
+            timestamp_data[i] = (f"{timestamp_data[i]}  (min {summary['min'][axis]:.2f}, max "
+                                 f"{summary['max'][axis]:.2f}, mean {summary['mean'][axis]:.2f}, "
+                                 f"std {summary['std'][axis]:.2f})")
+        for i, label in enumerate(self.details_widgets[:6]):
+            label_text = label.cget("text")
+            self.details_widgets[i].configure(text=f"{label_text}  =  {str(timestamp_data[i])}")
+        stillness = "-" if summary["stillness"] is None else f"{summary['stillness']:.0%}"
+        self.details_widgets[7].configure(text=f"Impact  =  {summary['impact_duration']:.2f} s,  "
+                                               f"Free-Fall  =  {summary['free_fall_duration']:.2f} "
+                                               f"s,  Stillness  =  {stillness}")
 
-    def fill_details_tree_view(self, timestamps: List):
+    def fill_details_tree_view(self, row_count: int):
         """
-        This method fills the details treeview with the data of the incidents timestamps.
+        This method fills the details treeview with the amount of rows of the incidents timestamps
+        (newest first). The treeview is virtual: it only holds the rows that fit in it, which are
+        refilled as it is scrolled, so only the visible rows are formatted.
 
-        :param timestamps: List of Timestamp objects.
+        :param row_count: Amount of rows (timestamps).
         """
-        for timestamp in timestamps:
-            self.details_widgets[6].insert("", 0, tags=str(timestamp.get_timestamp_id() % 2),
-                                           values=(timestamp.get_time(),
-                                                   round(timestamp.get_x_acc(), 8),
-                                                   round(timestamp.get_y_acc(), 8),
-                                                   round(timestamp.get_z_acc(), 8),
-                                                   round(timestamp.get_svm(), 10)))
+        self.details_rows = [None] * row_count
+        self.details_offset = 0
+        self.show_details_rows()
+
+    def scroll_details_tree_view(self, action: str, amount: str, units: str = ""):
+        """
+        This method scrolls the rows of the details treeview, from its scrollbar or the mouse
+        wheel.
+
+        :param action: Scrollbar action ("moveto" or "scroll").
+        :param amount: Fraction of the rows to move to, or amount of units to scroll by.
+        :param units: Units to scroll by ("units" or "pages").
+        """
+        visible = len(self.details_widgets[6].get_children())
+        if action == "moveto":
+            offset = round(float(amount) * len(self.details_rows))
+        else:
+            offset = self.details_offset + int(amount) * (visible if units == "pages" else 1)
+        self.details_offset = max(min(offset, len(self.details_rows) - visible), 0)
+        self.show_details_rows()
+        return "break"
+
+    def wheel_details_tree_view(self, event):
+        """
+        This method scrolls the rows of the details treeview by three rows per step of the mouse
+        wheel.
+
+        :param event: Mouse wheel event of the details treeview.
+        """
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        return self.scroll_details_tree_view("scroll", -3 if up else 3, "units")
+
+    def show_details_rows(self):
+        """
+        This method fills the details treeview with the rows from its scrolled offset, adding or
+        removing items so it holds as many rows as fit in it, and sets its scrollbar. The values of
+        each row are cached, and a few rows either side are formatted in advance (the overscan), so
+        scrolling by a few rows formats none.
+        """
+        tree_view = self.details_widgets[6]
+        row_height = int(ttk.Style().lookup("details.Treeview", "rowheight") or 26)
+        visible = max(tree_view.winfo_height() // row_height - 1, 1)
+        visible = min(visible, len(self.details_rows))
+        self.details_offset = max(min(self.details_offset, len(self.details_rows) - visible), 0)
+        items = tree_view.get_children()
+        if len(items) > visible:
+            tree_view.delete(*items[visible:])
+        for _ in range(len(items), visible):
+            tree_view.insert("", "end")
+        for item, row in zip(tree_view.get_children(), range(self.details_offset,
+                                                             self.details_offset + visible)):
+            tag, values = self.get_details_row(row)
+            tree_view.item(item, tags=tag, values=values)
+        for row in range(max(self.details_offset - self.details_overscan, 0),
+                         min(self.details_offset + visible + self.details_overscan,
+                             len(self.details_rows))):
+            self.get_details_row(row)
+        if self.details_rows:
+            self.details_scrollbar.set(self.details_offset / len(self.details_rows),
+                                       (self.details_offset + visible) / len(self.details_rows))
+
+    def get_details_row(self, row: int) -> Tuple[str, tuple]:
+        """
+        This method gets the tag and values of a row of the details treeview, formatting them with
+        format_details_row() from IncidentController the first time the row is needed.
+
+        :param row: Index of the row.
+        :returns: Tuple of the rows tag and values.
+        """
+        if self.details_rows[row] is None:
+            self.details_rows[row] = self.controller.format_details_row(row)
+        return self.details_rows[row]
 
     def select_graph(self, selected_graph: str):
         """
-        This method clears the graph figure and passes the selected graph to fill_graph() of
-        IncidentController.
+        This method passes the selected graph to fill_graph() of IncidentController.
 
         :param selected_graph: Name of selected graph.
         """
-        self.graph_widgets[1].clear()
         self.controller.fill_graph(selected_graph)
 
-    def plot_graph(self, time_data: List[float], acc_data: List[float], color: str):
+    def plot_graph(self, time_range: Tuple[float, float],
+                   lines: Dict[str, Tuple[np.ndarray, np.ndarray]]):
         """
-        This method plots a colored graph using the timestamps time-data and acceleration-data.
+        This method plots a hidden line for each series of acceleration-data once, with its
+        timestamps time-data, and sets the X-axis limit, label, and grid. The lines are animated,
+        so they are only drawn by draw_graph_lines(), over the cached background of the selected
+        graph.
 
-        :param time_data: Timestamps time-data for X-axis.
-        :param acc_data: Timestamps acceleration-data for Y-axis.
-        :param color: Color of graph.
+        :param time_range: Tuple of the first and last timestamps time-data.
+        :param lines: Dictionary of the time-data and acceleration-data of each line by graph name.
         """
-        self.graph_widgets[1].plot(time_data, acc_data, color=color, marker=".")
+        for name, (time_data, acc_data) in lines.items():
+            self.graph_lines[name], = self.graph_widgets[1].plot(time_data, acc_data,
+                                                                 marker=self.get_marker(time_data),
+                                                                 label=name, animated=True,
+                                                                 visible=False)
+        self.graph_range = time_range
+        self.graph_widgets[1].set(xlabel="Time (s)", xlim=time_range)
+        self.graph_widgets[1].grid(color=self.primary_bg)
 
-    def set_graph(self, time_data: List[float], selected_graph: str):
+    def update_graph(self, lines: Dict[str, Tuple[np.ndarray, np.ndarray]]):
         """
-        This method sets the title, labels, and legend of the graph depending on the name of the
-        selected graph. It also sets the X-axis limit using the timestamps time-data.
+        This method replaces the data of each line, and redraws the graph figure (as its X-axis
+        has changed, the cached backgrounds are cleared).
+
+        :param lines: Dictionary of the time-data and acceleration-data of each line by graph name.
+        """
+        for name, (time_data, acc_data) in lines.items():
+            self.graph_lines[name].set_data(time_data, acc_data)
+            self.graph_lines[name].set_marker(self.get_marker(time_data))
+        self.graph_backgrounds.clear()
+        self.graph_widgets[0].canvas.draw_idle()
+
+    def zoom_graph(self, event):
+        """
+        This method zooms the X-axis of the graph in or out around the mouse as it is scrolled.
+
+        :param event: Scroll event of the graph canvas.
+        """
+        if event.inaxes is not self.graph_widgets[1] or not self.graph_lines:
+            return
+        scale = 0.8 if event.button == "up" else 1.25
+        start, end = self.graph_widgets[1].get_xlim()
+        self.set_graph_range(event.xdata - (event.xdata - start) * scale,
+                             event.xdata + (end - event.xdata) * scale)
+
+    def press_graph(self, event):
+        """
+        This method starts panning the graph as it is pressed, or resets its X-axis to the whole
+        incident if it is double-clicked.
+
+        :param event: Button press event of the graph canvas.
+        """
+        if event.inaxes is not self.graph_widgets[1] or not self.graph_lines:
+            return
+        if event.dblclick:
+            self.graph_pan = None
+            self.set_graph_range(*self.graph_range)
+        else:
+            self.graph_pan = (event.x, self.graph_widgets[1].get_xlim())
+
+    def pan_graph(self, event):
+        """
+        This method pans the X-axis of the graph as the mouse is dragged, until it is released.
+
+        :param event: Motion or button release event of the graph canvas.
+        """
+        if self.graph_pan is None:
+            return
+        (pressed_x, (start, end)) = self.graph_pan
+        if event.name == "button_release_event":
+            self.graph_pan = None
+        shift = (pressed_x - event.x) * (end - start) / self.get_graph_width()
+        self.set_graph_range(start + shift, end + shift)
+
+    def set_graph_range(self, start: float, end: float):
+        """
+        This method sets the X-axis limit of the graph (kept within the incident), and passes it
+        to fill_graph_range() of IncidentController, to decimate its lines for the new range.
+
+        :param start: Seconds since the first timestamp the graph starts at.
+        :param end: Seconds since the first timestamp the graph ends at.
+        """
+        first, last = self.graph_range
+        length = min(end - start, last - first)
+        start = min(max(start, first), last - length)
+        self.graph_widgets[1].set_xlim(start, start + length)
+        self.controller.fill_graph_range(start, start + length)
+
+    def get_graph_width(self) -> int:
+        """
+        This method gets the width of the graph axes.
+
+        :returns: Width of the graph axes (in pixels).
+        """
+        return max(int(self.graph_widgets[1].bbox.width), 1)
+
+    def get_marker(self, time_data: np.ndarray) -> str:
+        """
+        This method gets the marker of a line, as a point for each timestamp if they are far
+        enough apart to be seen, or none.
+
+        :param time_data: Timestamps time-data of the line.
+        :returns: Marker of the line.
+        """
+        return "." if len(time_data) <= self.get_graph_width() // 4 else ""
+
+    def set_graph(self, selected_graph: str, colors: Dict[str, str]):
+        """
+        This method shows the lines of the selected graph in their colors (hiding the others), and
+        sets the title, Y-axis label and limit, and legend of the graph depending on its name. The
+        first time a graph is selected, the figure is drawn, and draw_graph_lines() caches its
+        background. Afterwards, its cached background is restored and only its lines are drawn
+        (blitted), so the figure is not laid out again.
 
-        :param time_data: Timestamps time-data for X-axis.
         :param selected_graph: Name of selected graph.
+        :param colors: Dictionary of the colors of the lines of the graph by graph name.
         """
-        self.graph_widgets[1].set(title=selected_graph, xlabel="Time (s)",
-                                  xlim=(time_data[0], time_data[-1]))
-        self.graph_widgets[1].title.set_color(self.primary_fg)
-        self.graph_widgets[1].grid(color=self.primary_bg)
+        axes = self.graph_widgets[1]
+        for name, line in self.graph_lines.items():
+            line.set_visible(name in colors)
+            if name in colors:
+                line.set_color(colors[name])
+        self.selected_graph = selected_graph
+        axes.set_title(selected_graph, color=self.primary_fg)
+        axes.set(ylabel=self.columns[4] if selected_graph == self.texts[1]
+                 else "Acceleration (m/s$^2$)")
+        if axes.get_legend() is not None:
+            axes.get_legend().remove()
         if selected_graph == self.texts[0]:
-            self.graph_widgets[1].legend(labels=[self.columns[1], self.columns[2], self.columns[3]],
-                                         labelcolor=self.primary_fg, frameon=False)
-        if selected_graph == self.texts[1]:
-            self.graph_widgets[1].set(ylabel=self.columns[4])
+            axes.legend(handles=[self.graph_lines[name] for name in self.columns[1:4]],
+                        labelcolor=self.primary_fg, frameon=False)
+        if selected_graph in self.graph_backgrounds:
+            background, y_limit = self.graph_backgrounds[selected_graph]
+            axes.set_ylim(y_limit)
+            self.graph_widgets[0].canvas.restore_region(background)
+            self.draw_graph_lines()
         else:
-            self.graph_widgets[1].set(ylabel="Acceleration (m/s$^2$)")
-        self.graph_widgets[0].canvas.draw()
+            axes.relim(visible_only=True)
+            axes.autoscale_view(scalex=False)
+            self.graph_widgets[0].canvas.draw()
+
+    def draw_graph_lines(self, event=None):
+        """
+        This method draws the visible lines over the graph figure, and blits them to the graph
+        canvas. Once the whole figure has been drawn (passing its draw event), it first caches the
+        figure as the background of the selected graph, as the animated lines are not drawn with
+        it, and does not blit (as the drawn figure is shown afterwards). Exported figures are
+        ignored, as they draw the lines themselves.
+
+        :param event: Draw event of the graph figure (None if the figure was not drawn).
+        """
+        canvas = self.graph_widgets[0].canvas
+        if canvas.is_saving():
+            return
+        if event is not None:
+            self.graph_backgrounds[self.selected_graph] = (
+                canvas.copy_from_bbox(self.graph_widgets[0].bbox),
+                self.graph_widgets[1].get_ylim())
+        for line in self.graph_lines.values():
+            if line.get_visible():
+                self.graph_widgets[1].draw_artist(line)
+        if event is None:
+            canvas.blit(self.graph_widgets[0].bbox)
 
     def export_graph(self, graph_path: str):
         """
@@ -0,0 +1,172 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the Benchmark class, containing the functionality to replay a recorded or
+synthetic accelerometer trace through the devices detection pipeline offline, as fast as possible,
+and report its throughput, detection latency, and per-sample CPU time.
+"""
+from argparse import ArgumentParser
+from collections import deque
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter, thread_time_ns
+
+from raspberrypi.device import Device
+from raspberrypi.sensors.replay_sensor import ReplaySensor
+from raspberrypi.sensors.simulated_sensor import SimulatedSensor
+from raspberrypi.sinks.memory_sink import MemorySink
+from raspberrypi.spool import Spool
+
+
+class Benchmark:
+    """
+    This class represents a benchmark of the device. It contains a constructor, the method to time
+    the devices methods, and the methods to run the benchmark and print its report. The device is
+    run with a ReplaySensor, a MemorySink, a Scheduler that never sleeps, and a Spool and
+    incident ID state in a temporary directory.
+
+    As the trace is replayed faster than its sample rate, the detection delay of each incident is
+    measured in two parts: the trace time from its impact sample to the sample its verdict was
+    made on, and the time from its submission to the sink receiving it.
+    """
+    timed_methods = ("read_accelerometer", "process_samples", "check_thresholds",
+                     "check_inactivity")
+
+    def __init__(self, sensor: ReplaySensor, payload_format: str = "json"):
+        """
+        This constructor instantiates a Benchmark object, creating the temporary directory and
+        the benchmarked device, and wrapping its timed methods.
+
+        :param sensor: Instance of a ReplaySensor object.
+        :param payload_format: Payload format of the device ("json" or "compact").
+        """
+        self.state_dir = TemporaryDirectory()
+        self.device = Device(sensor, MemorySink(), False,
+                             Spool(path.join(self.state_dir.name, "incident_spool.bin")))
+        self.device.incident_counter.state_path = path.join(self.state_dir.name,
+                                                            "incident_ids.ini")
+        self.device.payload_format = payload_format
+        self.timings = {name: [0, 0] for name in self.timed_methods}
+        self.impacts = deque()
+        self.verdict_impact = None
+        self.published_impacts = []
+        for name in self.timed_methods:
+            self.time_method(name)
+        threshold_reached = self.device.threshold_reached
+        submit = self.device.publisher.submit
+
+        def record_impact():
+            self.impacts.append((perf_counter(), self.get_trace_time()))
+            threshold_reached()
+
+        def record_submit(incident):
+            self.published_impacts.append((self.verdict_impact, self.get_trace_time(),
+                                           perf_counter()))
+            submit(incident)
+
+        self.device.threshold_reached = record_impact
+        self.device.publisher.submit = record_submit
+
+    def time_method(self, name: str):
+        """
+        This method wraps a method of the device, so the amount of its calls and the CPU time of
+        the sampling thread spent within them are recorded. Verdicts also take the times of their
+        capture's impact, so published incidents can be matched to it.
+
+        :param name: Name of the device method.
+        """
+        method = getattr(self.device, name)
+        timing = self.timings[name]
+
+        def timed(*args):
+            if name == "check_inactivity":
+                self.verdict_impact = self.impacts.popleft()
+            start = thread_time_ns()
+            result = method(*args)
+            timing[1] += thread_time_ns() - start
+            timing[0] += 1
+            return result
+
+        setattr(self.device, name, timed)
+
+    def get_trace_time(self) -> float:
+        """
+        This method gets the trace time of the newest sample recorded by the device, from the
+        virtual clock of the sensor if it is batched, or otherwise from its position in the trace.
+
+        :returns: Time of the sample since the start of the trace (in seconds).
+        """
+        sensor = self.device.sensor
+        if sensor.batched:
+            return self.device.timestamps.last("ep", 1)[0] - sensor.epoch
+        return (sensor.position - 1) / sensor.get_data_rate()
+
+    def run(self) -> dict:
+        """
+        This method replays the whole trace through the device, waits for its Publisher to publish
+        every incident, removes the temporary directory, and creates a report of the benchmark.
+
+        :returns: Dictionary of the benchmark report.
+        """
+        sensor = self.device.sensor
+        self.device.connect()
+        start = perf_counter()
+        while not sensor.is_exhausted():
+            self.device.read_accelerometer()
+        elapsed = perf_counter() - start
+        self.device.disconnect()
+        self.state_dir.cleanup()
+        messages = [message for message in self.device.sink.get_messages()
+                    if message[1].startswith("iotumble/incident/")]
+        published = list(zip(messages, self.published_impacts))
+        latencies = sorted(message[0] - impact[0] for message, (impact, _, _) in published)
+        delays = sorted(verdict - impact[1] + message[0] - submitted
+                        for message, (impact, verdict, submitted) in published)
+        samples = len(sensor.trace)
+        report = {"samples": samples, "seconds": elapsed, "samples_per_second": samples / elapsed,
+                  "published": len(messages),
+                  "detection_delay_p50": delays[len(delays) // 2] if delays else None,
+                  "detection_delay_max": delays[-1] if delays else None,
+                  "publish_latency_p50": latencies[len(latencies) // 2] if latencies else None,
+                  "publish_latency_max": latencies[-1] if latencies else None}
+        for key, value in self.device.publisher.report().items():
+            report[f"publisher_{key}"] = value
+        for name, (calls, nanoseconds) in self.timings.items():
+            report[f"{name}_calls"] = calls
+            report[f"{name}_us_per_sample"] = nanoseconds / 1000 / samples
+        return report
+
+    @staticmethod
+    def print_report(report: dict):
+        """
+        This method prints a benchmark report, one statistic per line.
+
+        :param report: Dictionary of the benchmark report.
+        """
+        for key, value in report.items():
+            if isinstance(value, float):
+                value = f"{value:.6f}"
+            print(f"{key:<36}{value}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark the IoTumble device offline.")
+    parser.add_argument("trace", nargs="?", help="trace CSV (a synthetic trace if omitted)")
+    parser.add_argument("--rate", type=int, default=100, help="sample rate of the trace (Hz)")
+    parser.add_argument("--falls", type=int, default=20, help="falls in the synthetic trace")
+    parser.add_argument("--polled", action="store_true", help="replay one sample at a time")
+    parser.add_argument("--compact", action="store_true", help="publish compact payloads")
+    arguments = parser.parse_args()
+    if arguments.trace:
+        replay_sensor = ReplaySensor.from_csv(arguments.rate, arguments.trace,
+                                              not arguments.polled)
+    else:
+        replay_sensor = ReplaySensor(arguments.rate,
+                                     SimulatedSensor.create_fall_trace(arguments.rate,
+                                                                       arguments.falls),
+                                     not arguments.polled)
+    benchmark = Benchmark(replay_sensor, "compact" if arguments.compact else "json")
+    benchmark.print_report(benchmark.run())
@@ -7,133 +7,357 @@
 This module contains the Device class, containing the functionality to run the IoTumble
 device.
 """
+from base64 import b64encode
 from configparser import ConfigParser
+from importlib import import_module
+from json import dumps
 from math import sqrt
 from os import path
-from time import sleep, time
+from socket import gethostname
+from struct import pack
+from time import time
+from zlib import crc32
 
-from AWSIoTPythonSDK.MQTTLib import AWSIoTMQTTClient
-from adafruit_adxl34x import ADXL345
-from board import I2C
-from boto3 import client
-from botocore.exceptions import ClientError
+import numpy as np
+
+from raspberrypi.incident_counter import IncidentCounter
+from raspberrypi.publisher import Publisher
+from raspberrypi.ring_buffer import RingBuffer
+from raspberrypi.running_stats import RunningStats
+from raspberrypi.scheduler import Scheduler
+from raspberrypi.sensors.abstract_sensor import AbstractSensor
+from raspberrypi.sinks.abstract_sink import AbstractSink
+from raspberrypi.spool import Spool
+from raspberrypi.telemetry import Telemetry
 
 
 class Device:
     """
     This class represents the IoTumble device, containing a constructor, the methods that allow the
-    device to connect and publish messages to AWS, the methods to create and record timestamps, and
-    the methods to read and monitor the accelerometer for threshold limits and inactivity.
+    device to connect and publish messages to its sink, the methods to create and record
+    timestamps, and the methods to read and monitor the accelerometer for threshold limits and
+    inactivity.
+
+    Detection is a state machine that advances once per sample (idle, impact, post impact capture,
+    and inactivity verdict). Each impact starts its own capture, so overlapping events are all
+    checked, and inactive incidents are appended to a memory-mapped Spool (which also holds the
+    timestamp history) before being handed to a background Publisher, so they survive a crash.
+    Every sample is also aggregated into Telemetry intervals, published in batches by a second
+    Publisher.
     """
+    idle_state = "idle"
+    impact_state = "impact"
+    capture_state = "capture"
+    verdict_state = "verdict"
+    payload_version = 1
+
+    def __init__(self, sensor: AbstractSensor = None, sink: AbstractSink = None,
+                 realtime: bool = True, spool: Spool = None):
+        """
+        This constructor instantiates a Device object, using the sample rate, window seconds,
+        sensor, sink, spool, incident key, publish, and telemetry options of its read
+        credentials.ini to create its Scheduler, its sensor, sink, and Spool (unless they are
+        passed), its IncidentCounter, Publishers, and Telemetry, and its timestamp RingBuffer
+        (kept in the Spool, restoring the timestamps of the last window before a restart). The
+        sensor is then started. A passed sensor sets the sample rate.
 
-    def __init__(self):
-        """This constructor instantiates a Device object."""
-        self.accelerometer = ADXL345(I2C())
-        self.client = None
-        self.mqtt_client = None
+        :param sensor: Instance of a sensor object (loaded from credentials.ini if None).
+        :param sink: Instance of a sink object (loaded from credentials.ini if None).
+        :param realtime: Boolean on if the Scheduler sleeps until each deadline.
+        :param spool: Instance of a Spool object (created from credentials.ini if None).
+        """
+        credentials = self.read_credentials()
+        sample_rate = credentials.getint("device", "sample_rate", fallback=10)
+        window_seconds = credentials.getint("device", "window_seconds", fallback=5)
+        if sensor is None:
+            sensor = self.load_sensor(credentials.get("device", "sensor", fallback="adxl345"))(
+                sample_rate)
+        if sink is None:
+            sink = self.load_sink(credentials.get("device", "sink", fallback="aws"))()
+        if spool is None:
+            spool = Spool(credentials.get("device", "spool_path", fallback="incident_spool.bin"),
+                          credentials.getint("device", "spool_slots", fallback=32))
+        sample_rate = sensor.get_data_rate()
+        self.sensor = sensor
+        self.sink = sink
+        self.spool = spool
+        self.scheduler = Scheduler(sample_rate, realtime)
+        self.drain_periods = 1
+        if self.sensor.batched:
+            self.drain_periods = credentials.getint("device", "fifo_drain", fallback=16)
+        self.payload_format = credentials.get("device", "payload_format", fallback="json")
+        self.key_scheme = credentials.get("device", "key_scheme", fallback="lease")
+        self.device_id = (credentials.get("device", "device_id", fallback="")
+                          or credentials.get("mqtt", "iot_thing", fallback="") or gethostname())
+        self.shards = credentials.getint("device", "shards", fallback=16)
+        self.incident_counter = IncidentCounter(
+            credentials.get("device", "id_path", fallback="incident_ids.ini"),
+            credentials.getint("device", "id_lease", fallback=10), self.sink.request_incident_lease)
+        self.publisher = Publisher(self.create_message, self.mqtt_publish,
+                                   credentials.getint("device", "queue_size", fallback=16),
+                                   credentials.getint("device", "batch_size", fallback=8),
+                                   credentials.getint("device", "retries", fallback=3),
+                                   credentials.get("device", "spill_path", fallback=""),
+                                   self.spool.acknowledge, self.spool.get_pending)
+        self.telemetry = Telemetry(self.scheduler,
+                                   credentials.getint("device", "telemetry_interval", fallback=10),
+                                   credentials.getint("device", "telemetry_batch", fallback=6))
+        self.telemetry_publisher = Publisher(self.create_telemetry_message, self.mqtt_publish,
+                                             queue_size=4, retries=1)
+        self.state = self.idle_state
         self.threshold_flag = False
-        self.timestamps = []
+        self.captures = []
+        self.window_length = window_seconds * sample_rate + 1
+        self.post_threshold_length = int(self.window_length / 2)
+        self.inactivity_length = int(self.post_threshold_length / 2)
+        self.spool.open(self.window_length)
+        self.timestamps = RingBuffer(self.window_length, self.spool.get_history())
+        self.timestamps.restore(time() - window_seconds)
+        self.inactivity_stats = [RunningStats(self.inactivity_length) for _ in range(4)]
+        for stats, key in zip(self.inactivity_stats, RingBuffer.keys):
+            stats.extend(abs(data) for data in self.timestamps.last(key, self.inactivity_length))
+        self.sensor.start()
 
     def connect(self):
-        """This method connects the device to AWS and AWS IoT using its read credentials.ini."""
-        credentials = self.read_credentials()
-        self.client = client("dynamodb",
-                             aws_access_key_id=credentials.get("access", "access_key_id"),
-                             aws_secret_access_key=credentials.get("access", "secret_access_key"),
-                             region_name=credentials.get("access", "region_name"))
-        self.mqtt_configure(credentials)
-        self.mqtt_client.connect()
+        """
+        This method connects the devices sink (such as AWS and AWS IoT) using its read
+        credentials.ini, registers its amount of shards for the "sharded" key scheme (so the
+        program queries every shard), or loads its IncidentCounter for the "lease" key scheme
+        (leasing a range of incident IDs if it has none left), and starts its Publishers,
+        submitting the incidents its Spool still has pending.
+
+        :raises ValueError: If the sink has another amount of shards registered.
+        """
+        self.sink.connect(self.read_credentials())
+        if self.key_scheme == "sharded":
+            shards = self.sink.request_shards(self.shards)
+            if shards != self.shards:
+                self.sink.disconnect()
+                raise ValueError(f"The incidents are sharded over {shards} shards, not "
+                                 f"{self.shards}! Please set 'shards = {shards}' in "
+                                 f"credentials.ini.")
+        elif self.key_scheme == "lease":
+            self.incident_counter.load()
+            self.incident_counter.lease()
+        self.publisher.start()
+        self.telemetry_publisher.start()
+        for sequence in self.spool.get_pending():
+            self.publisher.submit(sequence)
+
+    def disconnect(self):
+        """
+        This method stops the devices Publishers once their submitted messages have been
+        published, disconnects the devices sink, and flushes its Spool to disk.
+        """
+        self.publisher.stop()
+        self.telemetry_publisher.stop()
+        self.sink.disconnect()
+        self.spool.flush()
+
+    def create_message(self, sequence: int) -> tuple:
+        """
+        This method creates the topic and JSON payload string of an incident of the devices Spool.
+        With the "sharded" key scheme, the topic holds the devices shard and the incident key from
+        create_incident_key(). With the "lease" key scheme, it holds an incident ID allocated from
+        its IncidentCounter and recorded to the Spool the first time. Either way, a re-sent
+        incident keeps its topic. The payload is compact if the devices payload format is
+        "compact". It is called by the devices Publisher, off the sampling loop.
+
+        :param sequence: Sequence number of the incident within the devices Spool.
+        :returns: Tuple of the topic and payload string.
+        """
+        incident_id, window = self.spool.read(sequence)
+        if self.key_scheme == "sharded":
+            topic = (f"iotumble/incident/{self.get_shard()}/"
+                     f"{self.create_incident_key(window, sequence)}")
+        else:
+            if not incident_id:
+                incident_id = self.incident_counter.allocate()
+                self.spool.set_incident_id(sequence, incident_id)
+            topic = f"iotumble/incident/{incident_id}"
+        if self.payload_format == "compact":
+            payload = self.create_compact_payload(window, self.scheduler.get_period())
+        else:
+            payload = self.create_payload(window)
+        return topic, payload
+
+    def create_incident_key(self, window: tuple, sequence: int) -> str:
+        """
+        This method creates the time-ordered key of an incident, from the epoch time (in
+        milliseconds) of its last timestamp, its Spool sequence number, and the device ID. Keys
+        sort by time, and no two devices (or incidents of a device) can create the same key, so no
+        shared counter is needed.
+
+        :param window: Timestamp window of the incident.
+        :param sequence: Sequence number of the incident within the devices Spool.
+        :returns: Key of the incident.
+        """
+        return f"{round(window[4][-1] * 1000):013d}-{sequence}-{self.device_id}"
+
+    def get_shard(self) -> int:
+        """
+        This method gets the shard of the device (from 1 to the amount of shards), the DynamoDB
+        partition its incidents and incident count are written to. It is a hash of the device ID,
+        so the writes of a fleet are spread across the shards.
+
+        :returns: Shard of the device.
+        """
+        return crc32(self.device_id.encode("utf-8")) % self.shards + 1
+
+    @staticmethod
+    def create_telemetry_message(batch: list) -> tuple:
+        """
+        This method creates the topic and JSON payload string of a batch of Telemetry intervals.
+        It is called by the devices telemetry Publisher, off the sampling loop.
 
-    def mqtt_configure(self, credentials: ConfigParser):
+        :param batch: List of the closed Telemetry intervals.
+        :returns: Tuple of the topic and payload string.
         """
-        This method configures the devices MQTT client to publish messages to AWS IoT, using its
-        read credentials.ini.
+        return "iotumble/telemetry", dumps({"intervals": batch}, separators=(",", ":"))
 
-        :param credentials: ConfigParser object of the devices read credentials.ini.
+    def mqtt_publish(self, topic: str, payload: str):
         """
-        self.mqtt_client = AWSIoTMQTTClient(credentials.get("mqtt", "iot_thing"))
-        self.mqtt_client.configureEndpoint(credentials.get("mqtt", "iot_endpoint"), 8883)
-        self.mqtt_client.configureCredentials(credentials.get("path", "root_ca"),
-                                              credentials.get("path", "private_key"),
-                                              credentials.get("path", "certificate"))
-        self.mqtt_client.configureOfflinePublishQueueing(-1)
-        self.mqtt_client.configureDrainingFrequency(2)
-        self.mqtt_client.configureConnectDisconnectTimeout(10)
-        self.mqtt_client.configureMQTTOperationTimeout(5)
+        This method publishes a created topic and payload string to the devices sink. It is called
+        by the devices Publisher, off the sampling loop.
 
-    def mqtt_publish(self):
-        """This method publishes a created JSON payload string to AWS IoT using the MQTT client."""
-        topic = f"iotumble/incident/{self.request_incident_count() + 1}"
-        payload = self.create_payload()
-        self.mqtt_client.publish(topic, payload, 1)
+        :param topic: Name of the topic.
+        :param payload: Payload string to be published.
+        """
+        self.sink.publish(topic, payload)
 
-    def create_payload(self) -> str:
+    @staticmethod
+    def create_payload(window: tuple) -> str:
         """
-        This method creates a JSON payload string of the devices timestamp list.
+        This method creates a JSON payload string of a timestamp window, with its peak SVM value
+        (so the program can list incidents without reading their timestamps).
 
+        :param window: Snapshot of the devices timestamp RingBuffer.
         :returns: JSON payload string of the devices timestamps.
         """
-        payload = "{"
-        for i, timestamp in enumerate(self.timestamps):
-            payload_timestamp = f"'{i}': {timestamp}"
-            if timestamp != self.timestamps[-1]:
-                payload += payload_timestamp + ", "
-            else:
-                payload += payload_timestamp + "}"
-        return payload.replace("'", '"')
+        payload_timestamps = [f'"peak": {max(window[3])!r}']
+        for i, (x_acc, y_acc, z_acc, svm, epoch) in enumerate(zip(*window)):
+            payload_timestamps.append(f'"{i}": {{"x": {x_acc!r}, "y": {y_acc!r}, '
+                                      f'"z": {z_acc!r}, "svm": {svm!r}, "ep": {epoch!r}}}')
+        return "{" + ", ".join(payload_timestamps) + "}"
+
+    @classmethod
+    def create_compact_payload(cls, window: tuple, period: float) -> str:
+        """
+        This method creates a compact JSON payload string of a timestamp window. Rather than a key
+        for every value of every timestamp, it holds the payload version, the base epoch, the
+        sample period, the amount of timestamps, the peak SVM value, and the base64 of the packed
+        little-endian float32 columns (x, y, z, svm, and the epoch offsets from the base epoch).
+
+        :param window: Snapshot of the devices timestamp RingBuffer.
+        :param period: Sample period of the device (in seconds).
+        :returns: Compact JSON payload string of the devices timestamps.
+        """
+        x_data, y_data, z_data, svm_data, epochs = window
+        base_epoch = epochs[0]
+        offsets = [epoch - base_epoch for epoch in epochs]
+        length = len(epochs)
+        data = pack(f"<{length * 5}f", *x_data, *y_data, *z_data, *svm_data, *offsets)
+        return (f'{{"v": {cls.payload_version}, "ep": {base_epoch!r}, "dt": {period!r}, '
+                f'"n": {length}, "peak": {max(svm_data)!r}, '
+                f'"data": "{b64encode(data).decode("ascii")}"}}')
 
-    def request_incident_count(self) -> int:
+    def read_accelerometer(self) -> int:
         """
-        This method requests the count of incident items from the DynamoDB client, so its response
-        can be incremented.
+        This method waits for the next sample deadline of the devices Scheduler, reads the devices
+        accelerometer, creates and records a timestamp, and advances its captures. If the threshold
+        flag is False, it then checks if its acceleration values have reached any thresholds. For a
+        batched sensor, the deadlines are a drain apart, and every drained sample is passed to
+        process_samples() instead. Its Telemetry is then advanced, by the elapsed sample periods
+        (or by the amount of drained samples, as a drain can hold more or fewer samples than the
+        periods waited), submitting any full batch of intervals to its telemetry Publisher.
 
-        :returns: Count of incident items.
+        :returns: Amount of sample periods that have elapsed since the previous reading.
         """
-        try:
-            response = self.client.get_item(TableName="iotumble_incidents",
-                                            Key={"pk": {"N": "0"}, "sk": {"S": "count"}})
-            count = response["Item"]["msg"]["N"]
-        except ClientError as err:
-            raise err
+        ticks = self.scheduler.wait(self.drain_periods)
+        if self.sensor.batched:
+            samples = self.sensor.read_samples()
+            self.process_samples(*samples)
+            elapsed = len(samples[3])
         else:
-            return int(count)
+            timestamp = self.create_timestamp()
+            self.record_timestamp(timestamp)
+            self.advance_captures(ticks)
+            if not self.threshold_flag:
+                self.check_thresholds(timestamp)
+            elapsed = ticks
+        batch = self.telemetry.advance(elapsed)
+        if batch:
+            self.telemetry_publisher.submit(batch)
+        return ticks
 
-    def read_accelerometer(self):
+    def process_samples(self, x_data, y_data, z_data, epochs) -> int:
         """
-        This method reads the devices accelerometer, creates and records a timestamp, and if the
-        threshold flag is False, it checks if its acceleration values have reached any thresholds.
+        This method is the batch path of read_accelerometer(), for a block of consecutive samples
+        (such as a drained ADXL345 FIFO). It calculates the SVM values and threshold mask of the
+        whole block in one vectorized operation, and then records the block in segments, split
+        wherever a capture elapses, the threshold flag is cleared, or a threshold is reached, so the
+        outcome matches reading the samples one at a time.
+
+        :param x_data: Array of X-Acceleration values.
+        :param y_data: Array of Y-Acceleration values.
+        :param z_data: Array of Z-Acceleration values.
+        :param epochs: Array of epoch times.
+        :returns: Index of the first sample that reached the thresholds (-1 if none did).
         """
-        sleep(0.1)
-        timestamp = self.create_timestamp()
-        self.record_timestamp(timestamp)
-        if not self.threshold_flag:
-            self.check_thresholds(timestamp)
+        columns = [np.asarray(data, dtype=np.float64) for data in (x_data, y_data, z_data)]
+        columns.append(self.calculate_svm_batch(*columns))
+        columns.append(np.asarray(epochs, dtype=np.float64))
+        triggers = self.check_thresholds_batch(*columns[:4])
+        self.telemetry.record_batch(columns[3])
+        trigger_indices = np.flatnonzero(triggers)
+        length = len(columns[4])
+        start = 0
+        while start < length:
+            end = length
+            if self.captures:
+                end = min(end, start + min(self.captures))
+                if self.threshold_flag:
+                    end = min(end, start + self.captures[-1] - self.inactivity_length)
+            if not self.threshold_flag:
+                later = trigger_indices[trigger_indices >= start]
+                if later.size:
+                    end = min(end, int(later[0]) + 1)
+            segment = tuple(data[start:end] for data in columns)
+            self.timestamps.extend(segment)
+            for stats, data in zip(self.inactivity_stats, segment):
+                stats.extend(np.abs(data).tolist())
+            self.advance_captures(end - start)
+            if not self.threshold_flag and triggers[end - 1]:
+                self.threshold_reached()
+            start = end
+        return int(trigger_indices[0]) if trigger_indices.size else -1
 
-    def create_timestamp(self) -> dict:
+    def create_timestamp(self) -> tuple:
         """
-        This method uses the acceleration values of the devices accelerometer to calculate the
-        Signal Vector Magnitude (SVM), and then create a timestamp with these values.
+        This method uses the acceleration values of the devices sensor to calculate the Signal
+        Vector Magnitude (SVM), and then create a timestamp with these values.
 
-        :returns: Created timestamp.
+        :returns: Created timestamp (x, y, z, svm, and ep values).
         """
-        x_acc, y_acc, z_acc = self.accelerometer.acceleration
+        x_acc, y_acc, z_acc = self.sensor.read_acceleration()
         svm = self.calculate_svm(x_acc, y_acc, z_acc)
-        timestamp = {"x": x_acc, "y": y_acc, "z": z_acc, "svm": svm, "ep": time()}
-        return timestamp
+        return x_acc, y_acc, z_acc, svm, time()
 
-    def record_timestamp(self, timestamp: dict):
+    def record_timestamp(self, timestamp: tuple):
         """
-        This method records a timestamp to the devices timestamp list. It then deletes the first
-        timestamp in the list if the list is larger than 51 (each timestamp is 0.1s, so only 5
-        seconds of previous timestamps are saved).
+        This method records a timestamp to the devices timestamp RingBuffer, which overwrites its
+        oldest timestamp once it holds the window length (so only 5 seconds of previous timestamps
+        are saved at the devices sample rate). It also records the absolute x, y, z, and svm values
+        to the devices inactivity RunningStats, and the svm value to its Telemetry.
 
         :param timestamp: Created Timestamp.
         """
         self.timestamps.append(timestamp)
-        if len(self.timestamps) > 51:
-            self.timestamps.pop(0)
+        for stats, data in zip(self.inactivity_stats, timestamp):
+            stats.append(abs(data))
+        self.telemetry.record(timestamp[3])
 
-    def check_thresholds(self, timestamp: dict):
+    def check_thresholds(self, timestamp: tuple):
         """
         This method checks if the absolute values of a created timestamp have reached the set
         thresholds. If its SVM reaches a value of 20, and any acceleration reaches a value of 18,
@@ -141,62 +365,70 @@ class Device:
 
         :param timestamp: Created Timestamp.
         """
-        svm = abs(timestamp.get("svm"))
+        svm = abs(timestamp[3])
         if svm > 20:
-            for key in ("x", "y", "z"):
-                data = abs(timestamp.get(key))
-                if data > 18:
+            for data in timestamp[:3]:
+                if abs(data) > 18:
                     self.threshold_reached()
                     break
 
     def threshold_reached(self):
         """
-        This method sets the threshold flag to True, gets the half length of the devices timestamp
-        list, and reads the accelerometer for this amount of timestamps. The device then checks
-        these read timestamps for inactivity, by passing half of their length to check_inactivity()
-        (as the first few timestamps will still be active due to the devices impact/movement).
+        This method moves the device to its impact state, sets the threshold flag to True, records
+        the impact to its Telemetry, and starts a capture of the half length of the devices
+        timestamp window. It returns straight away, as the capture is advanced by the following
+        accelerometer readings.
         """
+        self.state = self.impact_state
+        self.telemetry.record_impact()
         self.threshold_flag = True
-        post_threshold_length = int(len(self.timestamps) / 2)
-        for _ in range(post_threshold_length):
-            self.read_accelerometer()
-        self.check_inactivity(int(post_threshold_length / 2))
-        self.threshold_flag = False
+        self.captures.append(self.post_threshold_length)
+
+    def advance_captures(self, ticks: int):
+        """
+        This method advances each started capture by the amount of elapsed sample periods (missed
+        deadlines included, so the post threshold time matches wall time). Once a capture has
+        elapsed, the device checks the last half of the capture for inactivity with
+        check_inactivity() (as the first few timestamps will still be active due to the devices
+        impact/movement). The threshold flag stays True while the newest capture is
+        within this active half, so one impact does not start several captures.
+
+        :param ticks: Amount of sample periods that have elapsed since the previous reading.
+        """
+        if not self.captures:
+            return
+        captures = []
+        for remaining in self.captures:
+            remaining -= ticks
+            if remaining > 0:
+                captures.append(remaining)
+            else:
+                self.state = self.verdict_state
+                self.check_inactivity()
+        self.captures = captures
+        self.threshold_flag = bool(captures) and captures[-1] > self.inactivity_length
+        self.state = self.capture_state if captures else self.idle_state
 
-    def check_inactivity(self, inactivity_length: int):
+    def check_inactivity(self):
         """
-        This method gets lists of the absolute post threshold values, loops through each one,
-        calculates their average, and checks if any value in the list is within -1 or 1 of their
-        average. If all values are within this range, the device is inactive so it publishes an
-        incident to AWS.
+        This method checks if the device is inactive with is_still(). If it is, it appends its
+        timestamp window to its Spool, and submits the appended incident to its Publisher.
 
-        :param inactivity_length: Length to check for inactivity.
-        :return: None (if any value isn't within -1 or 1 of their average).
+        :return: None (if the device isn't inactive).
         """
-        post_threshold = self.get_post_threshold(inactivity_length)
-        for data_list in post_threshold.values():
-            average = sum(data_list) / inactivity_length
-            for data in data_list:
-                comparison = data - average
-                if -1 <= comparison <= 1:
-                    continue
-                return
-        self.mqtt_publish()
+        if not self.is_still():
+            return
+        self.publisher.submit(self.spool.append(self.timestamps))
 
-    def get_post_threshold(self, inactivity_length: int) -> dict:
+    def is_still(self) -> bool:
         """
-        This method uses the inactivity length to get the last timestamps of its amount from the
-        devices timestamp list. It then stores the absolute values for each timestamp into lists,
-        and returns them in a dictionary, with their corresponding keys.
+        This method checks if all absolute x, y, z, and svm values of the last timestamps of the
+        inactivity length are within -1 or 1 of their average. It only queries the devices
+        inactivity RunningStats, so it is O(1) and can be called on every sample.
 
-        :param inactivity_length: Length to check for inactivity.
-        :return: Lists of the absolute post threshold values.
+        :returns: Boolean outcome on if the device is still.
         """
-        post_threshold = {"x": [], "y": [], "z": [], "svm": []}
-        for timestamp in self.timestamps[-inactivity_length:]:
-            for key, value in post_threshold.items():
-                value.append(abs(timestamp.get(key)))
-        return post_threshold
+        return all(stats.within(1) for stats in self.inactivity_stats)
 
     @staticmethod
     def calculate_svm(x_acc: float, y_acc: float, z_acc: float) -> float:
@@ -211,6 +443,60 @@ class Device:
         svm = sqrt((x_acc * x_acc) + (y_acc * y_acc) + (z_acc * z_acc))
         return svm
 
+    @staticmethod
+    def calculate_svm_batch(x_data: np.ndarray, y_data: np.ndarray,
+                            z_data: np.ndarray) -> np.ndarray:
+        """
+        This method calculates the Signal Vector Magnitudes of arrays of acceleration values.
+
+        :param x_data: Array of X-Acceleration values.
+        :param y_data: Array of Y-Acceleration values.
+        :param z_data: Array of Z-Acceleration values.
+        :return: Array of Signal Vector Magnitude values.
+        """
+        return np.sqrt(x_data * x_data + y_data * y_data + z_data * z_data)
+
+    @staticmethod
+    def check_thresholds_batch(x_data: np.ndarray, y_data: np.ndarray, z_data: np.ndarray,
+                               svm_data: np.ndarray) -> np.ndarray:
+        """
+        This method checks which samples of arrays of acceleration and SVM values have reached the
+        set thresholds (an absolute SVM above 20, and any absolute acceleration above 18).
+
+        :param x_data: Array of X-Acceleration values.
+        :param y_data: Array of Y-Acceleration values.
+        :param z_data: Array of Z-Acceleration values.
+        :param svm_data: Array of Signal Vector Magnitude values.
+        :return: Boolean array of the samples that reached the thresholds.
+        """
+        acc_reached = (np.abs(x_data) > 18) | (np.abs(y_data) > 18) | (np.abs(z_data) > 18)
+        return (np.abs(svm_data) > 20) & acc_reached
+
+    @staticmethod
+    def load_sensor(sensor: str):
+        """
+        This method returns a sensor class by its name (such as "adxl345", "fifo", or
+        "simulated").
+
+        :param sensor: Name of the sensor.
+        :returns: Sensor class.
+        """
+        module = import_module("raspberrypi.sensors." + sensor.lower() + "_sensor")
+        sensor = getattr(module, sensor.capitalize() + "Sensor")
+        return sensor
+
+    @staticmethod
+    def load_sink(sink: str):
+        """
+        This method returns a sink class by its name (such as "aws" or "memory").
+
+        :param sink: Name of the sink.
+        :returns: Sink class.
+        """
+        module = import_module("raspberrypi.sinks." + sink.lower() + "_sink")
+        sink = getattr(module, sink.capitalize() + "Sink")
+        return sink
+
     @staticmethod
     def read_credentials() -> ConfigParser:
         """
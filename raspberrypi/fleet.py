@@ -0,0 +1,204 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the Fleet class, containing the functionality to simulate a fleet of IoTumble
+devices in one process, and report the ingest load they put on a shared sink.
+"""
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable
+
+from raspberrypi.device import Device
+from raspberrypi.sensors.replay_sensor import ReplaySensor
+from raspberrypi.sensors.simulated_sensor import SimulatedSensor
+from raspberrypi.sinks.memory_sink import MemorySink
+from raspberrypi.spool import Spool
+
+
+class Fleet:
+    """
+    This class represents a simulated fleet of devices. It contains a constructor, the method to
+    submit the messages of its devices, and the methods to run the fleet and print its report.
+
+    Every device runs the real detection logic of the Device class on its own replayed trace, with
+    a Scheduler that never sleeps. The devices are stepped in turn, so their incidents interleave
+    as they would in time, and their messages are created and published by a shared pool of
+    worker threads to one MemorySink (standing in for AWS), so the shared incident count and lease
+    items are contended. The "sharded" scheme publishes time-ordered incident keys to the shard of
+    each device, the "lease" scheme allocates incident IDs from leased ranges, and the "count"
+    scheme reads the incident count and publishes the next ID (as the device did before leasing),
+    which collides when devices publish at the same time. The writes to the busiest partition key
+    show how far each scheme can scale, as DynamoDB limits the writes per partition.
+    """
+    schemes = ("sharded", "lease", "count")
+    partition_writes_per_second = 1000
+
+    def __init__(self, traces: list, data_rate: int, scheme: str = "sharded", workers: int = 16,
+                 latency: float = 0.0, batched: bool = True):
+        """
+        This constructor instantiates a Fleet object, creating its temporary directory, its shared
+        sink, its worker pool, and a device per trace.
+
+        :param traces: List of the traces replayed by each device.
+        :param data_rate: Sample rate of the traces (in Hz).
+        :param scheme: Name of the incident ID scheme ("sharded", "lease", or "count").
+        :param workers: Amount of worker threads that publish messages.
+        :param latency: Time each request to the shared sink takes (in seconds).
+        :param batched: Boolean on if the traces are replayed a full FIFO per drain.
+        :raises ValueError: If the incident ID scheme is unknown.
+        """
+        if scheme not in self.schemes:
+            raise ValueError(f"Incident ID scheme must be one of {self.schemes}, not {scheme}!")
+        self.state_dir = TemporaryDirectory()
+        self.sink = MemorySink(latency)
+        self.executor = ThreadPoolExecutor(workers)
+        self.futures = []
+        self.latencies = []
+        self.failed = 0
+        self.devices = []
+        for i, trace in enumerate(traces):
+            sensor = ReplaySensor(data_rate, trace, batched)
+            spool = Spool(path.join(self.state_dir.name, f"spool_{i}.bin"), 4)
+            device = Device(sensor, self.sink, False, spool)
+            device.incident_counter.state_path = path.join(self.state_dir.name, f"ids_{i}.ini")
+            device.device_id = f"device{i}"
+            device.key_scheme = "sharded" if scheme == "sharded" else "lease"
+            if scheme == "count":
+                device.incident_counter.allocate = self.create_count_allocator()
+            device.publisher.submit = self.create_submit(device.create_message,
+                                                         device.spool.acknowledge)
+            device.telemetry_publisher.submit = self.create_submit(
+                device.create_telemetry_message)
+            self.devices.append(device)
+
+    def create_count_allocator(self) -> Callable[[], int]:
+        """
+        This method creates an incident ID allocator of the "count" scheme, which requests the
+        incident count of the shared sink and returns the next ID.
+
+        :returns: Method that allocates an incident ID.
+        """
+        return lambda: self.sink.request_incident_count() + 1
+
+    def create_submit(self, create_message: Callable, acknowledge: Callable = None) -> Callable:
+        """
+        This method creates the submit method of a devices Publisher, which hands each submitted
+        incident to the worker pool instead of a Publisher thread per device.
+
+        :param create_message: Method that creates the topic and payload of a submitted incident.
+        :param acknowledge: Method that acknowledges a published incident (None to not).
+        :returns: Method that submits an incident.
+        """
+        def submit(incident):
+            self.futures.append(self.executor.submit(self.publish, perf_counter(), create_message,
+                                                     acknowledge, incident))
+        return submit
+
+    def publish(self, submitted: float, create_message: Callable, acknowledge: Callable,
+                incident):
+        """
+        This method creates and publishes the message of a submitted incident on a worker thread,
+        recording its latency from submit to publish.
+
+        :param submitted: Performance counter time the incident was submitted.
+        :param create_message: Method that creates the topic and payload of the incident.
+        :param acknowledge: Method that acknowledges the published incident (None to not).
+        :param incident: Submitted incident.
+        """
+        try:
+            self.sink.publish(*create_message(incident))
+        except Exception:  # pylint: disable=broad-except
+            self.failed += 1
+            return
+        self.latencies.append(perf_counter() - submitted)
+        if acknowledge is not None:
+            acknowledge(incident)
+
+    def run(self) -> dict:
+        """
+        This method steps every device until its trace has been replayed, waits for the workers to
+        publish every message, removes the temporary directory, and creates a report of the fleet.
+        Incident ID collisions are incidents published to a topic that was already published to,
+        and the minimum ingest time is the time the busiest partition key needs for its writes.
+
+        :returns: Dictionary of the fleet report.
+        """
+        for device in self.devices:
+            if device.key_scheme == "lease":
+                device.incident_counter.load()
+        start = perf_counter()
+        active = list(self.devices)
+        while active:
+            for device in active:
+                device.read_accelerometer()
+            active = [device for device in active if not device.sensor.is_exhausted()]
+        detected = perf_counter() - start
+        for future in self.futures:
+            future.result()
+        elapsed = perf_counter() - start
+        self.executor.shutdown()
+        self.state_dir.cleanup()
+        topics = Counter(message[1] for message in self.sink.get_messages()
+                         if message[1].startswith("iotumble/incident/"))
+        published = sum(topics.values())
+        latencies = sorted(self.latencies)
+        samples = sum(len(device.sensor.trace) for device in self.devices)
+        partition_writes = self.sink.get_partition_writes()
+        busiest_writes = max(partition_writes.values(), default=0)
+        return {"devices": len(self.devices), "samples": samples, "seconds": elapsed,
+                "samples_per_second": samples / detected, "published": published,
+                "incidents_per_second": published / elapsed,
+                "messages": len(self.sink.get_messages()), "failed": self.failed,
+                "collisions": published - len(topics),
+                "lease_requests": self.sink.get_lease_requests(),
+                "partitions": len(partition_writes),
+                "busiest_partition_writes": busiest_writes,
+                "busiest_partition_share": (busiest_writes / sum(partition_writes.values())
+                                            if partition_writes else None),
+                "min_ingest_seconds": busiest_writes / self.partition_writes_per_second,
+                "publish_latency_p50": latencies[len(latencies) // 2] if latencies else None,
+                "publish_latency_p99": latencies[len(latencies) * 99 // 100] if latencies else None,
+                "publish_latency_max": latencies[-1] if latencies else None}
+
+    @staticmethod
+    def print_report(report: dict):
+        """
+        This method prints a fleet report, one statistic per line.
+
+        :param report: Dictionary of the fleet report.
+        """
+        for key, value in report.items():
+            if isinstance(value, float):
+                value = f"{value:.6f}"
+            print(f"{key:<28}{value}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Simulate a fleet of IoTumble devices offline.")
+    parser.add_argument("trace", nargs="?", help="trace CSV replayed by every device (a "
+                                                 "synthetic trace per device if omitted)")
+    parser.add_argument("--devices", type=int, default=100, help="amount of devices")
+    parser.add_argument("--rate", type=int, default=50, help="sample rate of the traces (Hz)")
+    parser.add_argument("--falls", type=int, default=2, help="falls in each synthetic trace")
+    parser.add_argument("--scheme", choices=Fleet.schemes, default="sharded",
+                        help="incident ID scheme")
+    parser.add_argument("--workers", type=int, default=16, help="publishing worker threads")
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="time each request to the sink takes (seconds)")
+    parser.add_argument("--polled", action="store_true", help="replay one sample at a time")
+    arguments = parser.parse_args()
+    if arguments.trace:
+        fleet_traces = [ReplaySensor.read_trace(arguments.trace)] * arguments.devices
+    else:
+        fleet_traces = [SimulatedSensor.create_fall_trace(arguments.rate, arguments.falls, seed)
+                        for seed in range(arguments.devices)]
+    fleet = Fleet(fleet_traces, arguments.rate, arguments.scheme, arguments.workers,
+                  arguments.latency, not arguments.polled)
+    fleet.print_report(fleet.run())
@@ -0,0 +1,93 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the IncidentCounter class, containing the functionality to allocate incident
+IDs on the device from a leased range, without a DynamoDB request per published incident.
+"""
+from configparser import ConfigParser
+from os import path, replace
+from threading import RLock
+from typing import Callable
+
+
+class IncidentCounter:
+    """
+    This class represents a locally persisted incident counter. It contains a constructor, the
+    methods to load, lease, and allocate incident IDs, and the method to save its state.
+
+    IDs are allocated from a range leased with one atomic DynamoDB update, so devices publishing at
+    the same time never share an ID. The next ID and the end of the range are saved after every
+    allocation, so a restarted device carries on from its unused IDs.
+    """
+
+    def __init__(self, state_path: str, lease_size: int, request_lease: Callable[[int], int]):
+        """
+        This constructor instantiates an IncidentCounter object.
+
+        :param state_path: Name of the path the counter state is saved to.
+        :param lease_size: Amount of incident IDs to lease at once.
+        :param request_lease: Method that leases a range of IDs and returns its last ID.
+        """
+        self.state_path = state_path
+        self.lease_size = lease_size
+        self.request_lease = request_lease
+        self.next_id = 1
+        self.end_id = 0
+        self.lock = RLock()
+
+    def load(self):
+        """This method loads the saved counter state, if the state path exists."""
+        if not path.exists(self.state_path):
+            return
+        state = ConfigParser()
+        state.read(self.state_path)
+        self.next_id = state.getint("lease", "next_id", fallback=1)
+        self.end_id = state.getint("lease", "end_id", fallback=0)
+
+    def save(self):
+        """
+        This method saves the counter state to a temporary file, and then replaces the state path
+        with it, so the state is never left half written.
+        """
+        state = ConfigParser()
+        state.add_section("lease")
+        state.set("lease", "next_id", str(self.next_id))
+        state.set("lease", "end_id", str(self.end_id))
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            state.write(file)
+        replace(temp_path, self.state_path)
+
+    def lease(self):
+        """This method leases a new range of incident IDs if the current range has been used."""
+        with self.lock:
+            if self.next_id > self.end_id:
+                self.end_id = self.request_lease(self.lease_size)
+                self.next_id = self.end_id - self.lease_size + 1
+                self.save()
+
+    def allocate(self) -> int:
+        """
+        This method allocates the next incident ID, leasing a new range first if the current range
+        has been used. The lock is held across the lease and the allocation, so concurrent callers
+        can never allocate past the end of the leased range.
+
+        :returns: Allocated incident ID.
+        """
+        with self.lock:
+            self.lease()
+            incident_id = self.next_id
+            self.next_id += 1
+            self.save()
+        return incident_id
+
+    def get_remaining(self) -> int:
+        """
+        This method gets the amount of unused incident IDs in the current range.
+
+        :returns: Amount of unused incident IDs.
+        """
+        return max(self.end_id - self.next_id + 1, 0)
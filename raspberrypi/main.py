@@ -5,7 +5,8 @@
 
 """
 This module contains the code to initialise the IoTumble device, connect it to AWS, start an
-infinite while loop, and begin reading its accelerometer values.
+infinite while loop, and begin reading its accelerometer values. On an interrupt, the device is
+disconnected once its submitted incidents have been published.
 """
 from raspberrypi.device import Device
 
@@ -13,5 +14,8 @@ if __name__ == "__main__":
     device = Device()
     device.connect()
 
-    while True:
-        device.read_accelerometer()
+    try:
+        while True:
+            device.read_accelerometer()
+    except KeyboardInterrupt:
+        device.disconnect()
@@ -0,0 +1,225 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the Publisher class, containing the functionality to publish the devices
+incidents on a background thread, so the devices sampling loop never waits on AWS.
+"""
+from collections import deque
+from json import dump, load
+from os import listdir, makedirs, path, remove
+from threading import Condition, Thread
+from time import perf_counter, sleep, time_ns
+from typing import Callable, Tuple
+
+
+class Publisher(Thread):
+    """
+    This class represents a background publisher, implementing Thread. It contains a constructor,
+    the methods to submit incidents and stop the publisher, the methods to deliver and spill
+    messages, the thread run method, and the method to report its counters.
+
+    Submitted incidents wait in a bounded queue (the oldest is dropped once it is full), so a slow
+    or offline connection can never block the sampling loop or grow memory. Pending incidents are
+    taken in batches, and a message that still fails after its retries is spilled to disk (if a
+    spill path is set) and re-sent once a publish succeeds again. Incidents that have been
+    published (or spilled) are passed to an optional acknowledge method. A dropped incident is
+    not acknowledged, so once a publish succeeds again, the incidents of an optional recover
+    method (such as the pending incidents of the Spool) are submitted again, as the queue has
+    room for them.
+    """
+    latency_samples = 1000
+
+    def __init__(self, create_message: Callable, publish: Callable, queue_size: int = 16,
+                 batch_size: int = 8, retries: int = 3, spill_path: str = "",
+                 acknowledge: Callable = None, recover: Callable = None):
+        """
+        This constructor instantiates a Publisher object.
+
+        :param create_message: Method that creates the topic and payload of a submitted incident.
+        :param publish: Method that publishes a topic and payload.
+        :param queue_size: Maximum amount of incidents waiting to be published.
+        :param batch_size: Maximum amount of incidents taken from the queue at once.
+        :param retries: Amount of times a failed publish is retried.
+        :param spill_path: Name of the directory failed messages are spilled to ("" to drop them).
+        :param acknowledge: Method that acknowledges a published incident (None to not).
+        :param recover: Method that gets the unacknowledged incidents, to submit again after any
+        incidents were dropped (None to not).
+        """
+        super().__init__(name="publisher", daemon=True)
+        self.create_message = create_message
+        self.publish = publish
+        self.queue = deque(maxlen=queue_size)
+        self.condition = Condition()
+        self.batch_size = batch_size
+        self.retries = retries
+        self.spill_path = spill_path
+        self.acknowledge = acknowledge
+        self.recover = recover
+        self.dropped = False
+        self.stopped = False
+        self.latencies = deque(maxlen=self.latency_samples)
+        self.counters = {"published": 0, "failed": 0, "retries": 0, "drops": 0, "spilled": 0,
+                         "unspilled": 0, "recovered": 0}
+        if spill_path and not path.exists(spill_path):
+            makedirs(spill_path)
+
+    def submit(self, incident):
+        """
+        This method submits an incident to the Publisher without blocking. If the queue is full,
+        its oldest incident is dropped (until it is recovered).
+
+        :param incident: Incident to be published.
+        """
+        with self.condition:
+            if len(self.queue) == self.queue.maxlen:
+                self.counters["drops"] += 1
+                self.dropped = True
+            self.queue.append((perf_counter(), incident))
+            self.condition.notify()
+
+    def stop(self):
+        """
+        This method stops the Publisher once its submitted incidents have been delivered. A
+        Publisher that was never started is only marked as stopped.
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        """
+        This method takes batches of submitted incidents from the queue and delivers them until the
+        Publisher is stopped. While messages are spilled (or incidents were dropped), it also
+        re-sends a batch of them after each successful delivery (or every few seconds when idle).
+        """
+        while True:
+            with self.condition:
+                if not self.queue and not self.stopped:
+                    self.condition.wait(5 if self.get_spilled() or self.dropped else None)
+                if not self.queue and self.stopped:
+                    break
+                batch = [self.queue.popleft() for _ in range(min(self.batch_size,
+                                                                 len(self.queue)))]
+            delivered = False
+            for submitted, incident in batch:
+                try:
+                    message = self.create_message(incident)
+                except Exception:  # pylint: disable=broad-except
+                    self.counters["failed"] += 1
+                    continue
+                published = self.deliver(submitted, message)
+                delivered = delivered or published
+                if self.acknowledge is not None and (published or self.spill_path):
+                    self.acknowledge(incident)
+            if (delivered or not batch) and not self.stopped:
+                self.unspill()
+                self.resubmit()
+
+    def deliver(self, submitted: float, message: Tuple[str, str]) -> bool:
+        """
+        This method publishes a message, retrying with an exponential backoff if it fails. If it
+        still fails, the message is spilled to disk, or dropped if there is no spill path.
+
+        :param submitted: Performance counter time the incident was submitted.
+        :param message: Tuple of the topic and payload of the message.
+        :returns: Boolean outcome on if the message was published.
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.counters["retries"] += 1
+                sleep(0.5 * 2 ** (attempt - 1))
+            try:
+                self.publish(*message)
+            except Exception:  # pylint: disable=broad-except
+                continue
+            self.counters["published"] += 1
+            self.latencies.append(perf_counter() - submitted)
+            return True
+        if self.spill_path:
+            self.spill(message)
+        else:
+            self.counters["failed"] += 1
+        return False
+
+    def spill(self, message: Tuple[str, str]):
+        """
+        This method writes a message to a new file of the spill path, named after the time it was
+        spilled so the files sort in that order (also across restarts).
+
+        :param message: Tuple of the topic and payload of the message.
+        """
+        self.counters["spilled"] += 1
+        file_name = f"{time_ns():020d}.json"
+        with open(path.join(self.spill_path, file_name), "w", encoding="utf-8") as file:
+            dump({"topic": message[0], "payload": message[1]}, file)
+
+    def unspill(self):
+        """
+        This method re-sends a batch of spilled messages (oldest first), deleting each file once
+        its message has been published. It stops at the first message that fails again.
+        """
+        for file_name in self.get_spilled()[:self.batch_size]:
+            file_path = path.join(self.spill_path, file_name)
+            with open(file_path, encoding="utf-8") as file:
+                message = load(file)
+            try:
+                self.publish(message["topic"], message["payload"])
+            except Exception:  # pylint: disable=broad-except
+                return
+            remove(file_path)
+            self.counters["unspilled"] += 1
+            self.counters["published"] += 1
+
+    def resubmit(self):
+        """
+        This method submits the incidents of the recover method again after any incidents were
+        dropped, skipping those still queued, until the queue is full. Once every incident fits,
+        no incidents are dropped any more.
+        """
+        if not self.dropped or self.recover is None:
+            return
+        incidents = self.recover()
+        with self.condition:
+            queued = {incident for _, incident in self.queue}
+            for incident in incidents:
+                if incident in queued:
+                    continue
+                if len(self.queue) == self.queue.maxlen:
+                    return
+                self.queue.append((perf_counter(), incident))
+                self.counters["recovered"] += 1
+            self.dropped = False
+
+    def get_spilled(self) -> list:
+        """
+        This method gets the file names of the spilled messages, in the order they were spilled.
+
+        :returns: List of the spilled message file names.
+        """
+        if not self.spill_path:
+            return []
+        return sorted(file_name for file_name in listdir(self.spill_path)
+                      if file_name.endswith(".json"))
+
+    def report(self) -> dict:
+        """
+        This method creates a report of the Publishers counters: its queue depth, its publish
+        latency percentiles (from submit to publish, over its latest publishes), and its amount of
+        published, failed, retried, dropped, spilled, and recovered messages.
+
+        :returns: Dictionary of the Publishers counters.
+        """
+        latencies = sorted(self.latencies)
+        report = {"depth": len(self.queue), **self.counters}
+        for percentile in (50, 90, 99):
+            if latencies:
+                index = min(len(latencies) * percentile // 100, len(latencies) - 1)
+                report[f"latency_p{percentile}"] = latencies[index]
+            else:
+                report[f"latency_p{percentile}"] = None
+        return report
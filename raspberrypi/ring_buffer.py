@@ -0,0 +1,153 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the RingBuffer class, containing the functionality to record the devices
+timestamps into a fixed-capacity window.
+"""
+from typing import Tuple
+
+
+class RingBuffer:
+    """
+    This class represents a fixed-capacity ring buffer of timestamps. It contains a constructor, the
+    methods to record and read its timestamps, and the getter methods for its parameters.
+
+    Each timestamp key is stored in its own preallocated column of doubles. Every value is written
+    twice, once at its index and once at its index plus the capacity, so the latest timestamps are
+    always contiguous and can be returned as zero-copy memoryview slices. The columns can be kept
+    in a passed buffer (such as the memory-mapped history of a Spool), so they outlive the device.
+    """
+    keys = ("x", "y", "z", "svm", "ep")
+
+    def __init__(self, capacity: int, buffer: memoryview = None):
+        """
+        This constructor instantiates a RingBuffer object.
+
+        :param capacity: Maximum amount of timestamps in the RingBuffer.
+        :param buffer: Writable buffer of at least 80 bytes per timestamp to keep the columns in
+        (a new bytearray if None).
+        """
+        self.capacity = capacity
+        self.length = 0
+        self.head = 0
+        if buffer is None:
+            buffer = memoryview(bytearray(16 * capacity * len(self.keys)))
+        size = 16 * capacity
+        self.columns = {key: buffer[i * size:(i + 1) * size].cast("d")
+                        for i, key in enumerate(self.keys)}
+        self.column_list = tuple(self.columns[key] for key in self.keys)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, timestamp: Tuple[float, float, float, float, float]):
+        """
+        This method records a timestamp to the RingBuffer, overwriting the oldest timestamp if the
+        RingBuffer is full.
+
+        :param timestamp: Tuple of the timestamps x, y, z, svm, and ep values.
+        """
+        index = self.head
+        mirror = index + self.capacity
+        for column, value in zip(self.column_list, timestamp):
+            column[index] = value
+            column[mirror] = value
+        self.head = index + 1 if index + 1 < self.capacity else 0
+        if self.length < self.capacity:
+            self.length += 1
+
+    def extend(self, columns: tuple):
+        """
+        This method records a batch of timestamps to the RingBuffer with one slice assignment per
+        column, overwriting the oldest timestamps if the RingBuffer is full.
+
+        :param columns: Tuple of the x, y, z, svm, and ep value arrays (float64 buffers).
+        """
+        length = len(columns[0])
+        if length > self.capacity:
+            columns = tuple(values[length - self.capacity:] for values in columns)
+            length = self.capacity
+        head = self.head
+        first = min(length, self.capacity - head)
+        rest = length - first
+        for column, values in zip(self.column_list, columns):
+            column[head:head + first] = values[:first]
+            column[head + self.capacity:head + self.capacity + first] = values[:first]
+            if rest:
+                column[:rest] = values[first:]
+                column[self.capacity:self.capacity + rest] = values[first:]
+        self.head = (head + length) % self.capacity
+        self.length = min(self.length + length, self.capacity)
+
+    def clear(self):
+        """This method clears all timestamps from the RingBuffer."""
+        self.length = 0
+        self.head = 0
+
+    def restore(self, since: float):
+        """
+        This method restores the timestamps already held by the buffer of the RingBuffer (such as
+        the history kept by a Spool before a restart) that are newer than a passed epoch time. The
+        newest timestamp is found by its epoch time, and any older timestamps are cleared.
+
+        :param since: Epoch time the restored timestamps must be newer than.
+        """
+        epochs = self.columns["ep"]
+        newest = max(range(self.capacity), key=epochs.__getitem__)
+        self.head = newest + 1 if newest + 1 < self.capacity else 0
+        end = self.head + self.capacity
+        length = 0
+        while length < self.capacity and epochs[end - length - 1] > since:
+            length += 1
+        self.length = length
+        if not length:
+            self.head = 0
+
+    def last(self, key: str, length: int) -> memoryview:
+        """
+        This method gets a zero-copy view of the values of a key for the last timestamps of a
+        passed length (oldest first).
+
+        :param key: Key of the timestamp values.
+        :param length: Amount of last timestamps.
+        :returns: Memoryview of the timestamp values.
+        """
+        length = min(length, self.length)
+        end = self.head + self.capacity
+        return self.columns[key][end - length:end]
+
+    def snapshot(self) -> Tuple[list, ...]:
+        """
+        This method copies all timestamps of the RingBuffer, so they can be used after it has been
+        overwritten.
+
+        :returns: Tuple of the x, y, z, svm, and ep value lists (oldest first).
+        """
+        return tuple(self.last(key, self.length).tolist() for key in self.keys)
+
+    def get(self, index: int) -> Tuple[float, ...]:
+        """
+        This method gets a timestamp by its index within the RingBuffer (oldest first, negative
+        indices count from the newest).
+
+        :param index: Index of the timestamp.
+        :returns: Tuple of the timestamps x, y, z, svm, and ep values.
+        :raises IndexError: If the index is outside of the RingBuffer.
+        """
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("RingBuffer index out of range")
+        position = self.head + self.capacity - self.length + index
+        return tuple(column[position] for column in self.column_list)
+
+    def get_capacity(self) -> int:
+        """
+        This method gets the capacity of the RingBuffer.
+
+        :returns: Maximum amount of timestamps in the RingBuffer.
+        """
+        return self.capacity
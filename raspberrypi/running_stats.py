@@ -0,0 +1,122 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the RunningStats class, containing the functionality to keep the statistics
+of the devices last timestamp values up to date in constant time.
+"""
+from collections import deque
+
+
+class RunningStats:
+    """
+    This class represents the running statistics (sum, minimum, and maximum) of a sliding window of
+    values. It contains a constructor, the method to record a value, and the methods to query its
+    statistics. The minimum and maximum are kept with monotonic deques, so each recorded value and
+    each query is O(1) (amortised), whatever the length of the window.
+    """
+
+    def __init__(self, length: int):
+        """
+        This constructor instantiates a RunningStats object.
+
+        :param length: Length of the sliding window of values.
+        """
+        self.length = length
+        self.values = [0.0] * length
+        self.count = 0
+        self.total = 0.0
+        self.min_deque = deque()
+        self.max_deque = deque()
+
+    def __len__(self) -> int:
+        return min(self.count, self.length)
+
+    def append(self, value: float):
+        """
+        This method records a value to the sliding window, removing the oldest value from its
+        statistics once the window is full. The sum is recalculated once per window length, so
+        floating point error does not build up from the repeated additions and subtractions.
+
+        :param value: Value to be recorded.
+        """
+        index = self.count
+        slot = index % self.length
+        if index >= self.length:
+            self.total -= self.values[slot]
+        self.values[slot] = value
+        self.total += value
+        while self.min_deque and self.min_deque[-1][1] >= value:
+            self.min_deque.pop()
+        self.min_deque.append((index, value))
+        while self.max_deque and self.max_deque[-1][1] <= value:
+            self.max_deque.pop()
+        self.max_deque.append((index, value))
+        expired = index - self.length
+        if self.min_deque[0][0] <= expired:
+            self.min_deque.popleft()
+        if self.max_deque[0][0] <= expired:
+            self.max_deque.popleft()
+        self.count += 1
+        if slot == self.length - 1:
+            self.total = sum(self.values)
+
+    def extend(self, values):
+        """
+        This method records a batch of values to the sliding window. Only the last values of the
+        window length can affect its statistics, so any earlier values are skipped.
+
+        :param values: Iterable of values to be recorded.
+        """
+        values = list(values)
+        if len(values) > self.length:
+            values = values[-self.length:]
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        """This method clears all values from the sliding window."""
+        self.values = [0.0] * self.length
+        self.count = 0
+        self.total = 0.0
+        self.min_deque.clear()
+        self.max_deque.clear()
+
+    def get_mean(self) -> float:
+        """
+        This method gets the mean of the values in the sliding window.
+
+        :returns: Mean of the values.
+        """
+        return self.total / len(self)
+
+    def get_min(self) -> float:
+        """
+        This method gets the minimum of the values in the sliding window.
+
+        :returns: Minimum of the values.
+        """
+        return self.min_deque[0][1]
+
+    def get_max(self) -> float:
+        """
+        This method gets the maximum of the values in the sliding window.
+
+        :returns: Maximum of the values.
+        """
+        return self.max_deque[0][1]
+
+    def within(self, band: float) -> bool:
+        """
+        This method checks if all values in the sliding window are within a band of their mean,
+        which is the case when both the minimum and maximum are within it.
+
+        :param band: Distance from the mean that all values must be within.
+        :returns: Boolean outcome on if all values are within the band.
+        """
+        if not self.count:
+            return False
+        mean = self.get_mean()
+        return self.get_max() - mean <= band and mean - self.get_min() <= band
@@ -0,0 +1,140 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the Scheduler class, containing the functionality to pace the devices
+accelerometer readings at a fixed sample rate.
+"""
+from math import floor
+from time import monotonic, sleep
+
+
+class Scheduler:
+    """
+    This class represents a fixed-rate sampling scheduler. It contains a constructor, the method to
+    wait for the next sample deadline, and the getter methods for its deadline statistics.
+    Deadlines are kept on a fixed grid of the monotonic clock, so time spent reading the
+    accelerometer (or blocking elsewhere) does not make the sample rate drift. A Scheduler that is
+    not realtime never sleeps, so recorded traces can be replayed as fast as possible.
+    """
+    min_rate = 10
+    max_rate = 800
+
+    def __init__(self, sample_rate: int, realtime: bool = True):
+        """
+        This constructor instantiates a Scheduler object.
+
+        :param sample_rate: Sample rate of the Scheduler (in Hz).
+        :param realtime: Boolean on if the Scheduler sleeps until each deadline.
+        :raises ValueError: If the sample rate is outside of the supported range.
+        """
+        if not self.min_rate <= sample_rate <= self.max_rate:
+            raise ValueError(f"Sample rate must be between {self.min_rate} and {self.max_rate} "
+                             f"Hz, not {sample_rate} Hz!")
+        self.sample_rate = sample_rate
+        self.period = 1 / sample_rate
+        self.realtime = realtime
+        self.deadline = None
+        self.ticks = 0
+        self.missed_deadlines = 0
+        self.overruns = 0
+        self.max_overrun = 0.0
+
+    def wait(self, periods: int = 1) -> int:
+        """
+        This method sleeps until the next deadline, a passed amount of sample periods after the
+        previous one (or after the first call, so a first block of samples is also counted in
+        full). If the deadline has already passed, it does not sleep, records an overrun, and skips
+        any whole sample periods that were missed so the following deadlines stay on the grid.
+
+        :param periods: Amount of sample periods between the previous and next deadline.
+        :returns: Amount of sample periods that have elapsed since the previous call.
+        """
+        if not self.realtime:
+            self.ticks += periods
+            return periods
+        now = monotonic()
+        if self.deadline is None:
+            self.deadline = now
+        self.deadline += periods * self.period
+        delay = self.deadline - now
+        if delay > 0:
+            sleep(delay)
+            missed = 0
+        else:
+            overrun = -delay
+            missed = floor(overrun / self.period)
+            self.deadline += missed * self.period
+            self.missed_deadlines += missed
+            if overrun > 0:
+                self.overruns += 1
+                self.max_overrun = max(self.max_overrun, overrun)
+        self.ticks += periods + missed
+        return periods + missed
+
+    def reset(self):
+        """This method resets the deadline grid and the deadline statistics of the Scheduler."""
+        self.deadline = None
+        self.ticks = 0
+        self.missed_deadlines = 0
+        self.overruns = 0
+        self.max_overrun = 0.0
+
+    def get_sample_rate(self) -> int:
+        """
+        This method gets the sample rate of the Scheduler.
+
+        :returns: Sample rate of the Scheduler (in Hz).
+        """
+        return self.sample_rate
+
+    def get_period(self) -> float:
+        """
+        This method gets the sample period of the Scheduler.
+
+        :returns: Sample period of the Scheduler (in seconds).
+        """
+        return self.period
+
+    def get_ticks(self) -> int:
+        """
+        This method gets the amount of sample periods that have elapsed, including missed ones.
+
+        :returns: Amount of elapsed sample periods.
+        """
+        return self.ticks
+
+    def get_missed_deadlines(self) -> int:
+        """
+        This method gets the amount of sample deadlines that were missed entirely.
+
+        :returns: Amount of missed sample deadlines.
+        """
+        return self.missed_deadlines
+
+    def get_overruns(self) -> int:
+        """
+        This method gets the amount of times a sample deadline had already passed when waited on.
+
+        :returns: Amount of overruns.
+        """
+        return self.overruns
+
+    def get_max_overrun(self) -> float:
+        """
+        This method gets the longest time a sample deadline had already passed by when waited on.
+
+        :returns: Longest overrun (in seconds).
+        """
+        return self.max_overrun
+
+    def report(self) -> dict:
+        """
+        This method creates a report of the Schedulers deadline statistics.
+
+        :returns: Dictionary of the Schedulers deadline statistics.
+        """
+        return {"rate": self.sample_rate, "ticks": self.ticks, "missed": self.missed_deadlines,
+                "overruns": self.overruns, "max_overrun": self.max_overrun}
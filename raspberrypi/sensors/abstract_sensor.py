@@ -0,0 +1,73 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the abstract class AbstractSensor, containing the methods that are shared
+between the accelerometer sensors of the device.
+"""
+from abc import ABC, abstractmethod
+from time import time
+from typing import Tuple
+
+
+class AbstractSensor(ABC):
+    """
+    This abstract class represents an abstract sensor and implements ABC (Abstract Base Class). It
+    contains the abstract methods to be implemented by each sensor, and the methods to be shared
+    between them. Batched sensors return bursts of samples from read_samples(), rather than one
+    sample per read_acceleration().
+    """
+    batched = False
+
+    def __init__(self, data_rate: int):
+        """
+        This constructor instantiates a sensor object.
+
+        :param data_rate: Output data rate of the sensor (in Hz).
+        """
+        self.data_rate = data_rate
+
+    @abstractmethod
+    def start(self):
+        """This method configures the sensor so it can be read."""
+
+    @abstractmethod
+    def read_acceleration(self) -> Tuple[float, float, float]:
+        """
+        This method reads the current acceleration values of the sensor.
+
+        :returns: Tuple of the X, Y, and Z-Acceleration values.
+        """
+
+    def read_samples(self) -> Tuple[list, list, list, list]:
+        """
+        This method reads the samples that are available from the sensor. By default this is one
+        sample of read_acceleration(), timestamped with the current epoch time.
+
+        :returns: Tuple of the X, Y, and Z-Acceleration value lists and epoch time list.
+        """
+        x_acc, y_acc, z_acc = self.read_acceleration()
+        return [x_acc], [y_acc], [z_acc], [time()]
+
+    def get_data_rate(self) -> int:
+        """
+        This method gets the output data rate of the sensor.
+
+        :returns: Output data rate of the sensor (in Hz).
+        """
+        return self.data_rate
+
+    @staticmethod
+    def backdate(drain_time: float, length: int, data_rate: int) -> list:
+        """
+        This method creates the epoch times of a burst of samples, counting back from the time
+        they were drained using the output data rate (the last sample is the newest).
+
+        :param drain_time: Epoch time the samples were drained.
+        :param length: Amount of samples.
+        :param data_rate: Output data rate of the sensor (in Hz).
+        :returns: List of epoch times.
+        """
+        return [drain_time - (length - 1 - i) / data_rate for i in range(length)]
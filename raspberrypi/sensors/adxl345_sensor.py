@@ -0,0 +1,37 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the Adxl345Sensor class, containing the functionality to poll the devices
+ADXL345 accelerometer one sample at a time.
+"""
+from typing import Tuple
+
+from adafruit_adxl34x import ADXL345
+from board import I2C
+
+from raspberrypi.sensors.abstract_sensor import AbstractSensor
+
+
+class Adxl345Sensor(AbstractSensor):
+    """
+    This class represents a polled ADXL345 accelerometer and implements AbstractSensor. It contains
+    a constructor and the implemented abstract methods.
+    """
+
+    def __init__(self, data_rate: int):
+        """
+        This constructor instantiates an Adxl345Sensor object.
+
+        :param data_rate: Output data rate of the sensor (in Hz).
+        """
+        super().__init__(data_rate)
+        self.accelerometer = ADXL345(I2C())
+
+    def start(self):
+        pass
+
+    def read_acceleration(self) -> Tuple[float, float, float]:
+        return self.accelerometer.acceleration
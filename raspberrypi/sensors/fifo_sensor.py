@@ -0,0 +1,93 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the FifoSensor class, containing the functionality to stream the devices
+ADXL345 accelerometer through its hardware FIFO.
+"""
+# pylint: disable=protected-access
+from struct import unpack
+from time import time
+from typing import Tuple
+
+from adafruit_adxl34x import ADXL345, DataRate
+from board import I2C
+
+from raspberrypi.sensors.abstract_sensor import AbstractSensor
+
+
+class FifoSensor(AbstractSensor):
+    """
+    This class represents an ADXL345 accelerometer streaming through its 32 sample hardware FIFO,
+    and implements AbstractSensor. It contains a constructor and the implemented abstract methods.
+    The accelerometer samples at its output data rate on its own, so samples are not lost while the
+    device is busy, and each drain reads every sample the FIFO holds in one burst.
+    """
+    batched = True
+    fifo_depth = 32
+    reg_int_source = 0x30
+    reg_datax0 = 0x32
+    reg_fifo_ctl = 0x38
+    reg_fifo_status = 0x39
+    fifo_stream_mode = 0b10000000
+    gravity_multiplier = 0.004 * 9.80665
+    data_rates = {25: DataRate.RATE_25_HZ, 50: DataRate.RATE_50_HZ, 100: DataRate.RATE_100_HZ,
+                  200: DataRate.RATE_200_HZ, 400: DataRate.RATE_400_HZ,
+                  800: DataRate.RATE_800_HZ}
+
+    def __init__(self, data_rate: int):
+        """
+        This constructor instantiates a FifoSensor object.
+
+        :param data_rate: Output data rate of the sensor (in Hz).
+        :raises ValueError: If the ADXL345 does not support the output data rate.
+        """
+        if data_rate not in self.data_rates:
+            raise ValueError(f"FIFO data rate must be one of {list(self.data_rates)} Hz, not "
+                             f"{data_rate} Hz!")
+        super().__init__(data_rate)
+        self.accelerometer = ADXL345(I2C())
+        self.overflows = 0
+
+    def start(self):
+        """
+        This method sets the output data rate of the ADXL345, and configures its FIFO in stream
+        mode (where the oldest samples are overwritten once it is full).
+        """
+        self.accelerometer.data_rate = self.data_rates[self.data_rate]
+        self.accelerometer._write_register_byte(self.reg_fifo_ctl,
+                                                self.fifo_stream_mode | (self.fifo_depth - 1))
+
+    def read_acceleration(self) -> Tuple[float, float, float]:
+        return self.accelerometer.acceleration
+
+    def read_samples(self) -> Tuple[list, list, list, list]:
+        """
+        This method drains every sample held by the FIFO, and timestamps them back from the drain
+        time using the output data rate. If the FIFO overran since the last drain, it is counted
+        as an overflow.
+
+        :returns: Tuple of the X, Y, and Z-Acceleration value lists and epoch time list.
+        """
+        drain_time = time()
+        if self.accelerometer._read_register_unpacked(self.reg_int_source) & 0x01:
+            self.overflows += 1
+        length = self.accelerometer._read_register_unpacked(self.reg_fifo_status) & 0x3F
+        x_data, y_data, z_data = [], [], []
+        for _ in range(length):
+            x_raw, y_raw, z_raw = unpack("<hhh",
+                                         self.accelerometer._read_register(self.reg_datax0, 6))
+            x_data.append(x_raw * self.gravity_multiplier)
+            y_data.append(y_raw * self.gravity_multiplier)
+            z_data.append(z_raw * self.gravity_multiplier)
+        return x_data, y_data, z_data, self.backdate(drain_time, length, self.data_rate)
+
+    def get_overflows(self) -> int:
+        """
+        This method gets the amount of times the FIFO overran between drains.
+
+        :returns: Amount of FIFO overflows.
+        """
+        return self.overflows
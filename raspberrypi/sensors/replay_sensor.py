@@ -0,0 +1,108 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the ReplaySensor class, containing the functionality to replay a recorded
+trace of accelerometer values through the device, as fast as it can process them.
+"""
+from csv import DictReader
+from time import time
+from typing import List, Tuple
+
+from raspberrypi.sensors.abstract_sensor import AbstractSensor
+
+
+class ReplaySensor(AbstractSensor):
+    """
+    This class represents a replayed accelerometer trace and implements AbstractSensor. It contains
+    a constructor, the methods to read a trace file, and the implemented abstract methods. Samples
+    are timestamped from a virtual clock at the output data rate rather than the wall clock, so
+    replaying never has to wait. It can replay batched (a full FIFO per drain) or one sample at a
+    time.
+    """
+    fifo_depth = 32
+    resting = (0.0, 0.0, 9.80665)
+    trace_columns = (("X-Acceleration", "Y-Acceleration", "Z-Acceleration"), ("x", "y", "z"))
+
+    def __init__(self, data_rate: int, trace: List[Tuple[float, float, float]],
+                 batched: bool = True):
+        """
+        This constructor instantiates a ReplaySensor object.
+
+        :param data_rate: Output data rate of the sensor (in Hz).
+        :param trace: List of X, Y, and Z-Acceleration values to be replayed.
+        :param batched: Boolean on if the trace is replayed a full FIFO per drain.
+        """
+        super().__init__(data_rate)
+        self.batched = batched
+        self.trace = trace
+        self.position = 0
+        self.epoch = time()
+
+    @classmethod
+    def from_csv(cls, data_rate: int, csv_path: str, batched: bool = True):
+        """
+        This method creates a ReplaySensor from a trace CSV file.
+
+        :param data_rate: Output data rate of the sensor (in Hz).
+        :param csv_path: Name of the trace CSV path.
+        :param batched: Boolean on if the trace is replayed a full FIFO per drain.
+        :returns: Instance of a ReplaySensor object.
+        """
+        return cls(data_rate, cls.read_trace(csv_path), batched)
+
+    @classmethod
+    def read_trace(cls, csv_path: str) -> List[Tuple[float, float, float]]:
+        """
+        This method reads the acceleration values of a trace CSV file. Both the CSV files exported
+        by the IoTumble program (Incident.export_timestamps) and recorded traces with "x", "y", and
+        "z" columns can be read.
+
+        :param csv_path: Name of the trace CSV path.
+        :returns: List of X, Y, and Z-Acceleration values.
+        :raises ValueError: If the CSV file has no acceleration columns.
+        """
+        with open(csv_path, newline="", encoding="utf-8") as file:
+            csv = DictReader(file)
+            for columns in cls.trace_columns:
+                if set(columns).issubset(csv.fieldnames or ()):
+                    break
+            else:
+                raise ValueError(f"'{csv_path}' has no acceleration columns!")
+            return [tuple(float(row[column]) for column in columns) for row in csv]
+
+    def start(self):
+        self.position = 0
+        self.epoch = time()
+
+    def read_acceleration(self) -> Tuple[float, float, float]:
+        if self.position >= len(self.trace):
+            return self.resting
+        acceleration = self.trace[self.position]
+        self.position += 1
+        return acceleration
+
+    def read_samples(self) -> Tuple[list, list, list, list]:
+        """
+        This method replays the next samples of the trace (a full FIFO if batched, otherwise one
+        sample), timestamped from the virtual clock.
+
+        :returns: Tuple of the X, Y, and Z-Acceleration value lists and epoch time list.
+        """
+        start = self.position
+        end = min(start + (self.fifo_depth if self.batched else 1), len(self.trace))
+        self.position = end
+        samples = self.trace[start:end]
+        epochs = [self.epoch + i / self.data_rate for i in range(start, end)]
+        return ([sample[0] for sample in samples], [sample[1] for sample in samples],
+                [sample[2] for sample in samples], epochs)
+
+    def is_exhausted(self) -> bool:
+        """
+        This method checks if the whole trace has been replayed.
+
+        :returns: Boolean outcome on if the trace has been replayed.
+        """
+        return self.position >= len(self.trace)
@@ -0,0 +1,109 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the SimulatedSensor class, containing the functionality to simulate the
+devices accelerometer FIFO on a machine without I2C.
+"""
+from random import Random
+from time import monotonic, time
+from typing import Iterable, List, Tuple
+
+from raspberrypi.sensors.abstract_sensor import AbstractSensor
+
+
+class SimulatedSensor(AbstractSensor):
+    """
+    This class represents a simulated accelerometer FIFO and implements AbstractSensor. It contains
+    a constructor and the implemented abstract methods. Samples are taken from a trace of
+    acceleration values (or a resting device once the trace ends) at the output data rate, and a
+    drain returns every sample that would have been sampled since the last one, up to the FIFO
+    depth, just like FifoSensor.
+    """
+    batched = True
+    fifo_depth = 32
+    resting = (0.0, 0.0, 9.80665)
+
+    def __init__(self, data_rate: int, trace: Iterable[Tuple[float, float, float]] = ()):
+        """
+        This constructor instantiates a SimulatedSensor object.
+
+        :param data_rate: Output data rate of the sensor (in Hz).
+        :param trace: Iterable of X, Y, and Z-Acceleration values to be sampled.
+        """
+        super().__init__(data_rate)
+        self.trace = iter(trace)
+        self.started = None
+        self.sampled = 0
+        self.overflows = 0
+
+    def start(self):
+        self.started = monotonic()
+        self.sampled = 0
+
+    def read_acceleration(self) -> Tuple[float, float, float]:
+        return next(self.trace, self.resting)
+
+    def read_samples(self) -> Tuple[list, list, list, list]:
+        """
+        This method drains every sample that would have been sampled since the last drain. If more
+        than the FIFO depth would have been sampled, the oldest are dropped and counted as an
+        overflow.
+
+        :returns: Tuple of the X, Y, and Z-Acceleration value lists and epoch time list.
+        """
+        if self.started is None:
+            self.start()
+        drain_time = time()
+        due = int((monotonic() - self.started) * self.data_rate) + 1
+        length = due - self.sampled
+        self.sampled = due
+        if length > self.fifo_depth:
+            for _ in range(length - self.fifo_depth):
+                self.read_acceleration()
+            length = self.fifo_depth
+            self.overflows += 1
+        x_data, y_data, z_data = [], [], []
+        for _ in range(length):
+            x_acc, y_acc, z_acc = self.read_acceleration()
+            x_data.append(x_acc)
+            y_data.append(y_acc)
+            z_data.append(z_acc)
+        return x_data, y_data, z_data, self.backdate(drain_time, length, self.data_rate)
+
+    def get_overflows(self) -> int:
+        """
+        This method gets the amount of times the simulated FIFO overran between drains.
+
+        :returns: Amount of FIFO overflows.
+        """
+        return self.overflows
+
+    @staticmethod
+    def create_fall_trace(data_rate: int, falls: int = 1,
+                          seed: int = 0) -> List[Tuple[float, float, float]]:
+        """
+        This method creates a synthetic trace of falls. Each fall is a few seconds of walking, a
+        short impact above the devices thresholds, and then a few seconds of lying still on its
+        side.
+
+        :param data_rate: Output data rate of the trace (in Hz).
+        :param falls: Amount of falls in the trace.
+        :param seed: Seed of the random noise.
+        :returns: List of X, Y, and Z-Acceleration values.
+        """
+        random = Random(seed)
+        trace = []
+        for _ in range(falls):
+            for _ in range(3 * data_rate):
+                trace.append((random.uniform(-3, 3), random.uniform(-3, 3),
+                              9.80665 + random.uniform(-3, 3)))
+            for _ in range(max(data_rate // 20, 1)):
+                trace.append((random.uniform(19, 30), random.uniform(-15, 15),
+                              random.uniform(-15, 15)))
+            for _ in range(5 * data_rate):
+                trace.append((9.80665 + random.uniform(-0.2, 0.2), random.uniform(-0.2, 0.2),
+                              random.uniform(-0.2, 0.2)))
+        return trace
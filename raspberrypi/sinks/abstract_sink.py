@@ -0,0 +1,58 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the abstract class AbstractSink, containing the methods that are shared
+between the sinks the device publishes its incidents to.
+"""
+from abc import ABC, abstractmethod
+from configparser import ConfigParser
+
+
+class AbstractSink(ABC):
+    """
+    This abstract class represents an abstract sink and implements ABC (Abstract Base Class). It
+    contains the abstract methods to be implemented by each sink.
+    """
+
+    @abstractmethod
+    def connect(self, credentials: ConfigParser):
+        """
+        This method connects the sink, using the devices read credentials.ini.
+
+        :param credentials: ConfigParser object of the devices read credentials.ini.
+        """
+
+    @abstractmethod
+    def disconnect(self):
+        """This method disconnects the sink."""
+
+    @abstractmethod
+    def publish(self, topic: str, payload: str):
+        """
+        This method publishes a payload string to a topic of the sink.
+
+        :param topic: Name of the topic.
+        :param payload: Payload string to be published.
+        """
+
+    @abstractmethod
+    def request_incident_lease(self, lease_size: int) -> int:
+        """
+        This method leases a range of incident IDs from the sink.
+
+        :param lease_size: Amount of incident IDs to lease.
+        :returns: Last incident ID of the leased range.
+        """
+
+    @abstractmethod
+    def request_shards(self, shards: int) -> int:
+        """
+        This method registers the amount of shards the incidents are sharded over with the sink,
+        unless an amount is already registered.
+
+        :param shards: Amount of shards of the device.
+        :returns: Registered amount of shards.
+        """
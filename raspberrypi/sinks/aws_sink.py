@@ -0,0 +1,129 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the AwsSink class, containing the functionality to publish the devices
+incidents to AWS IoT, and lease its incident IDs from DynamoDB.
+"""
+from configparser import ConfigParser
+
+from AWSIoTPythonSDK.MQTTLib import AWSIoTMQTTClient
+from boto3 import client
+from botocore.exceptions import ClientError
+
+from raspberrypi.sinks.abstract_sink import AbstractSink
+
+
+class AwsSink(AbstractSink):
+    """
+    This class represents the AWS sink of the device and implements AbstractSink. It contains a
+    constructor, the methods to configure its MQTT client and request the DynamoDB client, and the
+    implemented abstract methods.
+    """
+
+    def __init__(self):
+        """This constructor instantiates an AwsSink object."""
+        self.client = None
+        self.mqtt_client = None
+
+    def connect(self, credentials: ConfigParser):
+        """
+        This method connects the sink to AWS and AWS IoT using the devices read credentials.ini.
+
+        :param credentials: ConfigParser object of the devices read credentials.ini.
+        """
+        self.client = client("dynamodb",
+                             aws_access_key_id=credentials.get("access", "access_key_id"),
+                             aws_secret_access_key=credentials.get("access", "secret_access_key"),
+                             region_name=credentials.get("access", "region_name"))
+        self.mqtt_configure(credentials)
+        self.mqtt_client.connect()
+
+    def disconnect(self):
+        self.mqtt_client.disconnect()
+
+    def mqtt_configure(self, credentials: ConfigParser):
+        """
+        This method configures the sinks MQTT client to publish messages to AWS IoT, using the
+        devices read credentials.ini. Offline queueing is disabled, as the devices Publisher queues,
+        retries, and spills its messages itself (within bounds).
+
+        :param credentials: ConfigParser object of the devices read credentials.ini.
+        """
+        self.mqtt_client = AWSIoTMQTTClient(credentials.get("mqtt", "iot_thing"))
+        self.mqtt_client.configureEndpoint(credentials.get("mqtt", "iot_endpoint"), 8883)
+        self.mqtt_client.configureCredentials(credentials.get("path", "root_ca"),
+                                              credentials.get("path", "private_key"),
+                                              credentials.get("path", "certificate"))
+        self.mqtt_client.configureOfflinePublishQueueing(0)
+        self.mqtt_client.configureDrainingFrequency(2)
+        self.mqtt_client.configureConnectDisconnectTimeout(10)
+        self.mqtt_client.configureMQTTOperationTimeout(5)
+
+    def publish(self, topic: str, payload: str):
+        """
+        This method publishes a payload string to an AWS IoT topic using the MQTT client.
+
+        :param topic: Name of the topic.
+        :param payload: Payload string to be published.
+        """
+        self.mqtt_client.publish(topic, payload, 1)
+
+    def request_incident_count(self) -> int:
+        """
+        This method requests the count of incident items from the DynamoDB client, so it can seed
+        the incident ID lease item.
+
+        :returns: Count of incident items.
+        """
+        try:
+            response = self.client.get_item(TableName="iotumble_incidents",
+                                            Key={"pk": {"N": "0"}, "sk": {"S": "count"}})
+            count = response["Item"]["msg"]["N"]
+        except ClientError as err:
+            raise err
+        else:
+            return int(count)
+
+    def request_incident_lease(self, lease_size: int) -> int:
+        """
+        This method leases a range of incident IDs by atomically adding its size to the lease item
+        of the DynamoDB client (the highest incident ID leased to any device). The lease item is
+        seeded from the count of incident items the first time it is used.
+
+        :param lease_size: Amount of incident IDs to lease.
+        :returns: Last incident ID of the leased range.
+        """
+        try:
+            response = self.client.update_item(
+                TableName="iotumble_incidents", Key={"pk": {"N": "0"}, "sk": {"S": "lease"}},
+                UpdateExpression="SET msg = if_not_exists(msg, :count) + :size",
+                ExpressionAttributeValues={":count": {"N": str(self.request_incident_count())},
+                                           ":size": {"N": str(lease_size)}},
+                ReturnValues="UPDATED_NEW")
+            lease_end = response["Attributes"]["msg"]["N"]
+        except ClientError as err:
+            raise err
+        else:
+            return int(lease_end)
+
+    def request_shards(self, shards: int) -> int:
+        """
+        This method registers the amount of shards with the shards item of the DynamoDB client,
+        which the program reads to query every shard, unless an amount is already registered.
+
+        :param shards: Amount of shards of the device.
+        :returns: Registered amount of shards.
+        """
+        try:
+            response = self.client.update_item(
+                TableName="iotumble_incidents", Key={"pk": {"N": "0"}, "sk": {"S": "shards"}},
+                UpdateExpression="SET msg = if_not_exists(msg, :shards)",
+                ExpressionAttributeValues={":shards": {"N": str(shards)}}, ReturnValues="ALL_NEW")
+            registered = response["Attributes"]["msg"]["N"]
+        except ClientError as err:
+            raise err
+        else:
+            return int(registered)
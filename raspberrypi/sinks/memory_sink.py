@@ -0,0 +1,124 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the MemorySink class, containing the functionality to keep the devices
+published incidents in memory, so the device can run and be benchmarked offline.
+"""
+from collections import Counter
+from configparser import ConfigParser
+from threading import Lock
+from time import perf_counter, sleep
+
+from raspberrypi.sinks.abstract_sink import AbstractSink
+
+
+class MemorySink(AbstractSink):
+    """
+    This class represents an in-memory sink and implements AbstractSink. It contains a constructor,
+    the implemented abstract methods, the method to request the incident count, and the getter
+    methods for its published messages, lease requests, and partition writes.
+
+    It stands in for the DynamoDB table of the AWS architecture: each published incident increments
+    the count of incident items (as the DynamoDB stream does), and the writes to each partition
+    key are counted, so the load of a key scheme can be compared. An optional latency delays each
+    request, so a fleet of devices sharing the sink can be simulated.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        """
+        This constructor instantiates a MemorySink object.
+
+        :param latency: Time each publish takes (in seconds).
+        """
+        self.latency = latency
+        self.messages = []
+        self.lease_end = 0
+        self.shards = None
+        self.count = 0
+        self.lease_requests = 0
+        self.partition_writes = Counter()
+        self.lock = Lock()
+
+    def connect(self, credentials: ConfigParser):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def publish(self, topic: str, payload: str):
+        """
+        This method records a payload string, its topic, and the performance counter time it was
+        published at, after the latency of the sink. Incident topics increment the incident count,
+        and record the writes of the incident item and its count item (the global count item for
+        "iotumble/incident/{id}", and the shards count item for "iotumble/incident/{shard}/{key}").
+
+        :param topic: Name of the topic.
+        :param payload: Payload string to be published.
+        """
+        if self.latency:
+            sleep(self.latency)
+        with self.lock:
+            self.messages.append((perf_counter(), topic, payload))
+            if topic.startswith("iotumble/incident/"):
+                self.count += 1
+                levels = topic.split("/")
+                self.partition_writes[int(levels[2])] += 1
+                self.partition_writes[int(levels[2]) if len(levels) > 3 else 0] += 1
+
+    def request_incident_count(self) -> int:
+        """
+        This method requests the count of published incidents, after the latency of the sink.
+
+        :returns: Count of incident items.
+        """
+        if self.latency:
+            sleep(self.latency)
+        with self.lock:
+            return self.count
+
+    def request_incident_lease(self, lease_size: int) -> int:
+        if self.latency:
+            sleep(self.latency)
+        with self.lock:
+            self.lease_requests += 1
+            self.partition_writes[0] += 1
+            self.lease_end += lease_size
+            return self.lease_end
+
+    def request_shards(self, shards: int) -> int:
+        if self.latency:
+            sleep(self.latency)
+        with self.lock:
+            self.partition_writes[0] += 1
+            if self.shards is None:
+                self.shards = shards
+            return self.shards
+
+    def get_messages(self) -> list:
+        """
+        This method gets the published messages of the sink.
+
+        :returns: List of the published messages (time, topic, and payload).
+        """
+        with self.lock:
+            return list(self.messages)
+
+    def get_lease_requests(self) -> int:
+        """
+        This method gets the amount of incident ID leases requested from the sink.
+
+        :returns: Amount of lease requests.
+        """
+        return self.lease_requests
+
+    def get_partition_writes(self) -> Counter:
+        """
+        This method gets the amount of writes to each partition key of the sink.
+
+        :returns: Counter of the writes to each partition key.
+        """
+        with self.lock:
+            return Counter(self.partition_writes)
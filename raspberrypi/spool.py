@@ -0,0 +1,233 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the Spool class, containing the functionality to keep the devices incident
+windows and timestamp history in a memory-mapped file, so they survive a crash or reboot.
+"""
+from mmap import PAGESIZE, mmap
+from os import path
+from struct import Struct
+from threading import Lock
+from typing import Tuple
+
+from raspberrypi.ring_buffer import RingBuffer
+
+
+class Spool:
+    """
+    This class represents a crash-safe spool of incident windows. It contains a constructor, the
+    methods to open and flush its file, the methods to append, read, and acknowledge incidents,
+    and the getter methods for its history and pending incidents.
+
+    The spool file is memory-mapped, and holds a header, the history (the columns of the devices
+    timestamp RingBuffer), and a fixed amount of incident slots. Incidents are appended to the
+    slots in turn, as a log that wraps around, and only their incident ID and state are written
+    again. Recording a timestamp is a store to mapped memory, so it adds no system calls; only
+    appending, numbering, and acknowledging an incident flush its pages to disk. An incident stays
+    pending until it has been acknowledged, so pending incidents found when the spool is opened
+    were never published. Incidents are appended by the device while the Publisher reads them, so
+    a lock is held across each access of a slot, and a window is never read with the header of
+    the incident that overwrote it (or the reverse).
+    """
+    magic = b"ITSP"
+    version = 1
+    header = Struct("<4sHHII")
+    slot_header = Struct("<QQII")
+    header_size = 64
+    free_state = 0
+    pending_state = 1
+
+    def __init__(self, spool_path: str, slots: int = 32):
+        """
+        This constructor instantiates a Spool object.
+
+        :param spool_path: Name of the path of the spool file.
+        :param slots: Amount of incident windows the spool holds.
+        """
+        self.spool_path = spool_path
+        self.slots = slots
+        self.capacity = 0
+        self.column_size = 0
+        self.history_size = 0
+        self.slot_size = 0
+        self.memory = None
+        self.next_sequence = 1
+        self.dropped = 0
+        self.lock = Lock()
+
+    def open(self, capacity: int):
+        """
+        This method opens and maps the spool file, creating it if it does not exist, and clearing
+        it if it was created for another window length or amount of slots.
+
+        :param capacity: Maximum amount of timestamps in an incident window.
+        """
+        keys = len(RingBuffer.keys)
+        self.capacity = capacity
+        self.column_size = 8 * capacity
+        self.history_size = self.round_pages(self.header_size + 2 * keys * self.column_size)
+        self.slot_size = self.round_pages(self.header_size + keys * self.column_size)
+        file_size = self.history_size + self.slots * self.slot_size
+        exists = path.exists(self.spool_path) and path.getsize(self.spool_path) == file_size
+        with open(self.spool_path, "r+b" if exists else "w+b") as file:
+            if not exists:
+                file.truncate(file_size)
+            self.memory = mmap(file.fileno(), file_size)
+        header = self.header.pack(self.magic, self.version, keys, capacity, self.slots)
+        if self.memory[:self.header.size] != header:
+            self.memory[:] = bytes(file_size)
+            self.memory[:self.header.size] = header
+            self.memory.flush()
+        sequences = [self.read_slot_header(slot)[0] for slot in range(self.slots)]
+        self.next_sequence = max(sequences) + 1
+
+    def flush(self):
+        """This method flushes the whole spool file (including the history) to disk."""
+        self.memory.flush()
+
+    def append(self, timestamps: RingBuffer) -> int:
+        """
+        This method appends the timestamp window of a RingBuffer to the next slot of the spool as
+        a pending incident, overwriting (and counting as dropped) the incident of that slot if it
+        is still pending. The window is written before the slot header, so a slot is never left
+        holding half of a window.
+
+        :param timestamps: Instance of a RingBuffer object.
+        :returns: Sequence number of the appended incident.
+        """
+        with self.lock:
+            sequence = self.next_sequence
+            slot = (sequence - 1) % self.slots
+            offset = self.get_offset(slot)
+            if self.read_slot_header(slot)[2] == self.pending_state:
+                self.dropped += 1
+            length = len(timestamps)
+            with memoryview(self.memory) as memory:
+                for i, key in enumerate(RingBuffer.keys):
+                    start = offset + self.header_size + i * self.column_size
+                    with timestamps.last(key, length).cast("B") as values:
+                        memory[start:start + len(values)] = values
+            self.slot_header.pack_into(self.memory, offset, sequence, 0, self.pending_state,
+                                       length)
+            self.memory.flush(offset, self.slot_size)
+            self.next_sequence += 1
+        return sequence
+
+    def read(self, sequence: int) -> Tuple[int, tuple]:
+        """
+        This method reads the incident ID and timestamp window of an appended incident.
+
+        :param sequence: Sequence number of the incident.
+        :returns: Tuple of the incident ID (0 if it has none) and the x, y, z, svm, and ep value
+        lists of the window (oldest first).
+        :raises KeyError: If the incident has been overwritten.
+        """
+        with self.lock:
+            slot = self.find_slot(sequence)
+            _, incident_id, _, length = self.read_slot_header(slot)
+            start = self.get_offset(slot) + self.header_size
+            end = start + self.slot_size - self.header_size
+            with memoryview(self.memory)[start:end] as memory, memory.cast("d") as data:
+                window = tuple(data[i * self.capacity:i * self.capacity + length].tolist()
+                               for i in range(len(RingBuffer.keys)))
+        return incident_id, window
+
+    def set_incident_id(self, sequence: int, incident_id: int):
+        """
+        This method records the incident ID allocated to an appended incident, so it keeps the
+        same ID if it is published again.
+
+        :param sequence: Sequence number of the incident.
+        :param incident_id: Allocated incident ID.
+        """
+        with self.lock:
+            offset = self.get_offset(self.find_slot(sequence))
+            self.memory[offset + 8:offset + 16] = incident_id.to_bytes(8, "little")
+            self.memory.flush(offset, PAGESIZE)
+
+    def acknowledge(self, sequence: int):
+        """
+        This method acknowledges an appended incident once it has been published, freeing its
+        slot. An incident that has already been overwritten is ignored.
+
+        :param sequence: Sequence number of the incident.
+        """
+        with self.lock:
+            try:
+                offset = self.get_offset(self.find_slot(sequence))
+            except KeyError:
+                return
+            self.memory[offset + 16:offset + 20] = self.free_state.to_bytes(4, "little")
+            self.memory.flush(offset, PAGESIZE)
+
+    def find_slot(self, sequence: int) -> int:
+        """
+        This method finds the slot of an appended incident.
+
+        :param sequence: Sequence number of the incident.
+        :returns: Index of the slot.
+        :raises KeyError: If the incident has been overwritten.
+        """
+        slot = (sequence - 1) % self.slots
+        if self.read_slot_header(slot)[0] != sequence:
+            raise KeyError(f"Incident {sequence} is no longer in the spool!")
+        return slot
+
+    def read_slot_header(self, slot: int) -> Tuple[int, int, int, int]:
+        """
+        This method reads the header of a slot.
+
+        :param slot: Index of the slot.
+        :returns: Tuple of the slots sequence number, incident ID, state, and window length.
+        """
+        return self.slot_header.unpack_from(self.memory, self.get_offset(slot))
+
+    def get_offset(self, slot: int) -> int:
+        """
+        This method gets the offset of a slot within the spool file.
+
+        :param slot: Index of the slot.
+        :returns: Offset of the slot (in bytes).
+        """
+        return self.history_size + slot * self.slot_size
+
+    def get_history(self) -> memoryview:
+        """
+        This method gets a view of the history of the spool file, to be used as the storage of
+        the devices timestamp RingBuffer.
+
+        :returns: Memoryview of the history.
+        """
+        return memoryview(self.memory)[self.header_size:self.history_size]
+
+    def get_pending(self) -> list:
+        """
+        This method gets the sequence numbers of the pending incidents, oldest first.
+
+        :returns: List of the pending sequence numbers.
+        """
+        with self.lock:
+            headers = [self.read_slot_header(slot) for slot in range(self.slots)]
+        return sorted(header[0] for header in headers if header[2] == self.pending_state)
+
+    def get_dropped(self) -> int:
+        """
+        This method gets the amount of pending incidents that were overwritten.
+
+        :returns: Amount of dropped incidents.
+        """
+        return self.dropped
+
+    @staticmethod
+    def round_pages(size: int) -> int:
+        """
+        This method rounds a size up to a whole amount of memory pages, so each region of the
+        spool file can be flushed on its own.
+
+        :param size: Size (in bytes).
+        :returns: Rounded size (in bytes).
+        """
+        return -(-size // PAGESIZE) * PAGESIZE
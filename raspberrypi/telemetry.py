@@ -0,0 +1,145 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the Telemetry class, containing the functionality to aggregate the devices
+timestamps into low-bandwidth telemetry intervals.
+"""
+from time import monotonic, time
+
+import numpy as np
+
+from raspberrypi.scheduler import Scheduler
+
+
+class Telemetry:
+    """
+    This class represents the telemetry of the device. It contains a constructor, the methods to
+    record SVM values and impacts, and the method to advance and close its intervals.
+
+    Each interval is aggregated incrementally (a sample count, the SVM minimum, maximum, and sum,
+    and the amount of SVM threshold events and impacts), so no timestamps are kept. Closed
+    intervals are batched, and a batch is returned once it is full, to be published as one
+    message. An SVM threshold event is counted each time the SVM rises above the threshold, so
+    near misses that do not reach the acceleration threshold are also seen.
+    """
+    svm_threshold = 20
+
+    def __init__(self, scheduler: Scheduler, interval_seconds: int, batch_size: int):
+        """
+        This constructor instantiates a Telemetry object.
+
+        :param scheduler: Instance of the devices Scheduler object.
+        :param interval_seconds: Length of each interval (in seconds, 0 to disable telemetry).
+        :param batch_size: Amount of intervals published in each message.
+        """
+        self.scheduler = scheduler
+        self.interval_ticks = interval_seconds * scheduler.get_sample_rate()
+        self.batch_size = batch_size
+        self.batch = []
+        self.ticks = 0
+        self.above = False
+        self.start = monotonic()
+        self.overruns = 0
+        self.missed = 0
+        self.count = 0
+        self.svm_min = float("inf")
+        self.svm_max = float("-inf")
+        self.svm_total = 0.0
+        self.events = 0
+        self.impacts = 0
+
+    def record(self, svm: float):
+        """
+        This method records the SVM value of a timestamp to the current interval.
+
+        :param svm: Signal Vector Magnitude value.
+        """
+        self.count += 1
+        self.svm_total += svm
+        if svm < self.svm_min:
+            self.svm_min = svm
+        if svm > self.svm_max:
+            self.svm_max = svm
+        above = svm > self.svm_threshold
+        if above and not self.above:
+            self.events += 1
+        self.above = above
+
+    def record_batch(self, svm_data: np.ndarray):
+        """
+        This method records the SVM values of a batch of timestamps to the current interval, with
+        one vectorized operation per statistic.
+
+        :param svm_data: Array of Signal Vector Magnitude values.
+        """
+        if not svm_data.size:
+            return
+        self.count += svm_data.size
+        self.svm_total += float(svm_data.sum())
+        self.svm_min = min(self.svm_min, float(svm_data.min()))
+        self.svm_max = max(self.svm_max, float(svm_data.max()))
+        above = svm_data > self.svm_threshold
+        rising = np.count_nonzero(above[1:] & ~above[:-1])
+        self.events += int(rising) + int(above[0] and not self.above)
+        self.above = bool(above[-1])
+
+    def record_impact(self):
+        """This method records an impact (both thresholds reached) to the current interval."""
+        self.impacts += 1
+
+    def advance(self, ticks: int) -> list:
+        """
+        This method advances the current interval by the amount of elapsed sample periods. Once
+        it has elapsed, the interval is closed and added to the batch, and a full batch is
+        returned. If a stall spans several intervals, one interval covering the whole stall is
+        closed (its seconds and achieved sample rate show the stall), so the next interval starts
+        at an interval boundary rather than carrying the surplus periods.
+
+        :param ticks: Amount of sample periods that have elapsed since the previous reading.
+        :returns: List of the closed intervals (None if the batch is not full).
+        """
+        if not self.interval_ticks:
+            return None
+        self.ticks += ticks
+        if self.ticks < self.interval_ticks:
+            return None
+        self.ticks %= self.interval_ticks
+        self.batch.append(self.close())
+        if len(self.batch) < self.batch_size:
+            return None
+        batch = self.batch
+        self.batch = []
+        return batch
+
+    def close(self) -> dict:
+        """
+        This method closes the current interval, creating its aggregates (epoch time, seconds,
+        samples, achieved sample rate, SVM minimum, maximum, and mean, SVM threshold events,
+        impacts, and the Schedulers overruns and missed deadlines), and starts the next one.
+
+        :returns: Dictionary of the intervals aggregates.
+        """
+        now = monotonic()
+        seconds = now - self.start
+        overruns = self.scheduler.get_overruns()
+        missed = self.scheduler.get_missed_deadlines()
+        interval = {"ep": time(), "s": seconds, "n": self.count,
+                    "rate": self.count / seconds if seconds else 0.0,
+                    "svm_min": self.svm_min if self.count else None,
+                    "svm_max": self.svm_max if self.count else None,
+                    "svm_mean": self.svm_total / self.count if self.count else None,
+                    "events": self.events, "impacts": self.impacts,
+                    "overruns": overruns - self.overruns, "missed": missed - self.missed}
+        self.start = now
+        self.overruns = overruns
+        self.missed = missed
+        self.count = 0
+        self.svm_min = float("inf")
+        self.svm_max = float("-inf")
+        self.svm_total = 0.0
+        self.events = 0
+        self.impacts = 0
+        return interval
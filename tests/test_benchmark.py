@@ -0,0 +1,22 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the Benchmark class."""
+import pytest
+
+from raspberrypi.benchmark import Benchmark
+from raspberrypi.sensors.replay_sensor import ReplaySensor
+from raspberrypi.sensors.simulated_sensor import SimulatedSensor
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_detection_delay_is_measured(batched):
+    benchmark = Benchmark(ReplaySensor(100, SimulatedSensor.create_fall_trace(100, 3), batched))
+    capture = benchmark.device.post_threshold_length / 100
+    report = benchmark.run()
+    assert report["published"] == 3
+    assert capture <= report["detection_delay_p50"] <= report["detection_delay_max"]
+    assert report["detection_delay_max"] < capture + 1
+    assert report["publish_latency_max"] < report["detection_delay_max"]
@@ -0,0 +1,115 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the tests of the BulkExport class and its exporters, exporting the items of
+an in-memory DynamoDB table. BulkExport streams its items from a Session, so they are skipped
+without boto3.
+"""
+from csv import DictReader
+from os import listdir, path, walk
+
+import pytest
+
+pytest.importorskip("boto3")
+# pylint: disable=wrong-import-position
+from iotumble.models.bulk_export import BulkExport
+from tests.test_session import create_legacy_item, create_session, create_sharded_item
+
+
+def create_items() -> list:
+    """
+    This function creates the incident items of the tests: three sharded incidents of two devices,
+    two legacy incidents (and their count item), and an incident with no timestamps.
+
+    :returns: List of the incident items.
+    """
+    items = [create_sharded_item(index % 2 + 1, index, f"pi{index % 2}") for index in range(3)]
+    items += [create_legacy_item(incident_id) for incident_id in (1, 2)]
+    items.append({"pk": 0, "sk": "count", "msg": 3})
+    items.append({"pk": 3, "sk": "incident", "msg": {"peak": 0.0}})
+    return items
+
+
+def read_csv(csv_path: str) -> list:
+    """
+    This function reads the rows of an exported CSV file.
+
+    :param csv_path: Name of the CSV path.
+    :returns: List of the dictionaries of each row.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as file:
+        return list(DictReader(file))
+
+
+def test_csv_export(tmp_path):
+    export_path = str(tmp_path / "Incidents")
+    progress = []
+    bulk_export = BulkExport(create_session(create_items()),
+                             BulkExport.load_exporter("csv", export_path), batch_rows=3)
+    stats = bulk_export.run(progress=lambda incidents, rows: progress.append((incidents, rows)))
+    assert stats == {"incidents": 5, "rows": 10, "skipped": 1, "path": f"{export_path}.csv"}
+    assert progress[-1] == (5, 10)
+    rows = read_csv(stats["path"])
+    assert len(rows) == 10
+    assert {row["Device"] for row in rows} == {"pi0", "pi1", BulkExport.legacy_device}
+    assert [row["Timestamp ID"] for row in rows[:2]] == ["0", "1"]
+
+
+def test_time_range(tmp_path):
+    export_path = str(tmp_path / "Incidents")
+    bulk_export = BulkExport(create_session(create_items()),
+                             BulkExport.load_exporter("csv", export_path))
+    stats = bulk_export.run(1650000000.5, 1650000002.5)
+    rows = read_csv(stats["path"])
+    assert stats["incidents"] == 4
+    assert {row["Incident ID"] for row in rows} == {"2-1650000001010-1-pi1",
+                                                     "1-1650000002010-2-pi0", "1", "2"}
+
+
+def fail_after_first_page(session):
+    """
+    This function makes the item stream of a Session fail after its first page.
+
+    :param session: Instance of a Session object.
+    """
+    request_incident_items = session.request_incident_items
+
+    def request_failing_items(*args):
+        pages = request_incident_items(*args)
+        yield next(pages)
+        raise ConnectionError("The connection was lost!")
+
+    session.request_incident_items = request_failing_items
+
+
+@pytest.mark.parametrize("export_format", ["csv", "parquet"])
+def test_failed_export_is_discarded(tmp_path, export_format):
+    if export_format == "parquet":
+        pytest.importorskip("pyarrow")
+    (tmp_path / "Earlier.csv").write_text("kept", encoding="utf-8")
+    session = create_session(create_items())
+    fail_after_first_page(session)
+    bulk_export = BulkExport(session, BulkExport.load_exporter(
+        export_format, str(tmp_path / "Incidents")), batch_rows=1)
+    with pytest.raises(ConnectionError):
+        bulk_export.run()
+    assert listdir(tmp_path) == ["Earlier.csv"]
+
+
+def test_parquet_export(tmp_path):
+    dataset = pytest.importorskip("pyarrow.dataset")
+    export_path = str(tmp_path / "Incidents")
+    bulk_export = BulkExport(create_session(create_items()),
+                             BulkExport.load_exporter("parquet", export_path), batch_rows=3)
+    stats = bulk_export.run()
+    assert stats["path"] == export_path and stats["rows"] == 10
+    table = dataset.dataset(export_path, partitioning="hive").to_table()
+    assert table.num_rows == 10
+    assert set(table.column("device").to_pylist()) == {"pi0", "pi1", BulkExport.legacy_device}
+    partitions = {path.relpath(directory, export_path) for directory, _, files in walk(export_path)
+                  if files}
+    assert partitions == {path.join(f"device={device}", "date=2022-04-15")
+                          for device in ("pi0", "pi1", BulkExport.legacy_device)}
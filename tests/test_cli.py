@@ -0,0 +1,70 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the tests of the Cli class, against an in-memory DynamoDB table. The Cli
+class requests incidents with a Session, so they are skipped without boto3.
+"""
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+
+pytest.importorskip("boto3")
+# pylint: disable=wrong-import-position
+from iotumble import cli as cli_module
+from iotumble.cli import Cli
+from tests.test_session import create_legacy_item, create_session, create_sharded_item
+
+
+def create_cli(tmp_path) -> Cli:
+    """
+    This function creates a Cli whose threads share a Session connected to a FakeTable of three
+    sharded incidents and two legacy incidents.
+
+    :param tmp_path: Temporary directory of the test.
+    :returns: Instance of a Cli object.
+    """
+    cli = Cli(str(tmp_path / "credentials.ini"), workers=2, cached=False)
+    items = [create_sharded_item(index % 2 + 1, index, f"pi{index % 2}") for index in range(3)]
+    items += [create_legacy_item(incident_id) for incident_id in (1, 2)]
+    items.append({"pk": 0, "sk": "count", "msg": 2})
+    session = create_session(items)
+    cli.get_session = lambda: session
+    return cli
+
+
+def test_list_incidents(tmp_path):
+    cli = create_cli(tmp_path)
+    assert [incident["incident_id"] for incident in cli.list_incidents(4)] == \
+        ["1-1650000002010-2-pi0", "2-1650000001010-1-pi1", "1-1650000000010-0-pi0", "2"]
+    assert len(cli.list_incidents(0)) == 5
+
+
+def test_summarise_and_show_incidents(tmp_path):
+    cli = create_cli(tmp_path)
+    summaries = cli.summarise_incidents(["2", "9", "2-1650000001010-1-pi1"])
+    assert [summary["incident_id"] for summary in summaries] == ["2", "2-1650000001010-1-pi1"]
+    assert summaries[0]["timestamps"] == 2 and summaries[0]["max_svm"] == 12.0
+    rows = cli.show_incident("1")
+    assert [row["timestamp_id"] for row in rows] == [0, 1] and rows[1]["svm"] == 11.0
+    with pytest.raises(LookupError):
+        cli.show_incident("9")
+
+
+def test_parse_time():
+    assert Cli.parse_time("1650000000.5") == 1650000000.5
+    assert Cli.parse_time("2022-04-15T05:20:00+00:00") == \
+        datetime(2022, 4, 15, 5, 20, tzinfo=timezone.utc).timestamp()
+    with pytest.raises(ValueError):
+        Cli.parse_time("yesterday")
+
+
+def test_print_csv(monkeypatch):
+    output = StringIO()
+    monkeypatch.setattr(cli_module, "stdout", output)
+    Cli.print_rows([{"incident_id": "1", "peak": 11.0}, {"incident_id": "2", "peak": 12.0}],
+                   "csv")
+    assert output.getvalue() == "incident_id,peak\n1,11.0\n2,12.0\n"
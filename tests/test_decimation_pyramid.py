@@ -0,0 +1,105 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the DecimationPyramid class."""
+import numpy as np
+import pytest
+
+from iotumble.models.decimation_pyramid import DecimationPyramid
+from iotumble.models.incident import Incident
+
+
+def create_series(length: int, seed: int = 0) -> np.ndarray:
+    """
+    This function creates a random series of values, like the SVM of an incident.
+
+    :param length: Amount of values.
+    :param seed: Seed of the random values.
+    :returns: Array of the values of the series.
+    """
+    return np.random.default_rng(seed).normal(1.0, 0.5, length)
+
+
+def check_selection(data: np.ndarray, indices: np.ndarray, start: int, end: int, points: int):
+    """
+    This function checks that the selected indices of a range are in time order, within the
+    range, bounded by the amount of points, and include the minimum and maximum of the range.
+
+    :param data: Array of the values of the series.
+    :param indices: Array of the selected indices.
+    :param start: Index of the first value of the range.
+    :param end: Index after the last value of the range.
+    :param points: Amount of points the range is plotted at.
+    """
+    assert np.all(np.diff(indices) >= 0)
+    assert np.all((indices >= start) & (indices < end))
+    if end - start <= 2 * points:
+        assert indices.tolist() == list(range(start, end))
+    else:
+        assert len(indices) <= 2 * points + 4
+    if end > start:
+        values = data[start:end]
+        assert data[indices].max() == values.max()
+        assert data[indices].min() == values.min()
+
+
+@pytest.mark.parametrize("length", [1, 2, 3, 1000, 1024, 4097])
+@pytest.mark.parametrize("points", [1, 7, 100])
+def test_select_whole_series(length, points):
+    data = create_series(length)
+    pyramid = DecimationPyramid(data)
+    check_selection(data, pyramid.select(0, length, points), 0, length, points)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_select_ranges(seed):
+    rng = np.random.default_rng(seed)
+    data = create_series(5000, seed)
+    pyramid = DecimationPyramid(data)
+    start, end = sorted(rng.integers(0, 5001, 2))
+    points = int(rng.integers(1, 200))
+    check_selection(data, pyramid.select(start, end, points), start, end, points)
+
+
+def test_select_keeps_single_peak():
+    data = np.ones(10000)
+    data[6543] = 9.0
+    data[1234] = -9.0
+    indices = DecimationPyramid(data).select(0, len(data), 50)
+    assert 6543 in indices and 1234 in indices
+
+
+def test_select_empty_and_single():
+    pyramid = DecimationPyramid(create_series(100))
+    assert len(pyramid.select(40, 40, 10)) == 0
+    assert pyramid.select(40, 41, 10).tolist() == [40]
+    assert len(DecimationPyramid(np.empty(0)).select(0, 0, 10)) == 0
+
+
+def test_select_extremes():
+    data = np.array([3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0])
+    pyramid = DecimationPyramid(data)
+    assert pyramid.select_extremes(0, 4).tolist() == [1, 2]
+    assert pyramid.select_extremes(5, 6).tolist() == [5]
+    assert len(pyramid.select_extremes(6, 6)) == 0
+
+
+def test_reduce():
+    data = np.array([3.0, 1.0, 4.0, 1.0, 5.0])
+    indices = np.arange(5)
+    assert DecimationPyramid.reduce(data, indices, np.less_equal).tolist() == [1, 3, 4]
+    assert DecimationPyramid.reduce(data, indices, np.greater_equal).tolist() == [0, 2, 4]
+
+
+def test_incident_decimated_keeps_peak():
+    length = 3000
+    columns = np.zeros((5, length))
+    columns[3] = create_series(length)
+    columns[3, 2100] = 12.0
+    columns[4] = 1650000000.0 + np.arange(length) / 100
+    incident = Incident("1", columns)
+    indices = incident.get_decimated("svm", 0.0, 30.0, 100)
+    assert 2100 in indices
+    assert len(indices) <= 2 * 100 + 4
@@ -0,0 +1,75 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the Device class, replaying traces offline."""
+import pytest
+
+from raspberrypi.device import Device
+from raspberrypi.sensors.replay_sensor import ReplaySensor
+from raspberrypi.sensors.simulated_sensor import SimulatedSensor
+from raspberrypi.sinks.memory_sink import MemorySink
+from raspberrypi.spool import Spool
+
+
+def create_device(tmp_path, trace: list, batched: bool) -> Device:
+    """
+    This function creates a Device that replays a trace at 100 Hz, without sleeping, into a
+    MemorySink, with its Spool in a temporary directory.
+
+    :param tmp_path: Temporary directory of the test.
+    :param trace: List of X, Y, and Z-Acceleration values to be replayed.
+    :param batched: Boolean on if the trace is replayed a full FIFO per drain.
+    :returns: Instance of a Device object.
+    """
+    device = Device(ReplaySensor(100, trace, batched), MemorySink(), False,
+                    Spool(str(tmp_path / "incident_spool.bin")))
+    device.incident_counter.state_path = str(tmp_path / "incident_ids.ini")
+    return device
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_telemetry_intervals_hold_interval_samples(tmp_path, batched):
+    device = create_device(tmp_path, [ReplaySensor.resting] * 3500, batched)
+    while not device.sensor.is_exhausted():
+        device.read_accelerometer()
+    intervals = device.telemetry.batch
+    assert len(intervals) == 3
+    assert all(abs(interval["n"] - 1000) < ReplaySensor.fifo_depth for interval in intervals)
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_falls_are_published(tmp_path, batched):
+    device = create_device(tmp_path, SimulatedSensor.create_fall_trace(100, 3), batched)
+    device.connect()
+    while not device.sensor.is_exhausted():
+        device.read_accelerometer()
+    device.disconnect()
+    topics = [topic for _, topic, _ in device.sink.get_messages()
+              if topic.startswith("iotumble/incident/")]
+    assert topics == ["iotumble/incident/1", "iotumble/incident/2", "iotumble/incident/3"]
+    assert not device.spool.get_pending()
+
+
+def test_sharded_keys_are_time_ordered(tmp_path):
+    device = create_device(tmp_path, SimulatedSensor.create_fall_trace(100, 3), True)
+    device.key_scheme = "sharded"
+    device.connect()
+    while not device.sensor.is_exhausted():
+        device.read_accelerometer()
+    device.disconnect()
+    prefix = f"iotumble/incident/{device.get_shard()}/"
+    keys = [topic[len(prefix):] for _, topic, _ in device.sink.get_messages()
+            if topic.startswith(prefix)]
+    assert len(keys) == 3 and keys == sorted(keys)
+    assert all(key.endswith(f"-{device.device_id}") for key in keys)
+    assert device.sink.request_shards(1) == device.shards
+
+
+def test_shard_mismatch_is_refused(tmp_path):
+    device = create_device(tmp_path, [], True)
+    device.key_scheme = "sharded"
+    device.sink.request_shards(device.shards * 2)
+    with pytest.raises(ValueError):
+        device.connect()
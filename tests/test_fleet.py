@@ -0,0 +1,22 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the Fleet class."""
+import pytest
+
+from raspberrypi.fleet import Fleet
+from raspberrypi.sensors.simulated_sensor import SimulatedSensor
+
+
+def test_lease_scheme_has_no_collisions():
+    traces = [SimulatedSensor.create_fall_trace(100, 2) for _ in range(4)]
+    report = Fleet(traces, 100, "lease", workers=4).run()
+    assert report["devices"] == 4 and report["published"] == 8
+    assert report["collisions"] == 0 and report["failed"] == 0
+
+
+def test_unknown_scheme():
+    with pytest.raises(ValueError):
+        Fleet([], 100, "random")
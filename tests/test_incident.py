@@ -0,0 +1,42 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the Incident class."""
+import numpy as np
+
+from iotumble.models.incident import Incident
+
+
+def create_fall() -> Incident:
+    """
+    This function creates the Incident of a fall sampled at 8 Hz: resting, falling freely for five
+    timestamps, an impact of two timestamps, and resting again.
+
+    :returns: Instance of an Incident object.
+    """
+    svm = np.array([9.8] * 10 + [2.0] * 5 + [30.0, 35.0] + [9.8] * 12)
+    zeros = np.zeros(len(svm))
+    return Incident("1", [zeros, zeros, svm, svm, 1650000000.0 + np.arange(len(svm)) / 8])
+
+
+def test_summary():
+    incident = create_fall()
+    summary = incident.get_summary()
+    assert (summary["peak_svm"], summary["peak_index"], summary["peak_time"]) == \
+        (35.0, 16, 2.0)
+    assert summary["min"]["svm"] == 2.0 and summary["max"]["z"] == 35.0
+    assert summary["mean"]["x"] == 0.0 and summary["std"]["y"] == 0.0
+    assert summary["impact_duration"] == 0.25
+    assert summary["free_fall_duration"] == 0.625
+    assert summary["stillness"] == 1.0
+    assert incident.get_summary() is summary
+
+
+def test_summary_of_peak_at_end():
+    incident = Incident("2", [[0.0, 0.0], [0.0, 0.0], [9.8, 30.0], [9.8, 30.0],
+                              [1650000000.0, 1650000000.5]])
+    summary = incident.get_summary()
+    assert summary["peak_index"] == 1 and summary["stillness"] is None
+    assert summary["impact_duration"] == 0.0 and summary["free_fall_duration"] == 0.0
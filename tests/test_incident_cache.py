@@ -0,0 +1,108 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the IncidentCache class."""
+from configparser import ConfigParser
+
+import numpy as np
+
+from iotumble.models.incident import Incident
+from iotumble.models.incident_cache import IncidentCache
+
+LENGTH = 50
+
+
+def create_incident(incident_id: str) -> Incident:
+    """
+    This function creates an Incident of random timestamps, sampled at 100 Hz.
+
+    :param incident_id: ID of the Incident.
+    :returns: Instance of an Incident object.
+    """
+    columns = np.random.default_rng(int(incident_id)).normal(0, 10, (5, LENGTH))
+    columns[4] = 1650000000.0 + np.arange(LENGTH) * 0.01
+    return Incident(incident_id, columns)
+
+
+def get_size() -> int:
+    """
+    This function gets the encoded size of an Incident of the test length.
+
+    :returns: Encoded size of the Incident (in bytes).
+    """
+    return len(IncidentCache.encode(create_incident("1")))
+
+
+def test_encode_round_trip():
+    incident = create_incident("7")
+    decoded = IncidentCache.decode("7", IncidentCache.encode(incident))
+    np.testing.assert_array_equal(decoded.get_columns(), incident.get_columns())
+    np.testing.assert_array_equal(decoded.get_timestamp_ids(), incident.get_timestamp_ids())
+
+
+def test_memory_evicts_least_recently_used():
+    cache = IncidentCache(memory_size=2 * get_size())
+    for incident_id in ("1", "2"):
+        cache.put(create_incident(incident_id))
+    assert cache.get("1") is not None
+    cache.put(create_incident("3"))
+    assert cache.get("2") is None
+    assert cache.get("1") is not None and cache.get("3") is not None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1 and stats["memory_incidents"] == 2
+    assert stats["misses"] == 1 and stats["hits"] == 3
+
+
+def test_database_survives_reopen(tmp_path):
+    cache_path = str(tmp_path / "incident_cache.db")
+    cache = IncidentCache(cache_path)
+    cache.open()
+    incident = create_incident("4")
+    cache.put(incident)
+    cache.close()
+    reopened = IncidentCache(cache_path)
+    reopened.open()
+    assert reopened.contains("4") and not reopened.contains("5")
+    cached = reopened.get("4")
+    np.testing.assert_array_equal(cached.get_columns(), incident.get_columns())
+    assert reopened.get_stats()["disk_hits"] == 1
+    assert reopened.get("4") is cached
+    reopened.close()
+
+
+def test_database_evicts_least_recently_opened(tmp_path):
+    cache = IncidentCache(str(tmp_path / "incident_cache.db"), memory_size=0,
+                          disk_size=2 * get_size())
+    cache.open()
+    for incident_id in ("1", "2"):
+        cache.put(create_incident(incident_id))
+    assert cache.get("1") is not None
+    cache.put(create_incident("3"))
+    assert [cache.contains(incident_id) for incident_id in ("1", "2", "3")] == [True, False, True]
+    assert cache.get_stats()["disk_bytes"] == 2 * get_size()
+    cache.close()
+
+
+def test_summaries_survive_reopen(tmp_path):
+    cache_path = str(tmp_path / "incident_cache.db")
+    cache = IncidentCache(cache_path, disk_size=0)
+    cache.open()
+    incident = create_incident("5")
+    cache.put(incident)
+    cache.close()
+    reopened = IncidentCache(cache_path)
+    reopened.open()
+    assert not reopened.contains("5")
+    assert reopened.get_summaries(["5", "6"]) == {"5": incident.get_summary()}
+    reopened.close()
+
+
+def test_from_config():
+    credentials = ConfigParser()
+    credentials.read_string("[cache]\ncache_path =\nmemory_size = 1\ndisk_size = 2\n")
+    cache = IncidentCache.from_config(credentials)
+    assert (cache.cache_path, cache.memory_size, cache.disk_size) == ("", 1 << 20, 2 << 20)
+    defaults = IncidentCache.from_config(ConfigParser())
+    assert defaults.cache_path == "incident_cache.db" and defaults.memory_size == 16 << 20
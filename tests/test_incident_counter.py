@@ -0,0 +1,78 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the IncidentCounter class."""
+from threading import Lock, Thread
+
+from raspberrypi.incident_counter import IncidentCounter
+
+
+class FakeLease:
+    """
+    This class represents the lease item of the DynamoDB table, shared by every IncidentCounter
+    of a test, as the highest incident ID leased to any device.
+    """
+
+    def __init__(self):
+        """This constructor instantiates a FakeLease object."""
+        self.end_id = 0
+        self.requests = []
+        self.lock = Lock()
+
+    def request_lease(self, lease_size: int) -> int:
+        """
+        This method leases a range of incident IDs, as the atomic update of the lease item does.
+
+        :param lease_size: Amount of incident IDs to lease.
+        :returns: Last incident ID of the leased range.
+        """
+        with self.lock:
+            self.end_id += lease_size
+            self.requests.append(self.end_id)
+            return self.end_id
+
+
+def test_allocates_from_leased_ranges(tmp_path):
+    lease = FakeLease()
+    first = IncidentCounter(str(tmp_path / "first.ini"), 3, lease.request_lease)
+    second = IncidentCounter(str(tmp_path / "second.ini"), 3, lease.request_lease)
+    assert [first.allocate(), second.allocate(), first.allocate()] == [1, 4, 2]
+    assert first.get_remaining() == 1
+    assert [first.allocate(), first.allocate()] == [3, 7]
+    assert lease.requests == [3, 6, 9]
+
+
+def test_restart_resumes_unused_ids(tmp_path):
+    lease = FakeLease()
+    state_path = str(tmp_path / "incident_ids.ini")
+    counter = IncidentCounter(state_path, 10, lease.request_lease)
+    assert [counter.allocate() for _ in range(4)] == [1, 2, 3, 4]
+    restarted = IncidentCounter(state_path, 10, lease.request_lease)
+    restarted.load()
+    restarted.lease()
+    assert restarted.allocate() == 5
+    assert restarted.get_remaining() == 5
+    assert lease.requests == [10]
+
+
+def test_load_without_state(tmp_path):
+    counter = IncidentCounter(str(tmp_path / "missing.ini"), 10, FakeLease().request_lease)
+    counter.load()
+    assert counter.get_remaining() == 0
+
+
+def test_concurrent_allocations_are_unique(tmp_path):
+    lease = FakeLease()
+    counter = IncidentCounter(str(tmp_path / "incident_ids.ini"), 7, lease.request_lease)
+    allocated = [[] for _ in range(8)]
+    threads = [Thread(target=lambda ids: ids.extend(counter.allocate() for _ in range(50)),
+                      args=(ids,)) for ids in allocated]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    incident_ids = sorted(incident_id for ids in allocated for incident_id in ids)
+    assert incident_ids == list(range(1, 401))
+    assert lease.end_id == 7 * len(lease.requests)
@@ -0,0 +1,77 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the tests of the incident payloads, created by the Device class and read by
+the Incident class of the program.
+"""
+from json import loads
+
+import numpy as np
+import pytest
+
+from iotumble.models.incident import Incident
+from raspberrypi.device import Device
+
+
+def create_window(length: int, seed: int = 0) -> tuple:
+    """
+    This function creates a timestamp window of a passed length, sampled at 100 Hz.
+
+    :param length: Amount of timestamps.
+    :param seed: Seed of the random acceleration values.
+    :returns: Tuple of the x, y, z, svm, and ep value lists.
+    """
+    generator = np.random.default_rng(seed)
+    x_data, y_data, z_data = generator.normal(0, 12, (3, length))
+    svm_data = np.sqrt(x_data ** 2 + y_data ** 2 + z_data ** 2)
+    epochs = 1650000000.123 + np.arange(length) * 0.01
+    return tuple(column.tolist() for column in (x_data, y_data, z_data, svm_data, epochs))
+
+
+@pytest.mark.parametrize("length", [1, 2, 501])
+def test_compact_round_trip(length):
+    window = create_window(length, length)
+    payload = loads(Device.create_compact_payload(window, 0.01))
+    assert payload["v"] == Device.payload_version
+    assert payload["n"] == length
+    assert payload["peak"] == max(window[3])
+    columns = Incident.decode_columns(payload)
+    assert columns.shape == (5, length)
+    for decoded, values in zip(columns[:4], window[:4]):
+        np.testing.assert_allclose(decoded, values, rtol=1e-6, atol=1e-5)
+    np.testing.assert_allclose(columns[4], window[4], rtol=0, atol=1e-4)
+    assert columns[4, 0] == window[4][0]
+
+
+def test_compact_matches_json():
+    window = create_window(300)
+    compact = Incident.from_payload("1", loads(Device.create_compact_payload(window, 0.01)))
+    full = Incident.from_payload("1", loads(Device.create_payload(window)))
+    assert len(compact) == len(full) == 300
+    np.testing.assert_allclose(compact.get_columns(), full.get_columns(), rtol=1e-6, atol=1e-4)
+    assert compact.get_summary()["peak_index"] == full.get_summary()["peak_index"]
+
+
+def test_unsupported_version():
+    payload = loads(Device.create_compact_payload(create_window(3), 0.01))
+    payload["v"] = 2
+    with pytest.raises(ValueError):
+        Incident.decode_columns(payload)
+
+
+def test_short_data():
+    payload = loads(Device.create_compact_payload(create_window(4), 0.01))
+    payload["n"] = 5
+    with pytest.raises(ValueError):
+        Incident.decode_columns(payload)
+
+
+@pytest.mark.parametrize("message", [{}, {"peak": 3.0},
+                                     {"v": 1, "ep": 1650000000.0, "dt": 0.01, "n": 0,
+                                      "peak": 0.0, "data": ""}])
+def test_empty_incident(message):
+    with pytest.raises(ValueError):
+        Incident.from_payload("1", message)
@@ -0,0 +1,169 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the Publisher class."""
+from os import listdir
+from time import monotonic, sleep
+
+import pytest
+
+from raspberrypi import publisher as publisher_module
+from raspberrypi.publisher import Publisher
+
+
+class FakeBroker:
+    """
+    This class represents an MQTT broker that records the published messages, and fails to publish
+    while it is offline (or for a passed amount of attempts).
+    """
+
+    def __init__(self, failures: int = 0):
+        """
+        This constructor instantiates a FakeBroker object.
+
+        :param failures: Amount of publish attempts that fail before the broker is online.
+        """
+        self.failures = failures
+        self.online = True
+        self.messages = []
+
+    def publish(self, topic: str, payload: str):
+        """
+        This method records a published message.
+
+        :param topic: Name of the topic.
+        :param payload: Payload string to be published.
+        :raises ConnectionError: If the broker is offline.
+        """
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("The broker is offline!")
+        if not self.online:
+            raise ConnectionError("The broker is offline!")
+        self.messages.append((topic, payload))
+
+
+def create_message(incident: int) -> tuple:
+    """
+    This function creates the topic and payload of a submitted incident.
+
+    :param incident: Submitted incident.
+    :returns: Tuple of the topic and payload.
+    """
+    return f"iotumble/incident/{incident}", str(incident)
+
+
+def wait_for(condition, timeout: float = 5.0):
+    """
+    This function waits for a condition of the Publisher thread to be met.
+
+    :param condition: Method that checks the condition.
+    :param timeout: Maximum time to wait (in seconds).
+    """
+    deadline = monotonic() + timeout
+    while not condition():
+        assert monotonic() < deadline
+        sleep(0.01)
+
+
+@pytest.fixture(autouse=True, name="no_backoff")
+def fixture_no_backoff(monkeypatch):
+    """
+    This function removes the retry backoff of the publisher module.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(publisher_module, "sleep", lambda seconds: None)
+
+
+def test_publishes_and_acknowledges_in_order():
+    broker = FakeBroker()
+    acknowledged = []
+    publisher = Publisher(create_message, broker.publish, batch_size=2,
+                          acknowledge=acknowledged.append)
+    publisher.start()
+    for incident in range(1, 6):
+        publisher.submit(incident)
+    publisher.stop()
+    assert [payload for _, payload in broker.messages] == ["1", "2", "3", "4", "5"]
+    assert acknowledged == [1, 2, 3, 4, 5]
+    report = publisher.report()
+    assert report["published"] == 5 and report["depth"] == 0
+    assert report["latency_p50"] is not None
+
+
+def test_retries_failed_publish():
+    broker = FakeBroker(failures=2)
+    publisher = Publisher(create_message, broker.publish, retries=3)
+    publisher.start()
+    publisher.submit(1)
+    publisher.stop()
+    assert broker.messages == [create_message(1)]
+    assert publisher.report()["retries"] == 2
+
+
+def test_failed_publish_is_not_acknowledged():
+    broker = FakeBroker()
+    broker.online = False
+    acknowledged = []
+    publisher = Publisher(create_message, broker.publish, retries=1,
+                          acknowledge=acknowledged.append)
+    publisher.start()
+    publisher.submit(1)
+    publisher.stop()
+    assert publisher.report()["failed"] == 1
+    assert not acknowledged
+
+
+def test_full_queue_drops_oldest():
+    publisher = Publisher(create_message, FakeBroker().publish, queue_size=2)
+    for incident in range(1, 4):
+        publisher.submit(incident)
+    assert [incident for _, incident in publisher.queue] == [2, 3]
+    assert publisher.report()["drops"] == 1
+
+
+def test_stop_before_start():
+    publisher = Publisher(create_message, FakeBroker().publish)
+    publisher.stop()
+    assert publisher.stopped and not publisher.is_alive()
+
+
+def test_spilled_messages_are_resent(tmp_path):
+    broker = FakeBroker()
+    broker.online = False
+    spill_path = str(tmp_path / "spill")
+    publisher = Publisher(create_message, broker.publish, retries=0, spill_path=spill_path)
+    publisher.start()
+    publisher.submit(1)
+    publisher.submit(2)
+    wait_for(lambda: publisher.report()["spilled"] == 2)
+    broker.online = True
+    publisher.submit(3)
+    wait_for(lambda: len(broker.messages) == 3)
+    publisher.stop()
+    assert sorted(payload for _, payload in broker.messages) == ["1", "2", "3"]
+    assert publisher.report()["unspilled"] == 2
+    assert not listdir(spill_path)
+
+
+def test_dropped_incidents_are_recovered():
+    broker = FakeBroker()
+    pending = []
+
+    def acknowledge(incident):
+        pending.remove(incident)
+
+    publisher = Publisher(create_message, broker.publish, queue_size=2, acknowledge=acknowledge,
+                          recover=lambda: list(pending))
+    for incident in range(1, 5):
+        pending.append(incident)
+        publisher.submit(incident)
+    publisher.start()
+    wait_for(lambda: not pending)
+    publisher.stop()
+    assert sorted(payload for _, payload in broker.messages) == ["1", "2", "3", "4"]
+    assert publisher.report()["drops"] == 2
+    assert publisher.report()["recovered"] == 2
@@ -0,0 +1,104 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the RingBuffer class."""
+import numpy as np
+import pytest
+
+from raspberrypi.ring_buffer import RingBuffer
+
+
+def create_timestamp(i: int) -> tuple:
+    """
+    This function creates a distinct timestamp of a passed index.
+
+    :param i: Index of the timestamp.
+    :returns: Tuple of the timestamps x, y, z, svm, and ep values.
+    """
+    return float(i), float(i) + 0.25, float(i) + 0.5, float(i) + 0.75, 1650000000.0 + i
+
+
+def test_empty():
+    ring = RingBuffer(4)
+    assert len(ring) == 0
+    assert ring.last("x", 3).tolist() == []
+    with pytest.raises(IndexError):
+        ring.get(0)
+
+
+def test_append_before_full():
+    ring = RingBuffer(4)
+    for i in range(3):
+        ring.append(create_timestamp(i))
+    assert len(ring) == 3
+    assert ring.last("x", 10).tolist() == [0.0, 1.0, 2.0]
+    assert ring.get(0) == create_timestamp(0)
+    assert ring.get(-1) == create_timestamp(2)
+
+
+@pytest.mark.parametrize("count", [4, 5, 7, 8, 9, 23])
+def test_append_wraps_around(count):
+    ring = RingBuffer(4)
+    for i in range(count):
+        ring.append(create_timestamp(i))
+    newest = list(range(count - 4, count))
+    assert len(ring) == 4
+    assert ring.last("x", 4).tolist() == [float(i) for i in newest]
+    assert ring.last("ep", 2).tolist() == [1650000000.0 + i for i in newest[-2:]]
+    assert [ring.get(i) for i in range(4)] == [create_timestamp(i) for i in newest]
+    assert ring.last("svm", 4).tolist() == [float(i) + 0.75 for i in newest]
+    with pytest.raises(IndexError):
+        ring.get(4)
+
+
+def test_last_is_a_view():
+    ring = RingBuffer(3)
+    for i in range(5):
+        ring.append(create_timestamp(i))
+    view = ring.last("y", 3)
+    assert isinstance(view, memoryview)
+    assert view.tolist() == [2.25, 3.25, 4.25]
+
+
+@pytest.mark.parametrize("start, batches", [(0, [3, 3, 3]), (2, [5]), (1, [11]), (3, [1, 6, 2])])
+def test_extend_matches_append(start, batches):
+    ring = RingBuffer(5)
+    expected = RingBuffer(5)
+    for i in range(start):
+        ring.append(create_timestamp(i))
+        expected.append(create_timestamp(i))
+    i = start
+    for size in batches:
+        timestamps = [create_timestamp(j) for j in range(i, i + size)]
+        ring.extend(tuple(np.array(column) for column in zip(*timestamps)))
+        for timestamp in timestamps:
+            expected.append(timestamp)
+        i += size
+    assert len(ring) == len(expected)
+    assert ring.snapshot() == expected.snapshot()
+    for key in RingBuffer.keys:
+        assert ring.last(key, 5).tolist() == expected.last(key, 5).tolist()
+
+
+def test_clear():
+    ring = RingBuffer(3)
+    for i in range(5):
+        ring.append(create_timestamp(i))
+    ring.clear()
+    assert len(ring) == 0
+    ring.append(create_timestamp(9))
+    assert ring.last("x", 3).tolist() == [9.0]
+
+
+def test_restore_from_buffer():
+    buffer = memoryview(bytearray(16 * 4 * len(RingBuffer.keys)))
+    ring = RingBuffer(4, buffer)
+    for i in range(6):
+        ring.append(create_timestamp(i))
+    restored = RingBuffer(4, buffer)
+    restored.restore(1650000000.0 + 3)
+    assert restored.last("x", 4).tolist() == [4.0, 5.0]
+    restored.append(create_timestamp(6))
+    assert restored.last("x", 4).tolist() == [4.0, 5.0, 6.0]
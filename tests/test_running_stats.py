@@ -0,0 +1,79 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the RunningStats class."""
+import random
+
+import pytest
+
+from raspberrypi.running_stats import RunningStats
+
+
+def test_empty_is_not_within():
+    assert not RunningStats(4).within(100.0)
+
+
+@pytest.mark.parametrize("length", [1, 2, 5, 16])
+def test_matches_sliding_window(length):
+    generator = random.Random(length)
+    stats = RunningStats(length)
+    values = []
+    for _ in range(200):
+        value = generator.choice([generator.uniform(-20, 20), float(generator.randint(-3, 3))])
+        stats.append(value)
+        values.append(value)
+        window = values[-length:]
+        assert len(stats) == len(window)
+        assert stats.get_min() == min(window)
+        assert stats.get_max() == max(window)
+        assert stats.get_mean() == pytest.approx(sum(window) / len(window), abs=1e-9)
+
+
+@pytest.mark.parametrize("length", [3, 8])
+def test_within_matches_brute_force(length):
+    generator = random.Random(length)
+    stats = RunningStats(length)
+    values = []
+    for _ in range(300):
+        value = 9.8 + generator.uniform(-1.5, 1.5)
+        stats.append(value)
+        values.append(value)
+        window = values[-length:]
+        mean = sum(window) / len(window)
+        for band in (0.5, 1.0, 1.5):
+            expected = all(abs(data - mean) <= band for data in window)
+            if abs(max(abs(data - mean) for data in window) - band) > 1e-9:
+                assert stats.within(band) == expected
+
+
+def test_within_band_edges():
+    stats = RunningStats(4)
+    for value in (1.0, 1.0, 1.0, 3.0):
+        stats.append(value)
+    assert stats.get_mean() == 1.5
+    assert stats.within(1.5)
+    assert not stats.within(1.49)
+    for value in (1.0, 1.0, 1.0):
+        stats.append(value)
+    assert not stats.within(0.5)
+    stats.append(1.0)
+    assert stats.within(0.0)
+
+
+def test_extend_skips_values_outside_window():
+    stats = RunningStats(3)
+    stats.extend(range(100))
+    assert (stats.get_min(), stats.get_max(), stats.get_mean()) == (97, 99, 98)
+
+
+def test_clear():
+    stats = RunningStats(3)
+    for value in (5.0, 6.0, 7.0, 8.0):
+        stats.append(value)
+    stats.clear()
+    assert len(stats) == 0
+    assert not stats.within(10.0)
+    stats.append(2.0)
+    assert (stats.get_min(), stats.get_max(), stats.get_mean()) == (2.0, 2.0, 2.0)
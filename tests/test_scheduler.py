@@ -0,0 +1,115 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the Scheduler class."""
+import pytest
+
+from raspberrypi import scheduler as scheduler_module
+from raspberrypi.scheduler import Scheduler
+
+
+class FakeClock:
+    """
+    This class represents a fake monotonic clock, that only advances when it is slept on or when a
+    test spends time, so the Scheduler can be tested without sleeping.
+    """
+
+    def __init__(self, now: float = 1000.0):
+        """
+        This constructor instantiates a FakeClock object.
+
+        :param now: Starting time of the clock (in seconds).
+        """
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        """
+        This method gets the time of the clock.
+
+        :returns: Time of the clock (in seconds).
+        """
+        return self.now
+
+    def sleep(self, seconds: float):
+        """
+        This method advances the clock by a passed amount of seconds, recording the sleep.
+
+        :param seconds: Amount of seconds slept.
+        """
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch) -> FakeClock:
+    """
+    This function replaces the clock of the scheduler module with a FakeClock.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :returns: Instance of a FakeClock object.
+    """
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler_module, "monotonic", clock.monotonic)
+    monkeypatch.setattr(scheduler_module, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.mark.parametrize("sample_rate", [9, 801])
+def test_rate_out_of_range(sample_rate):
+    with pytest.raises(ValueError):
+        Scheduler(sample_rate)
+
+
+def test_waits_on_fixed_grid(clock):
+    scheduler = Scheduler(100)
+    scheduler.wait()
+    start = clock.now
+    for i in range(1, 6):
+        clock.now += 0.003
+        assert scheduler.wait() == 1
+        assert clock.now == pytest.approx(start + i * 0.01)
+    assert scheduler.get_ticks() == 6
+    assert scheduler.get_overruns() == 0
+
+
+def test_overrun_skips_missed_periods(clock):
+    scheduler = Scheduler(100)
+    scheduler.wait()
+    start = clock.now
+    clock.now += 0.035
+    assert scheduler.wait() == 3
+    assert scheduler.get_missed_deadlines() == 2
+    assert scheduler.get_overruns() == 1
+    assert scheduler.get_max_overrun() == pytest.approx(0.025)
+    assert scheduler.wait() == 1
+    assert clock.now == pytest.approx(start + 0.04)
+    assert scheduler.get_ticks() == 5
+
+
+def test_first_wait_counts_periods(clock):
+    scheduler = Scheduler(100)
+    start = clock.now
+    assert scheduler.wait(4) == 4
+    assert clock.now == pytest.approx(start + 0.04)
+    assert scheduler.wait(4) == 4
+    assert clock.now == pytest.approx(start + 0.08)
+
+
+def test_not_realtime_never_sleeps(clock):
+    scheduler = Scheduler(100, realtime=False)
+    assert [scheduler.wait(16) for _ in range(3)] == [16, 16, 16]
+    assert scheduler.get_ticks() == 48
+    assert not clock.sleeps
+
+
+def test_reset(clock):
+    scheduler = Scheduler(50)
+    scheduler.wait()
+    clock.now += 1.0
+    scheduler.wait()
+    scheduler.reset()
+    assert scheduler.report() == {"rate": 50, "ticks": 0, "missed": 0, "overruns": 0,
+                                  "max_overrun": 0.0}
@@ -0,0 +1,310 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""
+This module contains the tests of the Session class, against an in-memory DynamoDB table. The
+Session class needs boto3 (for its key conditions and errors), so they are skipped without it.
+"""
+from json import loads
+
+import pytest
+
+from raspberrypi.device import Device
+
+pytest.importorskip("boto3")
+# pylint: disable=wrong-import-position
+from botocore.exceptions import ClientError
+
+from iotumble.models import session as session_module
+from iotumble.models.session import Session
+
+
+class FakeTable:
+    """
+    This class represents an in-memory DynamoDB table of incident items, implementing the item,
+    query, and batch requests used by Session (with a Limit, ScanIndexForward, a
+    ProjectionExpression of top-level names and "msg.peak", and an ExclusiveStartKey).
+    """
+    name = "iotumble_incidents"
+
+    def __init__(self, items: list, unprocessed: int = 0):
+        """
+        This constructor instantiates a FakeTable object.
+
+        :param items: List of the incident items.
+        :param unprocessed: Amount of batch requests that leave their last key unprocessed.
+        """
+        self.items = {(item["pk"], item["sk"]): item for item in items}
+        self.unprocessed = unprocessed
+        self.requests = []
+
+    def Table(self, table_name: str):  # pylint: disable=invalid-name
+        """
+        This method gets the table resource of the table (the table itself).
+
+        :param table_name: Name of the table.
+        :returns: Instance of the FakeTable object.
+        """
+        assert table_name == self.name
+        return self
+
+    def get_item(self, Key: dict) -> dict:  # pylint: disable=invalid-name
+        """
+        This method gets an item by its key.
+
+        :param Key: Dictionary of the partition key and sort key.
+        :returns: Dictionary of the response.
+        """
+        self.requests.append("get_item")
+        item = self.items.get((Key["pk"], Key["sk"]))
+        return {"Item": item} if item is not None else {}
+
+    def query(self, KeyConditionExpression, Limit: int, ScanIndexForward: bool = True,
+              ProjectionExpression: str = None, ExclusiveStartKey: dict = None) -> dict:
+        # pylint: disable=invalid-name,too-many-arguments
+        """
+        This method queries a page of the items that match a key condition, sorted by sort key.
+
+        :param KeyConditionExpression: Key condition of the query.
+        :param Limit: Maximum amount of items in the page.
+        :param ScanIndexForward: Boolean on if the items are sorted in ascending order.
+        :param ProjectionExpression: Names of the attributes returned (None for every attribute).
+        :param ExclusiveStartKey: Key of the item the page starts after (None for the first page).
+        :returns: Dictionary of the response.
+        """
+        self.requests.append("query")
+        items = sorted((item for item in self.items.values()
+                        if self.match(KeyConditionExpression, item)),
+                       key=lambda item: item["sk"], reverse=not ScanIndexForward)
+        if ExclusiveStartKey is not None:
+            start = [(item["pk"], item["sk"]) for item in items].index(
+                (ExclusiveStartKey["pk"], ExclusiveStartKey["sk"]))
+            items = items[start + 1:]
+        response = {"Items": [self.project(item, ProjectionExpression)
+                              for item in items[:Limit]]}
+        if len(items) > Limit:
+            response["LastEvaluatedKey"] = {"pk": items[Limit - 1]["pk"],
+                                            "sk": items[Limit - 1]["sk"]}
+        return response
+
+    def batch_get_item(self, RequestItems: dict) -> dict:  # pylint: disable=invalid-name
+        """
+        This method gets the items of up to 100 keys (with an optional ProjectionExpression),
+        leaving the last key unprocessed while the table has unprocessed requests left.
+
+        :param RequestItems: Dictionary of the keys (and projection) of each table.
+        :returns: Dictionary of the response.
+        """
+        self.requests.append("batch_get_item")
+        keys = RequestItems[self.name]["Keys"]
+        projection = RequestItems[self.name].get("ProjectionExpression")
+        assert len(keys) <= 100
+        response = {"Responses": {self.name: []}}
+        if self.unprocessed and len(keys) > 1:
+            self.unprocessed -= 1
+            response["UnprocessedKeys"] = {self.name: {"Keys": keys[-1:]}}
+            keys = keys[:-1]
+        for key in keys:
+            item = self.items.get((key["pk"], key["sk"]))
+            if item is not None:
+                response["Responses"][self.name].append(self.project(item, projection))
+        return response
+
+    @classmethod
+    def match(cls, condition, item: dict) -> bool:
+        """
+        This method checks if an item matches a key condition (of "=", "begins_with", "BETWEEN",
+        and "AND" conditions).
+
+        :param condition: Key condition of a query.
+        :param item: Dictionary of the item.
+        :returns: Boolean outcome on if the item matches.
+        """
+        expression = condition.get_expression()
+        operator, values = expression["operator"], expression["values"]
+        if operator == "AND":
+            return all(cls.match(value, item) for value in values)
+        value = item.get(values[0].name)
+        if operator == "=":
+            return value == values[1]
+        if operator == "begins_with":
+            return isinstance(value, str) and value.startswith(values[1])
+        if operator == "BETWEEN":
+            return values[1] <= value <= values[2]
+        raise NotImplementedError(operator)
+
+    @staticmethod
+    def project(item: dict, projection: str = None) -> dict:
+        """
+        This method projects the attributes of an item.
+
+        :param item: Dictionary of the item.
+        :param projection: Names of the attributes returned (None for every attribute).
+        :returns: Dictionary of the projected item.
+        """
+        if projection is None:
+            return dict(item)
+        projected = {}
+        for name in (name.strip() for name in projection.split(",")):
+            if name == "msg.peak" and "peak" in item.get("msg", {}):
+                projected["msg"] = {"peak": item["msg"]["peak"]}
+            elif name in item:
+                projected[name] = item[name]
+        return projected
+
+
+def create_window(index: int) -> tuple:
+    """
+    This function creates a short timestamp window of a device, ending at a passed index.
+
+    :param index: Index of the window.
+    :returns: Tuple of the x, y, z, svm, and ep value lists.
+    """
+    return ([0.0, 1.0], [0.0, 2.0], [9.8, 9.8], [9.8, 10.0 + index],
+            [1650000000.0 + index, 1650000000.01 + index])
+
+
+def create_sharded_item(shard: int, index: int, device: str) -> dict:
+    """
+    This function creates a sharded incident item.
+
+    :param shard: Shard of the incident item.
+    :param index: Index of the incident (seconds after the first incident).
+    :param device: ID of the device that published it.
+    :returns: Dictionary of the incident item.
+    """
+    return {"pk": shard, "sk": f"incident#{1650000000010 + index * 1000:013d}-{index}-{device}",
+            "msg": loads(Device.create_payload(create_window(index)))}
+
+
+def create_legacy_item(incident_id: int) -> dict:
+    """
+    This function creates an incident item keyed by a global incident ID.
+
+    :param incident_id: ID of the incident.
+    :returns: Dictionary of the incident item.
+    """
+    return {"pk": incident_id, "sk": "incident",
+            "msg": loads(Device.create_payload(create_window(incident_id)))}
+
+
+def create_session(items: list, unprocessed: int = 0) -> Session:
+    """
+    This function creates a Session connected to a FakeTable of incident items.
+
+    :param items: List of the incident items.
+    :param unprocessed: Amount of batch requests that leave their last key unprocessed.
+    :returns: Instance of a Session object.
+    """
+    session = Session()
+    session.dynamo_db = FakeTable(items, unprocessed)
+    session.incidents_table = session.dynamo_db.Table(FakeTable.name)
+    return session
+
+
+@pytest.fixture(autouse=True, name="no_backoff")
+def fixture_no_backoff(monkeypatch):
+    """
+    This function removes the batch retry backoff of the session module.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(session_module, "sleep", lambda seconds: None)
+
+
+def test_incident_ids_round_trip():
+    for item in (create_sharded_item(3, 5, "pi"), create_legacy_item(42)):
+        incident_id = Session.create_incident_id(item)
+        assert Session.create_key(incident_id) == {"pk": item["pk"], "sk": item["sk"]}
+    assert Session.create_incident_id(create_sharded_item(3, 5, "pi-2")) == \
+        "3-1650000005010-5-pi-2"
+
+
+def test_pages_are_newest_first():
+    items = [create_sharded_item(index % 3 + 1, index, f"pi{index % 2}") for index in range(7)]
+    items += [create_legacy_item(incident_id) for incident_id in (1, 2)]
+    items.append({"pk": 0, "sk": "count", "msg": 2})
+    session = create_session(items)
+    session.reset_incident_pages(4)
+    pages = []
+    while True:
+        page = session.request_incident_page()
+        if not page:
+            break
+        pages.append(page)
+    assert [len(page) for page in pages] == [4, 4, 1]
+    listed = [incident["incident_id"] for page in pages for incident in page]
+    assert listed == [Session.create_incident_id(item)
+                      for item in sorted(items[:7], key=lambda item: item["sk"], reverse=True)
+                      ] + ["2", "1"]
+    newest = pages[0][0]
+    assert newest["device"] == "pi0" and newest["time"] == 1650000006.01
+    assert newest["peak"] == 16.0 and newest["summary"] is None
+    assert pages[2][0]["device"] is None
+
+
+def test_request_incident():
+    session = create_session([create_sharded_item(2, 1, "pi"), create_legacy_item(7)])
+    incident = session.request_incident("7")
+    assert len(incident) == 2 and incident.get_columns()[3, -1] == 17.0
+    assert session.request_incident("8") is False
+    requests = len(session.dynamo_db.requests)
+    assert session.request_incident("7") is incident
+    assert len(session.dynamo_db.requests) == requests
+
+
+def test_batches_retry_unprocessed_keys():
+    items = [create_legacy_item(incident_id) for incident_id in range(1, 251)]
+    session = create_session(items, unprocessed=3)
+    incident_ids = [str(incident_id) for incident_id in range(1, 256)]
+    incidents = session.request_incidents(incident_ids)
+    assert list(incidents) == [str(incident_id) for incident_id in range(1, 251)]
+    assert session.dynamo_db.requests.count("batch_get_item") == 2 * 3
+    assert session.request_incidents(["3", "1"]) == {"3": incidents["3"], "1": incidents["1"]}
+    assert session.dynamo_db.requests.count("batch_get_item") == 6
+
+
+def test_unpublished_leased_ids_are_skipped():
+    items = [create_legacy_item(incident_id) for incident_id in (1, 2, 5)]
+    items += [{"pk": 0, "sk": "count", "msg": 3}, {"pk": 0, "sk": "lease", "msg": 8}]
+    session = create_session(items)
+    session.reset_incident_pages(2)
+    pages = [session.request_incident_page() for _ in range(3)]
+    assert [[incident["incident_id"] for incident in page] for page in pages] == \
+        [["5", "2"], ["1"], []]
+    assert session.dynamo_db.requests.count("batch_get_item") == 1
+    exported = [item["pk"] for page in session.request_incident_items() for item in page]
+    assert exported == [1, 2, 5]
+
+
+def test_registered_shards_are_queried():
+    items = [create_sharded_item(shard, shard, "pi") for shard in (1, 20)]
+    items.append({"pk": 0, "sk": "shards", "msg": 20})
+    session = create_session(items)
+    listed = [incident["incident_id"] for incident in session.request_incident_page()]
+    assert listed == [Session.create_incident_id(item) for item in reversed(items[:2])]
+    exported = [item["pk"] for page in session.request_incident_items() for item in page]
+    assert exported == [1, 20]
+
+
+def test_failed_page_is_requested_again():
+    items = [create_sharded_item(index % 2 + 1, index, "pi") for index in range(6)]
+    session = create_session(items)
+    session.reset_incident_pages(2)
+    query = session.incidents_table.query
+    failed = []
+
+    def fail_shard_query(**kwargs):
+        if "ExclusiveStartKey" in kwargs and not failed:
+            failed.append(kwargs)
+            raise ClientError({"Error": {"Code": "ThrottlingException"}}, "Query")
+        return query(**kwargs)
+
+    session.incidents_table.query = fail_shard_query
+    pages = [session.request_incident_page() for _ in range(5)]
+    assert failed and pages[1] is False
+    listed = [incident["incident_id"] for page in pages if page for incident in page]
+    assert listed == [Session.create_incident_id(item)
+                      for item in sorted(items, key=lambda item: item["sk"], reverse=True)]
@@ -0,0 +1,49 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the SimulatedSensor class, draining on a fake clock."""
+import pytest
+
+from raspberrypi.sensors import simulated_sensor as sensor_module
+from raspberrypi.sensors.simulated_sensor import SimulatedSensor
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch):
+    """
+    This function replaces the clocks of the simulated_sensor module with a settable time.
+
+    :param monkeypatch: Pytest monkeypatch fixture.
+    :returns: Dictionary holding the current time (in seconds).
+    """
+    clock = {"now": 100.0}
+    monkeypatch.setattr(sensor_module, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(sensor_module, "time", lambda: clock["now"])
+    return clock
+
+
+def test_drains_due_samples(clock):
+    sensor = SimulatedSensor(32, [(float(i), 0.0, 9.8) for i in range(10)])
+    sensor.start()
+    assert sensor.read_samples()[0] == [0.0]
+    clock["now"] += 0.125
+    x_data, _, _, epochs = sensor.read_samples()
+    assert x_data == [1.0, 2.0, 3.0, 4.0]
+    assert epochs == [100.03125, 100.0625, 100.09375, 100.125]
+    assert sensor.get_overflows() == 0
+
+
+def test_overrun_drops_oldest(clock):
+    sensor = SimulatedSensor(32, [(float(i), 0.0, 9.8) for i in range(70)])
+    sensor.start()
+    clock["now"] += 2.0
+    x_data, _, z_data, _ = sensor.read_samples()
+    assert len(x_data) == SimulatedSensor.fifo_depth
+    assert x_data[0] == 33.0 and z_data[-1] == 9.8
+    assert sensor.read_samples()[0] == []
+    clock["now"] += 0.25
+    x_data = sensor.read_samples()[0]
+    assert x_data == [65.0, 66.0, 67.0, 68.0, 69.0] + [SimulatedSensor.resting[0]] * 3
+    assert sensor.get_overflows() == 1
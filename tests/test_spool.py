@@ -0,0 +1,153 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the Spool class."""
+from mmap import PAGESIZE
+from os import path
+from threading import Event, Thread
+
+import pytest
+
+from raspberrypi.ring_buffer import RingBuffer
+from raspberrypi.spool import Spool
+
+CAPACITY = 11
+
+
+def open_spool(tmp_path, slots: int = 4, capacity: int = CAPACITY) -> Spool:
+    """
+    This function opens a Spool of a temporary path.
+
+    :param tmp_path: Temporary directory of the test.
+    :param slots: Amount of incident windows the spool holds.
+    :param capacity: Maximum amount of timestamps in an incident window.
+    :returns: Instance of an opened Spool object.
+    """
+    spool = Spool(str(tmp_path / "incident_spool.bin"), slots)
+    spool.open(capacity)
+    return spool
+
+
+def create_ring(start: int, length: int = CAPACITY) -> RingBuffer:
+    """
+    This function creates a RingBuffer holding distinct timestamps.
+
+    :param start: Index of the first timestamp.
+    :param length: Amount of timestamps.
+    :returns: Instance of a RingBuffer object.
+    """
+    ring = RingBuffer(CAPACITY)
+    for i in range(start, start + length):
+        ring.append((float(i), i + 0.25, i + 0.5, i + 0.75, 1650000000.0 + i))
+    return ring
+
+
+def test_slot_layout(tmp_path):
+    spool = open_spool(tmp_path, slots=3)
+    keys = len(RingBuffer.keys)
+    assert spool.history_size % PAGESIZE == 0 and spool.slot_size % PAGESIZE == 0
+    assert spool.history_size >= Spool.header_size + 2 * keys * 8 * CAPACITY
+    assert spool.slot_size >= Spool.header_size + keys * 8 * CAPACITY
+    assert [spool.get_offset(slot) for slot in range(3)] == [
+        spool.history_size + slot * spool.slot_size for slot in range(3)]
+    assert path.getsize(spool.spool_path) == spool.history_size + 3 * spool.slot_size
+    assert len(spool.get_history()) == spool.history_size - Spool.header_size
+
+
+@pytest.mark.parametrize("length", [0, 1, 5, CAPACITY])
+def test_append_and_read(tmp_path, length):
+    spool = open_spool(tmp_path)
+    ring = create_ring(3, length)
+    sequence = spool.append(ring)
+    assert sequence == 1
+    incident_id, window = spool.read(sequence)
+    assert incident_id == 0
+    assert window == ring.snapshot()
+    assert spool.get_pending() == [1]
+
+
+def test_acknowledge_frees_slot(tmp_path):
+    spool = open_spool(tmp_path)
+    first = spool.append(create_ring(0))
+    second = spool.append(create_ring(20))
+    spool.acknowledge(first)
+    assert spool.get_pending() == [second]
+    assert spool.read(first)[1] == create_ring(0).snapshot()
+
+
+def test_reopen_recovers_pending(tmp_path):
+    spool = open_spool(tmp_path)
+    sequences = [spool.append(create_ring(i * 10)) for i in range(3)]
+    spool.set_incident_id(sequences[1], 42)
+    spool.acknowledge(sequences[0])
+    spool.flush()
+    reopened = open_spool(tmp_path)
+    assert reopened.get_pending() == sequences[1:]
+    assert reopened.read(sequences[1]) == (42, create_ring(10).snapshot())
+    assert reopened.read(sequences[2]) == (0, create_ring(20).snapshot())
+    assert reopened.append(create_ring(30)) == sequences[-1] + 1
+
+
+def test_reopen_restores_history(tmp_path):
+    spool = open_spool(tmp_path)
+    ring = RingBuffer(CAPACITY, spool.get_history())
+    for i in range(CAPACITY + 4):
+        ring.append((float(i), 0.0, 0.0, 0.0, 1650000000.0 + i))
+    spool.flush()
+    reopened = open_spool(tmp_path)
+    restored = RingBuffer(CAPACITY, reopened.get_history())
+    restored.restore(1650000000.0 + 8)
+    assert restored.last("x", CAPACITY).tolist() == [9.0, 10.0, 11.0, 12.0, 13.0, 14.0]
+
+
+def test_reopen_with_other_layout_clears(tmp_path):
+    spool = open_spool(tmp_path)
+    spool.append(create_ring(0))
+    spool.flush()
+    reopened = open_spool(tmp_path, capacity=CAPACITY + 1)
+    assert reopened.get_pending() == []
+    assert reopened.append(create_ring(0, 3)) == 1
+
+
+def test_overwrite_pending_slot(tmp_path):
+    spool = open_spool(tmp_path, slots=2)
+    first = spool.append(create_ring(0))
+    second = spool.append(create_ring(10))
+    third = spool.append(create_ring(20))
+    assert spool.get_dropped() == 1
+    assert spool.get_pending() == [second, third]
+    with pytest.raises(KeyError):
+        spool.read(first)
+    spool.acknowledge(first)
+    assert spool.get_pending() == [second, third]
+    assert spool.read(third)[1] == create_ring(20).snapshot()
+    spool.acknowledge(second)
+    spool.append(create_ring(30))
+    assert spool.get_dropped() == 1
+
+
+def test_reads_race_wrapping_appends(tmp_path):
+    spool = open_spool(tmp_path, slots=2)
+    spool.append(create_ring(100, 2))
+    done = Event()
+
+    def append_windows():
+        for sequence in range(2, 400):
+            spool.append(create_ring(sequence * 100, sequence % CAPACITY + 1))
+        done.set()
+
+    writer = Thread(target=append_windows)
+    writer.start()
+    reads = 0
+    while not done.is_set():
+        sequence = spool.next_sequence - 1
+        try:
+            _, window = spool.read(sequence)
+        except KeyError:
+            continue
+        assert window == create_ring(sequence * 100, sequence % CAPACITY + 1).snapshot()
+        reads += 1
+    writer.join()
+    assert reads
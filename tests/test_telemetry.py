@@ -0,0 +1,87 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the Telemetry class."""
+import numpy as np
+import pytest
+
+from raspberrypi.scheduler import Scheduler
+from raspberrypi.telemetry import Telemetry
+
+SVM_DATA = [9.8, 25.0, 30.0, 9.8, 21.0, 9.8, 9.8, 40.0]
+
+
+def create_telemetry(interval_seconds: int = 1, batch_size: int = 2) -> Telemetry:
+    """
+    This function creates a Telemetry object of a Scheduler at 10 Hz that never sleeps.
+
+    :param interval_seconds: Length of each interval (in seconds).
+    :param batch_size: Amount of intervals in each batch.
+    :returns: Instance of a Telemetry object.
+    """
+    return Telemetry(Scheduler(10, realtime=False), interval_seconds, batch_size)
+
+
+def test_record_aggregates_interval():
+    telemetry = create_telemetry()
+    for svm in SVM_DATA:
+        telemetry.record(svm)
+    telemetry.record_impact()
+    interval = telemetry.close()
+    assert interval["n"] == len(SVM_DATA)
+    assert interval["svm_min"] == 9.8 and interval["svm_max"] == 40.0
+    assert interval["svm_mean"] == pytest.approx(np.mean(SVM_DATA))
+    assert interval["events"] == 3
+    assert interval["impacts"] == 1
+
+
+@pytest.mark.parametrize("split", [1, 2, 5])
+def test_record_batch_matches_record(split):
+    telemetry = create_telemetry()
+    batched = create_telemetry()
+    for svm in SVM_DATA:
+        telemetry.record(svm)
+    for start in range(0, len(SVM_DATA), split):
+        batched.record_batch(np.array(SVM_DATA[start:start + split]))
+    expected = telemetry.close()
+    interval = batched.close()
+    for key in ("n", "svm_min", "svm_max", "events"):
+        assert interval[key] == expected[key]
+    assert interval["svm_mean"] == pytest.approx(expected["svm_mean"])
+
+
+def test_empty_interval():
+    interval = create_telemetry().close()
+    assert interval["n"] == 0
+    assert interval["svm_min"] is None and interval["svm_mean"] is None
+
+
+def test_advance_returns_full_batches():
+    telemetry = create_telemetry(interval_seconds=1, batch_size=2)
+    outcomes = []
+    for _ in range(4):
+        for _ in range(5):
+            telemetry.record(9.8)
+        outcomes.append(telemetry.advance(5))
+    assert outcomes[:3] == [None, None, None]
+    assert [interval["n"] for interval in outcomes[3]] == [10, 10]
+
+
+def test_stall_closes_one_interval():
+    telemetry = create_telemetry(interval_seconds=1, batch_size=1)
+    telemetry.record(9.8)
+    stalled = telemetry.advance(32)
+    assert [interval["n"] for interval in stalled] == [1]
+    outcomes = []
+    for _ in range(3):
+        telemetry.record(9.8)
+        outcomes.append(telemetry.advance(3))
+    assert outcomes[:2] == [None, None]
+    assert [interval["n"] for interval in outcomes[2]] == [3]
+
+
+def test_disabled():
+    telemetry = create_telemetry(interval_seconds=0)
+    assert telemetry.advance(1000) is None
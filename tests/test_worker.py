@@ -0,0 +1,66 @@
+# Author: Dylan Coffey (18251382)
+# Project: IoTumble (Final Year Project)
+# Course: Cyber Security and IT Forensics
+# University: University of Limerick (Ireland)
+
+"""This module contains the tests of the Worker class."""
+from threading import Event
+from time import monotonic, sleep
+
+from iotumble.models.worker import Worker
+
+
+def poll_until_idle(worker: Worker, timeout: float = 5.0):
+    """
+    This function polls a Worker until it has no pending requests.
+
+    :param worker: Instance of a Worker object.
+    :param timeout: Maximum time to wait (in seconds).
+    """
+    deadline = monotonic() + timeout
+    while worker.is_busy():
+        assert monotonic() < deadline
+        worker.poll()
+        sleep(0.01)
+
+
+def fail():
+    """
+    This function is a request that always fails.
+
+    :raises ConnectionError: Always.
+    """
+    raise ConnectionError("The connection was lost!")
+
+
+def test_outcomes_are_passed_on_poll():
+    worker = Worker()
+    worker.start()
+    outcomes = []
+    worker.submit("sum", outcomes.append, sum, [1, 2, 3])
+    worker.submit("fail", outcomes.append, fail)
+    assert worker.is_pending("sum") and not outcomes
+    poll_until_idle(worker)
+    assert sorted(outcomes, key=str) == [6, False]
+
+
+def test_submit_cancels_pending_request():
+    worker = Worker()
+    worker.start()
+    running = Event()
+    release = Event()
+
+    def block():
+        running.set()
+        release.wait()
+        return "blocked"
+
+    outcomes = []
+    worker.submit("block", outcomes.append, block)
+    running.wait()
+    worker.submit("page", outcomes.append, lambda: "first")
+    worker.submit("page", outcomes.append, lambda: "second")
+    worker.submit("block", outcomes.append, lambda: "unblocked")
+    release.set()
+    poll_until_idle(worker)
+    assert sorted(outcomes) == ["second", "unblocked"]